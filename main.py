@@ -3,7 +3,7 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
-from v17.main import main
+from v17.main import cli
 
 if __name__ == "__main__":
-    main()
+    cli()
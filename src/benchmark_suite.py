@@ -0,0 +1,221 @@
+"""
+Offline end-to-end benchmarks for the V17 evolution loop and RecursiveImprover.
+Runs against a synthetic or replayed transport, so no API key or network is needed:
+
+    python -m src.benchmark_suite --population-sizes 4,8 --concurrency 1,8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .groq_client import GroqClient
+from .recursive_improver import RecursiveImprover
+from .request_scheduler import RequestScheduler
+from .transport import LATENCY_DISTRIBUTIONS, ReplayTransport, SyntheticTransport
+
+_SORT_CODE = "```python\ndef sort_numbers(xs):\n    return sorted(xs)\n```"
+_WORDS = (
+    "fast", "readable", "robust", "idiomatic", "minimal", "vectorised", "lazy", "cached", "streaming",
+    "defensive", "pure", "recursive", "iterative", "typed", "documented", "parallel", "compact", "safe",
+)
+
+
+class SyntheticResponder:
+    """Plausible responses to every prompt the V17 loop and RecursiveImprover send.
+
+    Genomes are random word salads, so offspring are rarely near-duplicates;
+    plans have plan_steps steps in dependency chains of two.
+    """
+
+    def __init__(self, seed: Optional[int] = None, plan_steps: int = 8):
+        self.rng = random.Random(seed)
+        self.plan_steps = plan_steps
+        self._lock = threading.Lock()
+
+    def _text(self, words: int = 8) -> str:
+        return " ".join(self.rng.choice(_WORDS) for _ in range(words))
+
+    def _prompt_genome(self) -> Dict:
+        return {
+            "template": f"Implement the task. {self._text()}",
+            "persona_description": f"An expert engineer who writes {self._text()} code.",
+            "task_framing": self._text(),
+            "output_format_instruction": "Return only a Python code block.",
+            "constraints": [self._text(4), self._text(4)],
+        }
+
+    def _critic_genome(self) -> Dict:
+        return {
+            "template": f"Rate this code. {self._text()}",
+            "evaluation_criteria": [{"name": self.rng.choice(_WORDS), "description": self._text()}],
+            "scoring_rubric": f"Reply with a score between 0 and 1. {self._text()}",
+        }
+
+    def __call__(self, messages: List[Dict[str, str]], model: str) -> str:
+        prompt = messages[-1]["content"]
+        with self._lock:
+            if "Generate a new PromptGenome" in prompt:
+                return json.dumps(self._prompt_genome())
+            if "Generate a new CriticGenome" in prompt:
+                return json.dumps(self._critic_genome())
+            if "Code to evaluate" in prompt:
+                return f"Score: {self.rng.random():.2f}"
+            if "crossover" in prompt or "mutation" in prompt:
+                make = self._critic_genome if "critic" in prompt else self._prompt_genome
+                count = re.search(r"exactly (\d+)", prompt)
+                if count:
+                    return json.dumps([make() for _ in range(int(count.group(1)))])
+                return json.dumps(make())
+            if "High-Level Plan (JSON)" in prompt:
+                steps = [
+                    {"id": i + 1, "description": f"Write function step_{i + 1}", "depends_on": [i] if i % 2 else []}
+                    for i in range(self.plan_steps)
+                ]
+                return json.dumps(steps)
+            step = re.search(r"Current Step: Write function (\w+)", prompt)
+            if step:
+                return f"```python\ndef {step.group(1)}(data):\n    return sorted(data)\n```"
+            if "Unified Diff:" in prompt:
+                return "NO CHANGES"
+            return _SORT_CODE
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _make_client(args: argparse.Namespace, pool_size: int) -> GroqClient:
+    transport = SyntheticTransport(
+        SyntheticResponder(args.seed, args.plan_steps),
+        latency=args.latency,
+        distribution=args.distribution,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    if args.replay:
+        transport = ReplayTransport(args.replay, fallback=transport, replay_latency=True)
+    scheduler = RequestScheduler(requests_per_minute=1e9, tokens_per_minute=1e12, base_delay=0.01, max_delay=0.1)
+    return GroqClient(transport=transport, scheduler=scheduler, pool_size=pool_size)
+
+
+def _measure(run, client: GroqClient) -> Dict[str, float]:
+    rss_before = _rss_bytes()
+    cpu_before = time.process_time()
+    start_time = time.monotonic()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run()
+    seconds = time.monotonic() - start_time
+    cpu = time.process_time() - cpu_before
+    calls = client.stats()["calls"]
+    return {
+        "seconds": seconds,
+        "calls": calls,
+        "cpu_seconds": cpu,
+        "cpu_ms_per_call": 1000 * cpu / calls if calls else 0.0,
+        "retries": client.stats()["retries"],
+        "rss_growth_bytes": _rss_bytes() - rss_before,
+    }
+
+
+def bench_evolution(args: argparse.Namespace, population_size: int, concurrency: int) -> Dict[str, float]:
+    """Runs the V17 loop for args.generations generations in a scratch memory directory.
+
+    The Cognition Archive is copied there too, so its search index is not built in the source tree.
+    """
+    # Imported here so the improver benchmark does not need the V17 package.
+    from .v17.config import MEMORY_DIR, RunConfig
+    from .v17.main import main
+
+    client = _make_client(args, concurrency)
+    with tempfile.TemporaryDirectory() as memory_dir:
+        cognition_path = shutil.copy(os.path.join(MEMORY_DIR, "cognition_archive.md"), memory_dir)
+        config = RunConfig(
+            num_generations=args.generations,
+            max_concurrency=concurrency,
+            seed=args.seed,
+            population_size=population_size,
+            memory_dir=memory_dir,
+            log_path=os.path.join(memory_dir, "evolution_log.jsonl"),
+            cognition_path=cognition_path,
+            learnings=0,
+        )
+        result = _measure(lambda: main(config, groq_client=client), client)
+    result.update(
+        population_size=population_size,
+        concurrency=concurrency,
+        generations_per_hour=3600 * args.generations / result["seconds"],
+        calls_per_generation=result["calls"] / args.generations,
+    )
+    return result
+
+
+def bench_improver(args: argparse.Namespace, workers: int) -> Dict[str, float]:
+    """Runs RecursiveImprover once on a plan of args.plan_steps steps."""
+    client = _make_client(args, workers)
+    improver = RecursiveImprover(client, max_workers=workers)
+    result = _measure(lambda: improver.run("Build a data processing module."), client)
+    result.update(workers=workers, runs_per_hour=3600 / result["seconds"])
+    return result
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _print_table(title: str, rows: List[Dict], columns: List[str]):
+    print(f"\n{title}")
+    print("  ".join(f"{c:>20}" for c in columns))
+    for row in rows:
+        print("  ".join(f"{row[c]:>20.2f}" if isinstance(row[c], float) else f"{row[c]:>20}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the evolution loop and RecursiveImprover offline.")
+    parser.add_argument("--generations", type=int, default=3, help="Generations per evolution run.")
+    parser.add_argument("--population-sizes", type=_parse_ints, default=[4, 8], help="Comma-separated population sizes.")
+    parser.add_argument("--concurrency", type=_parse_ints, default=[1, 8], help="Comma-separated concurrency levels.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean synthetic LLM latency in seconds.")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal", help="Synthetic latency distribution.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of synthetic calls that are rate limited.")
+    parser.add_argument("--replay", help="JSONL file recorded with RecordingTransport; unrecorded requests are synthesised.")
+    parser.add_argument("--plan-steps", type=int, default=8, help="Steps in the synthetic RecursiveImprover plan.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic responses and latencies.")
+    parser.add_argument("--skip-evolution", action="store_true", help="Only benchmark RecursiveImprover.")
+    parser.add_argument("--output", help="Also write the results as JSON here.")
+    args = parser.parse_args()
+
+    results = {"evolution": [], "improver": []}
+    if not args.skip_evolution:
+        for population_size in args.population_sizes:
+            for concurrency in args.concurrency:
+                results["evolution"].append(bench_evolution(args, population_size, concurrency))
+        _print_table("Evolution loop", results["evolution"], [
+            "population_size", "concurrency", "generations_per_hour", "calls_per_generation", "cpu_ms_per_call", "rss_growth_bytes",
+        ])
+    for workers in args.concurrency:
+        results["improver"].append(bench_improver(args, workers))
+    _print_table("RecursiveImprover", results["improver"], ["workers", "seconds", "calls", "cpu_ms_per_call", "rss_growth_bytes"])
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+AST-level merging of generated code into a module.
+Definitions from a step replace same-named ones instead of piling up as duplicates.
+"""
+
+import ast
+import re
+from typing import List, Tuple
+
+_FENCE = re.compile(r"```[\w+-]*\n(.*?)```", re.DOTALL)
+
+# (node, blank and comment lines above it, the node's own lines)
+Segment = Tuple[ast.stmt, List[str], List[str]]
+
+
+def extract_code_blocks(response: str) -> str:
+    """Returns the code in a model response: all its fenced blocks joined, or the whole text.
+
+    Unlike the engineer's extract_code, which keeps only the first block, a
+    step's answer may split one module across several blocks.
+    """
+    blocks = _FENCE.findall(response)
+    return "\n\n".join(b.strip("\n") for b in blocks) if blocks else response.strip("\n")
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    test = getattr(node, "test", None)
+    return isinstance(node, ast.If) and isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+
+
+def _key(node: ast.stmt) -> str:
+    """Definitions and simple assignments are keyed by name, anything else by its code."""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return node.name
+    if _is_main_guard(node):
+        return "__main__"
+    targets = node.targets if isinstance(node, ast.Assign) else [node.target] if isinstance(node, ast.AnnAssign) else []
+    if len(targets) == 1 and isinstance(targets[0], ast.Name):
+        return "=" + targets[0].id
+    return ast.dump(node)
+
+
+def _start(node: ast.stmt) -> int:
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+
+def _segments(lines: List[str], nodes: List[ast.stmt], first_lineno: int) -> Tuple[List[Segment], List[str]]:
+    """Splits lines, the first of which is line first_lineno, into one segment per node and a tail."""
+    segments, position = [], 0
+    for node in nodes:
+        start, end = _start(node) - first_lineno, node.end_lineno - first_lineno + 1
+        segments.append((node, lines[position:start], lines[start:end]))
+        position = end
+    return segments, lines[position:]
+
+
+def _has_comment(lines: List[str]) -> bool:
+    return any(line.lstrip().startswith("#") for line in lines)
+
+
+def _merge_segments(base: List[Segment], addition: List[Segment]) -> List[Segment]:
+    merged = list(base)
+    positions = {_key(node): i for i, (node, _, _) in enumerate(merged)}
+    for node, leading, body in addition:
+        key = _key(node)
+        if key not in positions:
+            if merged and not any(not line.strip() for line in leading):
+                leading = [""] + leading
+            positions[key] = len(merged)
+            merged.append((node, leading, body))
+            continue
+        old_node, old_leading, old_body = merged[positions[key]]
+        if isinstance(old_node, ast.ClassDef) and isinstance(node, ast.ClassDef):
+            body = _merge_class(old_node, old_body, node, body)
+        # Comments above the new version win; otherwise the old spacing and comments stay.
+        merged[positions[key]] = (node, leading if _has_comment(leading) else old_leading, body)
+    return merged
+
+
+def _class_signature(node: ast.ClassDef) -> List[str]:
+    return [ast.dump(n) for n in node.bases + node.keywords + node.decorator_list]
+
+
+def _merge_class(old_node: ast.ClassDef, old_body: List[str], new_node: ast.ClassDef, new_body: List[str]) -> List[str]:
+    """Merges two versions of a class member by member.
+
+    The old header (decorators and class line) is kept unless the new one has
+    different bases, keywords or decorators.
+    """
+    old_first, new_first = _start(old_node), _start(new_node)
+    old_header_end = _start(old_node.body[0]) - old_first
+    new_header_end = _start(new_node.body[0]) - new_first
+    old_members, old_tail = _segments(old_body[old_header_end:], old_node.body, old_first + old_header_end)
+    new_members, _ = _segments(new_body[new_header_end:], new_node.body, new_first + new_header_end)
+    changed = _class_signature(old_node) != _class_signature(new_node)
+    header = new_body[:new_header_end] if changed else old_body[:old_header_end]
+    members = _merge_segments(old_members, new_members)
+    return header + [line for _, leading, body in members for line in leading + body] + old_tail
+
+
+def _insert_at(tree: ast.Module) -> int:
+    """Line index just after the module docstring and the leading imports."""
+    at = 0
+    for i, node in enumerate(tree.body):
+        is_docstring = i == 0 and isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+        if not (is_docstring or isinstance(node, (ast.Import, ast.ImportFrom))):
+            break
+        at = node.end_lineno
+    return at
+
+
+def merge_code(base: str, addition: str) -> str:
+    """Merges addition into base at the level of top-level statements.
+
+    New imports go after the existing ones, definitions and simple assignments
+    replace same-named ones in place (classes member by member), and anything
+    else is appended, above a trailing main guard, unless an identical
+    statement exists. If either side does not parse, addition is appended as
+    text.
+    """
+    if not addition.strip():
+        return base
+    if not base.strip():
+        return addition
+    try:
+        base_tree = ast.parse(base)
+        add_tree = ast.parse(addition)
+    except SyntaxError:
+        return base if addition.strip() in base else base.rstrip("\n") + "\n\n" + addition
+    base_lines = base.splitlines()
+    add_lines = addition.splitlines()
+
+    existing = {ast.dump(n) for n in base_tree.body if isinstance(n, (ast.Import, ast.ImportFrom))}
+    new_imports = []
+    for node in add_tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and ast.dump(node) not in existing:
+            existing.add(ast.dump(node))
+            new_imports.extend(add_lines[node.lineno - 1:node.end_lineno])
+
+    base_segments, tail = _segments(base_lines, base_tree.body, 1)
+    add_segments, _ = _segments(add_lines, add_tree.body, 1)
+    add_segments = [s for s in add_segments if not isinstance(s[0], (ast.Import, ast.ImportFrom))]
+    # New definitions go above the main guard, which stays last.
+    guard = base_segments.pop() if base_segments and _is_main_guard(base_segments[-1][0]) else None
+    guard_key = _key(guard[0]) if guard else None
+    replacement = [s for s in add_segments if _key(s[0]) == guard_key]
+    merged = _merge_segments(base_segments, [s for s in add_segments if _key(s[0]) != guard_key])
+    if guard:
+        merged += _merge_segments([guard], replacement)
+    lines = [line for _, leading, body in merged for line in leading + body] + tail
+
+    if new_imports:
+        at = _insert_at(ast.parse("\n".join(lines)))
+        lines = lines[:at] + new_imports + lines[at:]
+    return "\n".join(lines) + "\n"
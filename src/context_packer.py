@@ -0,0 +1,183 @@
+"""
+Token-aware selection of code context for prompts.
+Keeps execution prompts within a small model's context window by sending only
+the definitions relevant to the current step.
+"""
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_TOP_LEVEL_DEF = re.compile(r"^(?:async\s+def|def|class)\s+([A-Za-z_][A-Za-z0-9_]*)", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimates the token count of text at roughly four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def _words(text: str) -> Set[str]:
+    """Lower-cased identifiers in text, also split at underscores and camelCase humps."""
+    words = set()
+    for identifier in _IDENTIFIER.findall(text):
+        words.add(identifier.lower())
+        for part in re.findall(r"[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])", identifier):
+            if len(part) > 2:
+                words.add(part.lower())
+    return words
+
+
+@dataclass
+class Symbol:
+    """A top-level definition: its full source, a signature-only summary and the names it uses."""
+    name: str
+    kind: str
+    source: str
+    signature: str
+    uses: Set[str] = field(default_factory=set)
+    order: int = 0
+
+
+def _signature(node: ast.AST, lines: List[str]) -> str:
+    """The header line(s) and docstring summary of a def or class, with the body elided."""
+    body_start = node.body[0].lineno - 1
+    header = "\n".join(lines[node.lineno - 1:body_start]) if body_start > node.lineno - 1 else lines[node.lineno - 1]
+    indent = " " * (node.col_offset + 4)
+    docstring = ast.get_docstring(node)
+    summary = f'{indent}"""{docstring.splitlines()[0]}"""\n' if docstring else ""
+    if isinstance(node, ast.ClassDef):
+        methods = [
+            lines[child.lineno - 1].strip()
+            for child in node.body
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        return header + "\n" + summary + "".join(f"{indent}{m} ...\n" for m in methods) + (f"{indent}...\n" if not methods else "")
+    return header + "\n" + summary + f"{indent}...\n"
+
+
+class SymbolIndex:
+    """Top-level symbols of a module that grows by appended code segments.
+
+    Each segment is parsed with ast; segments that are not valid Python (e.g.
+    partial model output) are split at top-level def/class lines instead.
+    A later definition of a name replaces the earlier one.
+    """
+
+    def __init__(self, code: str = ""):
+        self.symbols: Dict[str, Symbol] = {}
+        self.imports: List[str] = []
+        self._order = 0
+        if code:
+            self.add(code)
+
+    def add(self, code: str):
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            self._add_unparsed(code)
+            return
+        lines = code.splitlines()
+        for node in tree.body:
+            source = ast.get_source_segment(code, node) or ""
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                if source not in self.imports:
+                    self.imports.append(source)
+                continue
+            uses = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+            uses |= {n.attr for n in ast.walk(node) if isinstance(n, ast.Attribute)}
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                decorators = "\n".join(f"@{ast.get_source_segment(code, d)}" for d in node.decorator_list)
+                source = (decorators + "\n" if decorators else "") + source
+                self._put(Symbol(node.name, type(node).__name__, source, _signature(node, lines), uses))
+            else:
+                targets = [n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)]
+                name = targets[0] if targets else f"<statement {self._order}>"
+                self._put(Symbol(name, "Statement", source, source if estimate_tokens(source) < 40 else "", uses))
+
+    def _add_unparsed(self, code: str):
+        matches = list(_TOP_LEVEL_DEF.finditer(code))
+        if not matches or matches[0].start() > 0:
+            head = code[:matches[0].start()] if matches else code
+            if head.strip():
+                self._put(Symbol(f"<fragment {self._order}>", "Fragment", head, "", set(_IDENTIFIER.findall(head))))
+        for i, match in enumerate(matches):
+            source = code[match.start():matches[i + 1].start() if i + 1 < len(matches) else len(code)]
+            first_line = source.splitlines()[0]
+            self._put(Symbol(match.group(1), "Fragment", source, first_line + " ...\n", set(_IDENTIFIER.findall(source))))
+
+    def _put(self, symbol: Symbol):
+        symbol.order = self._order
+        self._order += 1
+        self.symbols[symbol.name] = symbol
+
+
+class ContextPacker:
+    """Selects the code context for one step within a token budget.
+
+    Symbols are ranked by how many words they share with the query (usually the
+    plan step), with the names they use pulled in after them. Imports are always
+    kept. The best-ranked symbols are included in full, the next ones as
+    signatures only, and the rest are omitted; the result keeps module order.
+    """
+
+    def __init__(self, budget_tokens: int = 3000):
+        self.budget_tokens = budget_tokens
+
+    def pack(self, index: SymbolIndex, query: str) -> str:
+        symbols = list(index.symbols.values())
+        imports = ["\n".join(index.imports)] if index.imports else []
+        full_text = "\n\n".join(imports + [s.source for s in sorted(symbols, key=lambda s: s.order)])
+        if estimate_tokens(full_text) <= self.budget_tokens:
+            return full_text
+
+        query_words = _words(query)
+        ranked = sorted(symbols, key=lambda s: (self._relevance(s, query_words), s.order), reverse=True)
+
+        # Definitions used by relevant symbols follow them in the ranking.
+        ordered: List[Symbol] = []
+        seen: Set[str] = set()
+        for symbol in ranked:
+            for s in [symbol] + [index.symbols[u] for u in sorted(symbol.uses) if u in index.symbols]:
+                if s.name not in seen:
+                    seen.add(s.name)
+                    ordered.append(s)
+
+        remaining = self.budget_tokens - sum(estimate_tokens(i) for i in imports)
+        chosen: Dict[str, str] = {}
+        for symbol in ordered:
+            for text in (symbol.source, symbol.signature):
+                cost = estimate_tokens(text) + 1
+                if text and cost <= remaining:
+                    chosen[symbol.name] = text
+                    remaining -= cost
+                    break
+
+        parts = list(imports)
+        parts += [chosen[s.name] for s in sorted(symbols, key=lambda s: s.order) if s.name in chosen]
+        omitted = len(symbols) - len(chosen)
+        if omitted:
+            parts.append(f"# ... {omitted} other definitions omitted")
+        return "\n\n".join(parts)
+
+    @staticmethod
+    def _relevance(symbol: Symbol, query_words: Set[str]) -> int:
+        # A symbol named in the query outranks one that merely shares words with it.
+        shared = query_words & (_words(symbol.name) | {u.lower() for u in symbol.uses})
+        return len(shared) + 2 * (symbol.name.lower() in query_words)
+
+    def window(self, lines: List[str], index: int, budget_tokens: int) -> str:
+        """The lines around lines[index] that fit in budget_tokens, e.g. the plan around the current step."""
+        start = end = index
+        remaining = budget_tokens - estimate_tokens(lines[index]) if lines else 0
+        while lines and remaining > 0 and (start > 0 or end < len(lines) - 1):
+            for candidate in (end + 1, start - 1):
+                if 0 <= candidate < len(lines) and not start <= candidate <= end:
+                    cost = estimate_tokens(lines[candidate]) + 1
+                    if cost > remaining:
+                        remaining = 0
+                        break
+                    remaining -= cost
+                    start, end = min(start, candidate), max(end, candidate)
+        return "\n".join(lines[start:end + 1])
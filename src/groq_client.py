@@ -2,30 +2,319 @@
 Dedicated module for all interactions with the Groq API.
 """
 
+import asyncio
 import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import groq
+import httpx
 from groq import Groq
+from .json_extract import JSONExtractor, extract_json
+from .request_scheduler import PRIORITY_GENERATE, RequestScheduler, default_scheduler
+from .response_cache import ResponseCache
+from .telemetry import get_telemetry
+from .transport import Completion, RateLimitedError, RetryableError
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GroqTransport:
+    """Sends chat completions through the Groq SDK, translating transient errors.
+
+    pool_size bounds the keep-alive connection pool; size it to the number of
+    concurrent requests so connections and TLS sessions are reused.
+    """
+
+    def __init__(self, api_key: str, pool_size: int = 10):
+        self.pool_size = pool_size
+        http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+        # Retries are owned by the RequestScheduler.
+        self.client = Groq(api_key=api_key, max_retries=0, http_client=http_client)
+
+    def complete(self, messages: List[Dict[str, str]], model: str) -> Completion:
+        try:
+            chat_completion = self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+            )
+        except groq.RateLimitError as e:
+            raise RateLimitedError(str(e), retry_after=_retry_after(e)) from e
+        except (groq.APIConnectionError, groq.InternalServerError) as e:
+            raise RetryableError(str(e), retry_after=_retry_after(e)) from e
+        usage = chat_completion.usage
+        return Completion(
+            content=chat_completion.choices[0].message.content,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    def stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        """Yields the completion text as it arrives. Closing the generator aborts the request."""
+        try:
+            response = self.client.chat.completions.create(
+                messages=messages,
+                model=model,
+                stream=True,
+            )
+        except groq.RateLimitError as e:
+            raise RateLimitedError(str(e), retry_after=_retry_after(e)) from e
+        except (groq.APIConnectionError, groq.InternalServerError) as e:
+            raise RetryableError(str(e), retry_after=_retry_after(e)) from e
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except groq.APIConnectionError as e:
+            raise RetryableError(str(e)) from e
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
 
 
 class GroqClient:
-    """A client for interacting with the Groq API."""
+    """A client for interacting with the Groq API.
+
+    Requests go through a RequestScheduler (the process-wide one by default)
+    and a transport (the Groq SDK unless one is given). If a ResponseCache is
+    given, or GROQ_CACHE_PATH is set, identical (model, prompt) requests are
+    answered from disk instead of the API.
+    """
+
+    # Reserved for the completion when budgeting tokens; corrected afterwards.
+    COMPLETION_TOKEN_ESTIMATE = 512
 
-    def __init__(self):
-        self.api_key = os.environ.get("GROQ_API_KEY")
-        if not self.api_key:
-            raise ValueError("GROQ_API_KEY environment variable not set.")
-        self.client = Groq(api_key=self.api_key)
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        transport=None,
+        scheduler: Optional[RequestScheduler] = None,
+        pool_size: int = 10,
+    ):
+        if transport is None:
+            api_key = os.environ.get("GROQ_API_KEY")
+            if not api_key:
+                raise ValueError("GROQ_API_KEY environment variable not set.")
+            transport = GroqTransport(api_key, pool_size=pool_size)
+        self.transport = transport
+        self.scheduler = scheduler or default_scheduler()
+        if cache is None and os.environ.get("GROQ_CACHE_PATH"):
+            cache = ResponseCache(os.environ["GROQ_CACHE_PATH"])
+        self.cache = cache
+        self.calls = 0
+        self.total_latency = 0.0
+        self.early_stops = 0
+        self._lock = threading.Lock()
 
     def generate(
-        self, prompt: str, model: str = "llama3-8b-8192"
+        self,
+        prompt: str,
+        model: str = "llama3-8b-8192",
+        use_cache: bool = True,
+        priority: int = PRIORITY_GENERATE,
     ) -> str:
-        """Generates a response from the Groq API."""
-        chat_completion = self.client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model=model,
+        """Generates a response from the Groq API.
+
+        Pass use_cache=False for calls that should sample a fresh response.
+        Lower priority values are admitted first when the rate limit is tight.
+        """
+        messages = [
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+        key = None
+        if self.cache is not None and use_cache:
+            key = ResponseCache.make_key(model, messages)
+            cached = self.cache.get(key)
+            if cached is not None:
+                get_telemetry().record_call(0.0, 0, 0, cached=True)
+                return cached
+
+        estimate = len(prompt) // 4 + self.COMPLETION_TOKEN_ESTIMATE
+        start_time = time.monotonic()
+        completion = self.scheduler.call(
+            lambda: self.transport.complete(messages, model), tokens=estimate, priority=priority
         )
-        return chat_completion.choices[0].message.content
+        self._record(start_time, completion.prompt_tokens, completion.completion_tokens)
+        if completion.prompt_tokens or completion.completion_tokens:
+            self.scheduler.settle(estimate, completion.prompt_tokens + completion.completion_tokens)
+        if key is not None:
+            self.cache.put(key, completion.content)
+        return completion.content
+
+    def stream(
+        self,
+        prompt: str,
+        model: str = "llama3-8b-8192",
+        use_cache: bool = True,
+        priority: int = PRIORITY_GENERATE,
+    ) -> Iterator[str]:
+        """Generates a response from the Groq API, yielding its text as it arrives.
+
+        Failures before the first chunk are retried like generate(); once text
+        has been yielded, errors propagate. Only completely consumed responses
+        are cached. Falls back to one chunk for transports that cannot stream.
+        """
+        stream = getattr(self.transport, "stream", None)
+        if stream is None:
+            yield self.generate(prompt, model, use_cache, priority)
+            return
+
+        messages = [
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+        key = None
+        if self.cache is not None and use_cache:
+            key = ResponseCache.make_key(model, messages)
+            cached = self.cache.get(key)
+            if cached is not None:
+                get_telemetry().record_call(0.0, 0, 0, cached=True)
+                yield cached
+                return
+
+        def open_stream():
+            chunks = stream(messages, model)
+            return chunks, next(chunks, "")
+
+        estimate = len(prompt) // 4 + self.COMPLETION_TOKEN_ESTIMATE
+        start_time = time.monotonic()
+        chunks, first = self.scheduler.call(open_stream, tokens=estimate, priority=priority)
+        parts = [first]
+        try:
+            if first:
+                yield first
+            for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+        finally:
+            chunks.close()
+            completion_tokens = sum(len(p) for p in parts) // 4
+            self._record(start_time, len(prompt) // 4, completion_tokens)
+            self.scheduler.settle(estimate, len(prompt) // 4 + completion_tokens)
+        if key is not None:
+            self.cache.put(key, "".join(parts))
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Async version of stream(); the blocking reads run in the event loop's executor."""
+        loop = asyncio.get_running_loop()
+        chunks = self.stream(prompt, **kwargs)
+        done = object()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, done)
+                if chunk is done:
+                    break
+                yield chunk
+        finally:
+            await loop.run_in_executor(None, chunks.close)
+
+    def generate_json(
+        self,
+        prompt: str,
+        model: str = "llama3-8b-8192",
+        use_cache: bool = True,
+        priority: int = PRIORITY_GENERATE,
+        openers: str = "{[",
+    ) -> Any:
+        """Generates a response and returns the first JSON value in it, or None.
+
+        With a streaming transport the response is parsed as it arrives and the
+        request is aborted as soon as a complete value has been received, so no
+        output tokens are spent on trailing prose. openers restricts the wanted
+        values, e.g. "[" for an array.
+        """
+        stream = getattr(self.transport, "stream", None)
+        if stream is None:
+            return extract_json(self.generate(prompt, model, use_cache, priority), openers)
+
+        messages = [
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
+        key = None
+        if self.cache is not None and use_cache:
+            key = ResponseCache.make_key(model, messages)
+            cached = self.cache.get(key)
+            if cached is not None:
+                get_telemetry().record_call(0.0, 0, 0, cached=True)
+                return extract_json(cached, openers)
+
+        def consume() -> JSONExtractor:
+            extractor = JSONExtractor(openers)
+            chunks = stream(messages, model)
+            try:
+                for chunk in chunks:
+                    if extractor.feed(chunk):
+                        break
+            finally:
+                chunks.close()
+            return extractor
+
+        estimate = len(prompt) // 4 + self.COMPLETION_TOKEN_ESTIMATE
+        start_time = time.monotonic()
+        extractor = self.scheduler.call(consume, tokens=estimate, priority=priority)
+        # Streams carry no usage counts; record and settle character-based estimates.
+        self._record(start_time, len(prompt) // 4, len(extractor.text) // 4, stopped_early=extractor.done)
+        self.scheduler.settle(estimate, (len(prompt) + len(extractor.text)) // 4)
+        if key is not None:
+            self.cache.put(key, extractor.text)
+        return extractor.value
+
+    def _record(self, start_time: float, prompt_tokens: int, completion_tokens: int, stopped_early: bool = False):
+        latency = time.monotonic() - start_time
+        with self._lock:
+            self.calls += 1
+            self.total_latency += latency
+            if stopped_early:
+                self.early_stops += 1
+        get_telemetry().record_call(latency, prompt_tokens, completion_tokens, retries=self.scheduler.last_call_retries())
+
+    def stats(self) -> Dict[str, float]:
+        """Returns API call, latency, retry, early stop and cache counters for this client."""
+        with self._lock:
+            stats = {
+                "calls": self.calls,
+                "mean_latency": self.total_latency / self.calls if self.calls else 0.0,
+                "retries": self.scheduler.retries,
+                "early_stops": self.early_stops,
+                "pool_size": getattr(self.transport, "pool_size", 0),
+            }
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            stats["cache_hits"] = cache_stats["hits"]
+            stats["cache_misses"] = cache_stats["misses"]
+        return stats
+
+
+_shared_client: Optional[GroqClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_client(pool_size: Optional[int] = None) -> GroqClient:
+    """Returns the process-wide GroqClient, creating it on first use.
+
+    pool_size only takes effect on the call that creates the client, so entry
+    points should call this first with their evaluation concurrency.
+    """
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = GroqClient(pool_size=pool_size or 10)
+        return _shared_client
@@ -0,0 +1,113 @@
+"""
+Tolerant extraction of JSON values and scores from model output.
+Models wrap JSON in markdown fences and prose; these helpers find the payload anyway.
+"""
+
+import json
+import math
+import re
+from typing import Any, Optional
+
+_CLOSERS = {"{": "}", "[": "]"}
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_OUT_OF = r"\s*(?:/|out of)\s*(" + _NUMBER + ")"
+_LABELLED_SCORE = re.compile(r"(?:score|rating)\W{0,3}(" + _NUMBER + ")(?:" + _OUT_OF + ")?", re.IGNORECASE)
+_RATIO_SCORE = re.compile("(" + _NUMBER + ")" + _OUT_OF, re.IGNORECASE)
+_ANY_NUMBER = re.compile(_NUMBER)
+
+
+class JSONExtractor:
+    """Finds the first complete, valid JSON object or array in text that arrives in chunks.
+
+    feed() returns True as soon as a balanced value that json.loads accepts has
+    arrived; it is then available as .value. Candidates that turn out not to be
+    JSON (braces in prose, mismatched brackets) are skipped. openers restricts
+    which values are wanted, e.g. "{" for objects only.
+    """
+
+    def __init__(self, openers: str = "{["):
+        self.openers = openers
+        self.text = ""
+        self.value: Any = None
+        self.done = False
+        self._pos = 0
+        self._start = -1
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> bool:
+        if self.done:
+            return True
+        self.text += chunk
+        text = self.text
+        while self._pos < len(text):
+            if self._start < 0:
+                starts = [i for i in (text.find(o, self._pos) for o in self.openers) if i >= 0]
+                if not starts:
+                    self._pos = len(text)
+                    break
+                self._start = self._pos = min(starts)
+                self._stack = []
+                self._in_string = self._escape = False
+
+            char = text[self._pos]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                self._stack.append(_CLOSERS[char])
+            elif char in "}]":
+                if char != self._stack.pop():
+                    self._abandon()
+                elif not self._stack:
+                    try:
+                        self.value = json.loads(text[self._start:self._pos])
+                    except ValueError:
+                        self._abandon()
+                        continue
+                    self.done = True
+                    return True
+        return False
+
+    def _abandon(self):
+        # Resume the search just after the failed candidate's opening bracket.
+        self._pos = self._start + 1
+        self._start = -1
+
+
+def extract_json(text: str, openers: str = "{[") -> Any:
+    """Returns the first JSON object or array embedded in text, or None."""
+    extractor = JSONExtractor(openers)
+    extractor.feed(text)
+    return extractor.value
+
+
+def extract_score(text: str) -> Optional[float]:
+    """Returns the numeric score in a model response, or None.
+
+    A bare number is taken as is; otherwise the first number labelled "score"
+    or "rating", else the first "N/M" or "N out of M", else the first number.
+    Ratios are returned as N/M, so "7/10" and "0.7" score the same. NaN,
+    infinite values and zero denominators are rejected.
+    """
+    text = text.strip()
+    try:
+        score = float(text)
+    except ValueError:
+        match = _LABELLED_SCORE.search(text) or _RATIO_SCORE.search(text)
+        if match:
+            score, out_of = float(match.group(1)), match.group(2)
+            if out_of is not None:
+                score = score / float(out_of) if float(out_of) else None
+        else:
+            match = _ANY_NUMBER.search(text)
+            score = float(match.group(0)) if match else None
+    return score if score is not None and math.isfinite(score) else None
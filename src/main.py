@@ -22,6 +22,10 @@ def main():
     parser.add_argument(
         "--output-file", help="Path to save the generated code."
     )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Show the plan and code as they are generated, and update the output file after every step."
+    )
     args = parser.parse_args()
 
     file_content = ""
@@ -29,7 +33,17 @@ def main():
         file_content = read_file(args.file)
 
     improver = RecursiveImprover()
-    final_code = improver.run(user_prompt=args.prompt, file_content=file_content)
+    if args.stream:
+        save = (lambda code: write_to_file(args.output_file, code)) if args.output_file else None
+        final_code = improver.run(
+            user_prompt=args.prompt,
+            file_content=file_content,
+            on_token=lambda text: print(text, end="", flush=True),
+            on_code=save,
+        )
+        print()
+    else:
+        final_code = improver.run(user_prompt=args.prompt, file_content=file_content)
 
     if args.output_file:
         write_to_file(args.output_file, final_code)
@@ -0,0 +1,111 @@
+"""
+Parsing and tolerant application of model-written unified diffs.
+Models get line numbers wrong, so hunks are located by their context lines.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+_FENCE = re.compile(r"```(?:diff|patch)?\n(.*?)```", re.DOTALL)
+
+
+class PatchError(ValueError):
+    """A hunk's context could not be found in the code."""
+
+
+@dataclass
+class Hunk:
+    """One hunk of a unified diff: the lines it expects (old) and their replacement (new)."""
+    old_start: Optional[int]
+    old: List[str] = field(default_factory=list)
+    new: List[str] = field(default_factory=list)
+
+
+def parse_unified_diff(text: str) -> List[Hunk]:
+    """Returns the hunks of a unified diff, which may be fenced and surrounded by prose."""
+    fenced = _FENCE.findall(text)
+    if fenced:
+        text = "\n".join(fenced)
+    hunks: List[Hunk] = []
+    hunk: Optional[Hunk] = None
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        header = _HUNK_HEADER.match(line)
+        if header:
+            # "-5,0" inserts after line 5.
+            start = int(header.group(1))
+            hunk = Hunk(start + 1 if header.group(2) == "0" else start)
+            hunks.append(hunk)
+        elif line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ ") or line.startswith("+++ ") and i and lines[i - 1].startswith("--- "):
+            # File headers.
+            hunk = None
+            continue
+        elif hunk is None and line.startswith(("+", "-")):
+            # A hunk without an @@ header.
+            hunk = Hunk(None)
+            hunks.append(hunk)
+        if hunk is None or header or line.startswith("\\"):
+            continue
+        if line.startswith("-"):
+            hunk.old.append(line[1:])
+        elif line.startswith("+"):
+            hunk.new.append(line[1:])
+        elif line.startswith(" ") or not line:
+            hunk.old.append(line[1:])
+            hunk.new.append(line[1:])
+        else:
+            # Prose after the diff ends the hunk.
+            hunk = None
+    for h in hunks:
+        # Blank lines after a hunk are usually spacing, not context.
+        while h.old and h.new and h.old[-1] == h.new[-1] == "":
+            h.old.pop()
+            h.new.pop()
+    return [h for h in hunks if h.old != h.new]
+
+
+def _find(lines: List[str], block: List[str], start: int, expected: int) -> int:
+    """Index of block in lines at or after start, preferring the match closest to expected."""
+    for normalize in (lambda s: s, str.rstrip, str.strip):
+        target = [normalize(line) for line in block]
+        candidates = [
+            i for i in range(start, len(lines) - len(block) + 1)
+            if [normalize(line) for line in lines[i:i + len(block)]] == target
+        ]
+        if candidates:
+            return min(candidates, key=lambda i: abs(i - expected))
+    return -1
+
+
+def apply_patch(code: str, hunks: List[Hunk]) -> str:
+    """Applies hunks in order, locating each by its removed and context lines.
+
+    Line numbers only break ties between several matches; whitespace
+    differences are tolerated. Raises PatchError if a hunk cannot be placed.
+    """
+    lines = code.splitlines()
+    position = 0
+    offset = 0
+    for hunk in hunks:
+        expected = max(0, (hunk.old_start or 1) - 1 + offset)
+        if hunk.old:
+            at = _find(lines, hunk.old, position, expected)
+            if at < 0:
+                raise PatchError(f"Hunk context not found: {hunk.old[0]!r}")
+        else:
+            at = min(max(expected, position), len(lines))
+        lines[at:at + len(hunk.old)] = hunk.new
+        position = at + len(hunk.new)
+        offset += len(hunk.new) - len(hunk.old)
+    return "\n".join(lines) + ("\n" if code.endswith("\n") or not code else "")
+
+
+def compile_error(code: str) -> Optional[str]:
+    """Returns why code does not compile, or None if it does."""
+    try:
+        compile(code, "<generated>", "exec")
+    except (SyntaxError, ValueError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
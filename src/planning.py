@@ -0,0 +1,106 @@
+"""
+Parsing of model-written plans into steps with dependencies, and scheduling
+of those steps into waves that can run concurrently.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+from .json_extract import extract_json
+
+# Bullets, numbering and "Step 3:" prefixes in front of a plan line.
+_STEP_PREFIX = re.compile(r"^\s*(?:[-*+]\s+|\d+[.)]\s*|step\s*\d+\s*[:.)-]\s*)+", re.IGNORECASE)
+
+
+@dataclass
+class PlanStep:
+    """One step of a plan. depends_on lists the ids of steps that must finish first."""
+    id: str
+    description: str
+    depends_on: List[str] = field(default_factory=list)
+
+
+def _is_header(line: str) -> bool:
+    stripped = line.strip()
+    return (
+        not stripped
+        or stripped.startswith(("#", "```"))
+        or stripped.endswith(":")
+        or bool(re.fullmatch(r"\*\*[^*]+\*\*|[-*+\d.)\s]+|[=-]{3,}", stripped))
+    )
+
+
+def _parse_lines(plan: str) -> List[PlanStep]:
+    """Each non-header line is a step that depends on the one before it."""
+    steps: List[PlanStep] = []
+    for line in plan.splitlines():
+        if _is_header(line):
+            continue
+        description = _STEP_PREFIX.sub("", line).strip()
+        if description:
+            depends_on = [steps[-1].id] if steps else []
+            steps.append(PlanStep(str(len(steps) + 1), description, depends_on))
+    return steps
+
+
+def _unique_ids(steps: List[PlanStep]) -> List[PlanStep]:
+    """Renumbers steps whose id repeats an earlier step's; dependencies keep pointing at the first."""
+    taken = {step.id for step in steps}
+    seen = set()
+    for i, step in enumerate(steps):
+        if step.id in seen:
+            step.id = str(i + 1)
+            while step.id in taken:
+                step.id += "'"
+            taken.add(step.id)
+        seen.add(step.id)
+    return steps
+
+
+def parse_plan(plan: str) -> List[PlanStep]:
+    """Parses a plan written as a JSON array of {"id", "description", "depends_on"} objects.
+
+    Falls back to one sequential step per line, skipping headers, rules and
+    empty bullets, when the plan holds no usable JSON. Repeated ids are
+    renumbered so every step id is unique.
+    """
+    data = extract_json(plan, "[")
+    if not isinstance(data, list):
+        return _parse_lines(plan)
+    steps = []
+    for i, item in enumerate(data):
+        if isinstance(item, str):
+            item = {"description": item}
+        if not isinstance(item, dict) or not str(item.get("description") or "").strip():
+            continue
+        depends_on = item.get("depends_on") or []
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+        steps.append(PlanStep(
+            str(item.get("id", i + 1)),
+            str(item["description"]).strip(),
+            [str(d) for d in depends_on],
+        ))
+    return _unique_ids(steps) if steps else _parse_lines(plan)
+
+
+def execution_waves(steps: List[PlanStep]) -> List[List[PlanStep]]:
+    """Groups steps into waves: every step runs after all the steps it depends on.
+
+    Steps of one wave are independent of each other. Unknown dependencies are
+    ignored; steps caught in a dependency cycle run one per wave in plan order.
+    """
+    ids = {s.id for s in steps}
+    remaining = {s.id: {d for d in s.depends_on if d in ids and d != s.id} for s in steps}
+    waves = []
+    while remaining:
+        wave = [s for s in steps if s.id in remaining and not remaining[s.id]]
+        if not wave:
+            wave = [next(s for s in steps if s.id in remaining)]
+        waves.append(wave)
+        for s in wave:
+            del remaining[s.id]
+        for deps in remaining.values():
+            deps.difference_update(s.id for s in wave)
+    return waves
@@ -5,12 +5,13 @@ Centralized store for all system prompts and prompt templates.
 # Prompt to generate a high-level plan from a user's request.
 PLANNING_PROMPT = """
 You are a senior software engineer. Your task is to create a high-level plan to address the following user request.
-The plan should be a list of concise steps.
+The plan should be a list of concise steps. Each step should produce one function, class or other self-contained piece of code.
 Focus on the essential steps to create a functional and correct implementation.
+Output the plan as a JSON array of objects with the keys "id" (a number), "description" (the step) and "depends_on" (the ids of the steps whose code this step uses). Steps that do not use each other's code must not depend on each other.
 
 User Request: {user_prompt}
 
-High-Level Plan:
+High-Level Plan (JSON):
 """
 
 # Prompt to generate code for a specific step in the plan.
@@ -30,16 +31,17 @@ Current Code:
 Code for Current Step:
 """
 
-# Prompt to refine the generated code.
+# Prompt to refine the generated code with a patch instead of a full rewrite.
 REFINEMENT_PROMPT = """
 You are a senior software engineer. Your task is to review and refine the following Python code.
 Look for improvements in clarity, efficiency, correctness, and adherence to best practices.
-Provide the improved code directly. If no improvements are necessary, return the original code.
-
+Reply with the changes only, as a unified diff (lines starting with "@@", " ", "-" and "+") against the original code. Include a few unchanged context lines around every change.
+If no improvements are necessary, reply with exactly: NO CHANGES
+{feedback}
 Original Code:
 ---
 {code}
 ---
 
-Refined Code:
+Unified Diff:
 """
@@ -3,42 +3,159 @@ The heart of the tool. Contains the core logic for the
 Plan -> Decompose -> Execute -> Refine loop.
 """
 
-from .groq_client import GroqClient
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from .code_merger import extract_code_blocks, merge_code
+from .context_packer import ContextPacker, SymbolIndex
+from .groq_client import GroqClient, get_client
+from .patching import PatchError, apply_patch, compile_error, parse_unified_diff
+from .planning import PlanStep, execution_waves, parse_plan
+from .telemetry import get_telemetry
 from . import prompts
 
 
 class RecursiveImprover:
-    """Implements the recursive improvement loop."""
+    """Implements the recursive improvement loop.
 
-    def __init__(self):
-        self.groq_client = GroqClient()
+    Execution prompts carry at most context_budget tokens of code, chosen by
+    relevance to the step, and at most plan_budget tokens of the plan around
+    the step, so long plans stay within a small model's context window.
 
-    def run(self, user_prompt: str, file_content: str = "") -> str:
-        """Runs the full recursive improvement process."""
+    Plan steps declare their dependencies; steps whose dependencies are done
+    run together, up to max_workers at once, and their code is merged into
+    the module with an AST-level merge.
+
+    Refinement asks for unified diffs and applies them locally, for up to
+    refinement_passes passes. validator(code) returns an error message or
+    None (by default, whether the code compiles); refinement stops once a
+    pass changes nothing or leaves the code valid.
+    """
+
+    def __init__(
+        self,
+        groq_client: Optional[GroqClient] = None,
+        context_budget: int = 3000,
+        plan_budget: int = 800,
+        max_workers: int = 4,
+        refinement_passes: int = 3,
+        validator: Callable[[str], Optional[str]] = compile_error,
+    ):
+        self.groq_client = groq_client or get_client()
+        self.packer = ContextPacker(context_budget)
+        self.plan_budget = plan_budget
+        self.max_workers = max_workers
+        self.refinement_passes = refinement_passes
+        self.validator = validator
+
+    def _generate(self, prompt: str, on_token: Optional[Callable[[str], None]]) -> str:
+        """Generates a response, passing its text to on_token as it streams in if given."""
+        if on_token is None:
+            return self.groq_client.generate(prompt)
+        parts = []
+        for chunk in self.groq_client.stream(prompt):
+            parts.append(chunk)
+            on_token(chunk)
+        return "".join(parts)
+
+    def run(
+        self,
+        user_prompt: str,
+        file_content: str = "",
+        on_token: Optional[Callable[[str], None]] = None,
+        on_code: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Runs the full recursive improvement process.
+
+        With on_token, responses are streamed and their text is passed to it as
+        it arrives: the plan, then every step in plan order (steps of a wave
+        still run concurrently; later ones are buffered), then the refinement.
+        on_code receives the merged module after every wave and the final code.
+        """
         # 1. Plan
         plan_prompt = prompts.PLANNING_PROMPT.format(user_prompt=user_prompt)
-        plan = self.groq_client.generate(plan_prompt)
-        print(f"Generated Plan:\n{plan}")
+        if on_token is not None:
+            print("Generated Plan:")
+        with get_telemetry().span("plan"):
+            plan = self._generate(plan_prompt, on_token)
+        if on_token is None:
+            print(f"Generated Plan:\n{plan}")
 
-        # 2. Decompose & Execute
-        steps = [step.strip() for step in plan.split('\n') if step.strip()]
+        # 2. Decompose & Execute, one wave of independent steps at a time
+        steps = parse_plan(plan)
+        plan_lines = [f"{step.id}. {step.description}" for step in steps]
+        positions = {step.id: i for i, step in enumerate(steps)}
         current_code = file_content
-        for step in steps:
-            if not step:
-                continue
-            print(f"Executing Step: {step}")
-            execution_prompt = prompts.EXECUTION_PROMPT.format(
-                user_prompt=user_prompt,
-                plan=plan,
-                step=step,
-                current_code=current_code,
-            )
-            generated_code = self.groq_client.generate(execution_prompt)
-            current_code += "\n" + generated_code
+
+        def execute(step: PlanStep, index: SymbolIndex, sink: Optional[queue.Queue]) -> str:
+            # Everything runs inside the try so the streaming sentinel is always sent.
+            try:
+                execution_prompt = prompts.EXECUTION_PROMPT.format(
+                    user_prompt=user_prompt,
+                    plan=self.packer.window(plan_lines, positions[step.id], self.plan_budget),
+                    step=step.description,
+                    current_code=self.packer.pack(index, f"{user_prompt}\n{step.description}"),
+                )
+                with get_telemetry().span("execute", step=step.id):
+                    return self._generate(execution_prompt, sink.put if sink is not None else None)
+            finally:
+                if sink is not None:
+                    sink.put(None)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for wave in execution_waves(steps):
+                index = SymbolIndex(current_code)
+                sinks = [queue.Queue() if on_token is not None else None for _ in wave]
+                futures = []
+                for step, sink in zip(wave, sinks):
+                    if on_token is None:
+                        print(f"Executing Step: {step.description}")
+                    futures.append(pool.submit(execute, step, index, sink))
+                if on_token is not None:
+                    for step, sink in zip(wave, sinks):
+                        print(f"\nExecuting Step: {step.description}")
+                        for chunk in iter(sink.get, None):
+                            on_token(chunk)
+                # Merge in plan order so the result does not depend on which call finished first.
+                for future in futures:
+                    current_code = merge_code(current_code, extract_code_blocks(future.result()))
+                if on_code is not None:
+                    on_code(current_code)
 
         # 3. Refine
-        print("Refining generated code...")
-        refinement_prompt = prompts.REFINEMENT_PROMPT.format(code=current_code)
-        refined_code = self.groq_client.generate(refinement_prompt)
+        print("\nRefining generated code..." if on_token is not None else "Refining generated code...")
+        refined_code = self.refine(current_code, on_token)
+        if on_code is not None:
+            on_code(refined_code)
 
         return refined_code
+
+    def refine(self, code: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+        """Improves code with model-written patches until a pass changes nothing or the code is valid.
+
+        Validation errors are fed back into the next pass. A patch that does not
+        apply ends refinement, and one that breaks valid code is discarded.
+        """
+        for _ in range(self.refinement_passes):
+            error = self.validator(code)
+            feedback = f"\nThe code currently fails validation with: {error}\nYour diff must fix this.\n" if error else ""
+            with get_telemetry().span("refine"):
+                response = self._generate(prompts.REFINEMENT_PROMPT.format(code=code, feedback=feedback), on_token)
+            hunks = parse_unified_diff(response)
+            if not hunks:
+                break
+            try:
+                patched = apply_patch(code, hunks)
+            except PatchError as e:
+                print(f"\nDiscarding refinement patch: {e}")
+                break
+            if patched == code:
+                break
+            patched_error = self.validator(patched)
+            if patched_error and not error:
+                print(f"\nDiscarding refinement patch that breaks the code: {patched_error}")
+                break
+            code = patched
+            if patched_error is None:
+                break
+        return code
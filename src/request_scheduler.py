@@ -0,0 +1,157 @@
+"""
+Rate-limit-aware scheduling of API requests: token buckets for requests and
+tokens per minute, a priority queue for admission, and retries with jittered
+exponential backoff.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+from .transport import RateLimitedError, RetryableError
+
+T = TypeVar("T")
+
+# Lower values are admitted first.
+PRIORITY_GENERATE = 0
+PRIORITY_VARIATION = 5
+PRIORITY_CRITIC = 10
+
+
+class TokenBucket:
+    """Refills at rate_per_minute and holds at most `capacity` units."""
+
+    def __init__(self, rate_per_minute: float, capacity: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units (capped at capacity) are available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def consume(self, amount: float, now: float):
+        """Takes units out of the bucket; the level may go negative to repay a debt."""
+        self._refill(now)
+        self.level -= amount
+
+
+class RequestScheduler:
+    """Admits requests under a requests/minute and tokens/minute budget.
+
+    Limits are scaled by `headroom` so throughput stays just below the quota,
+    and buckets hold only `burst_seconds` worth of budget so requests are
+    spread evenly instead of bursting. Waiting callers are admitted in priority
+    order. A rate-limit response pauses every caller for its retry-after delay.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 30000,
+        headroom: float = 0.9,
+        burst_seconds: float = 10.0,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        rng: Optional[random.Random] = None,
+    ):
+        rpm = requests_per_minute * headroom
+        tpm = tokens_per_minute * headroom
+        self.requests = TokenBucket(rpm, max(1.0, rpm * burst_seconds / 60.0))
+        self.tokens = TokenBucket(tpm, max(1.0, tpm * burst_seconds / 60.0))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+        self.retries = 0
+        self._local = threading.local()
+        self._blocked_until = 0.0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _acquire(self, tokens: int, priority: int):
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                timeout = None
+                if self._waiting[0] == ticket:
+                    now = time.monotonic()
+                    timeout = max(
+                        self._blocked_until - now,
+                        self.requests.wait_time(1, now),
+                        self.tokens.wait_time(tokens, now),
+                    )
+                    if timeout <= 0:
+                        self.requests.consume(1, now)
+                        self.tokens.consume(tokens, now)
+                        heapq.heappop(self._waiting)
+                        self._cond.notify_all()
+                        return
+                self._cond.wait(timeout)
+
+    def _backoff(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """Corrects the token budget once a request's real usage is known."""
+        with self._cond:
+            self.tokens.consume(actual_tokens - estimated_tokens, time.monotonic())
+
+    def last_call_retries(self) -> int:
+        """Retries made by the latest call() on the current thread."""
+        return getattr(self._local, "retries", 0)
+
+    def call(self, fn: Callable[[], T], tokens: int = 0, priority: int = PRIORITY_GENERATE) -> T:
+        """Runs fn once it is admitted, retrying transient failures with backoff."""
+        attempt = 0
+        self._local.retries = 0
+        while True:
+            self._acquire(tokens, priority)
+            try:
+                return fn()
+            except RetryableError as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                with self._cond:
+                    self.retries += 1
+                self._local.retries = attempt
+                delay = self._backoff(attempt)
+                if e.retry_after is not None:
+                    delay = e.retry_after + self.rng.uniform(0, self.base_delay)
+                if isinstance(e, RateLimitedError):
+                    with self._cond:
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+                        self._cond.notify_all()
+                else:
+                    time.sleep(delay)
+
+
+_default_scheduler: Optional[RequestScheduler] = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler() -> RequestScheduler:
+    """Returns the process-wide scheduler, configured from GROQ_REQUESTS_PER_MINUTE
+    and GROQ_TOKENS_PER_MINUTE when set."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler(
+                requests_per_minute=float(os.environ.get("GROQ_REQUESTS_PER_MINUTE", 30)),
+                tokens_per_minute=float(os.environ.get("GROQ_TOKENS_PER_MINUTE", 30000)),
+            )
+        return _default_scheduler
@@ -0,0 +1,176 @@
+"""
+In-process telemetry: phase spans, per-call latency and token histograms,
+and exports to Prometheus text and Chrome trace files.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192)
+
+# Calls issued outside any span are attributed to this phase.
+NO_PHASE = "other"
+
+_COUNTERS = ("calls", "cache_hits", "retries", "prompt_tokens", "completion_tokens", "latency_seconds")
+
+
+class Histogram:
+    """Counts of observations per bucket upper bound, plus their sum."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            pairs.append((str(bound), total))
+        return pairs
+
+
+class Telemetry:
+    """Records spans and LLM calls for the whole process.
+
+    span(name, **tags) marks a phase (research, generate, critique, crossover,
+    mutation, plan, execute, refine, ...) on the current thread. LLM calls made
+    inside it are attributed to the innermost span and inherit its tags, e.g.
+    genome_id. Only the latest max_spans spans are kept for trace export.
+    """
+
+    def __init__(self, max_spans: int = 100000):
+        self.spans = deque(maxlen=max_spans)
+        self.latency: Dict[str, Histogram] = {}
+        self.tokens: Dict[str, Histogram] = {}
+        self.totals: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self._window: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        self._window_start = time.monotonic()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Tuple[str, Dict]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Tuple[str, Dict]:
+        """The innermost span's name and the tags of all enclosing spans."""
+        stack = self._stack()
+        tags = {}
+        for _, span_tags in stack:
+            tags.update(span_tags)
+        return (stack[-1][0] if stack else NO_PHASE), tags
+
+    @contextmanager
+    def span(self, name: str, **tags) -> Iterator[None]:
+        stack = self._stack()
+        stack.append((name, tags))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._add_span(name, start, time.perf_counter() - start, tags)
+
+    def _add_span(self, name: str, start: float, duration: float, args: Dict):
+        self.spans.append((name, start - self._origin, duration, threading.get_ident(), args))
+
+    def record_call(self, latency: float, prompt_tokens: int, completion_tokens: int, retries: int = 0, cached: bool = False):
+        """Records one LLM request (or cache hit) in the current phase."""
+        phase, tags = self.current()
+        with self._lock:
+            for counters in (self.totals[phase], self._window[phase]):
+                if cached:
+                    counters["cache_hits"] += 1
+                    continue
+                counters["calls"] += 1
+                counters["retries"] += retries
+                counters["prompt_tokens"] += prompt_tokens
+                counters["completion_tokens"] += completion_tokens
+                counters["latency_seconds"] += latency
+            if not cached:
+                self.latency.setdefault(phase, Histogram(LATENCY_BUCKETS)).observe(latency)
+                self.tokens.setdefault(phase, Histogram(TOKEN_BUCKETS)).observe(prompt_tokens + completion_tokens)
+        if not cached:
+            args = dict(tags, phase=phase, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, retries=retries)
+            self._add_span("llm", time.perf_counter() - latency, latency, args)
+
+    def take_summary(self) -> Dict:
+        """Per-phase counters and throughput since the previous call, e.g. for one generation."""
+        with self._lock:
+            window, self._window = self._window, defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+            now = time.monotonic()
+            elapsed, self._window_start = now - self._window_start, now
+        phases = {phase: dict(counters) for phase, counters in window.items()}
+        calls = sum(c["calls"] for c in phases.values())
+        tokens = sum(c["prompt_tokens"] + c["completion_tokens"] for c in phases.values())
+        return {
+            "seconds": elapsed,
+            "calls": calls,
+            "tokens": tokens,
+            "calls_per_second": calls / elapsed if elapsed else 0.0,
+            "tokens_per_second": tokens / elapsed if elapsed else 0.0,
+            "phases": phases,
+        }
+
+    def export_prometheus(self, path: str):
+        """Writes counters and histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for counter in _COUNTERS:
+                metric = f"aicai_llm_{counter}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines += [f'{metric}{{phase="{phase}"}} {values[counter]}' for phase, values in sorted(self.totals.items())]
+            for metric, histograms in (("aicai_llm_latency_seconds", self.latency), ("aicai_llm_tokens", self.tokens)):
+                lines.append(f"# TYPE {metric} histogram")
+                for phase, histogram in sorted(histograms.items()):
+                    lines += [f'{metric}_bucket{{phase="{phase}",le="{le}"}} {count}' for le, count in histogram.cumulative()]
+                    lines.append(f'{metric}_sum{{phase="{phase}"}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{phase="{phase}"}} {histogram.count}')
+        _write(path, "\n".join(lines) + "\n")
+
+    def export_chrome_trace(self, path: str):
+        """Writes spans as a Chrome trace (open in chrome://tracing or Perfetto)."""
+        pid = os.getpid()
+        events = [
+            {"name": name, "cat": args.get("phase", name), "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": pid, "tid": tid, "args": args}
+            for name, start, duration, tid, args in list(self.spans)
+        ]
+        _write(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str))
+
+
+def _write(path: str, content: str):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Returns the process-wide Telemetry."""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = Telemetry()
+        return _telemetry
@@ -0,0 +1,240 @@
+"""
+Transports carry a chat completion request to a model backend and back.
+GroqClient talks to a transport, so tests and benchmarks can swap the network
+for a local fake, a synthetic model or a replay of recorded responses.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+from .response_cache import ResponseCache
+
+
+@dataclass
+class Completion:
+    """A model response with the token usage reported for it."""
+    content: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class RetryableError(Exception):
+    """A transient failure that is worth retrying."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(RetryableError):
+    """The backend rejected the request for exceeding a rate limit."""
+
+
+class FakeTransport:
+    """A local transport for tests.
+
+    Replies with a fixed string or responder(messages, model), after an optional
+    latency. The first `failures` calls raise RateLimitedError with retry_after.
+    stream() yields the same reply in chunks of chunk_size characters.
+    """
+
+    def __init__(
+        self,
+        responder: Union[str, Callable[[List[Dict[str, str]], str], str]] = "",
+        latency: float = 0.0,
+        failures: int = 0,
+        retry_after: Optional[float] = None,
+        chunk_size: int = 16,
+    ):
+        self.responder = responder
+        self.latency = latency
+        self.failures = failures
+        self.retry_after = retry_after
+        self.chunk_size = chunk_size
+        self.calls: List[List[Dict[str, str]]] = []
+        self._lock = threading.Lock()
+
+    def _respond(self, messages: List[Dict[str, str]], model: str) -> str:
+        with self._lock:
+            self.calls.append(messages)
+            fail = self.failures > 0
+            if fail:
+                self.failures -= 1
+        latency = self._latency()
+        if latency:
+            time.sleep(latency)
+        if fail:
+            raise RateLimitedError("Fake rate limit.", retry_after=self.retry_after)
+        if callable(self.responder):
+            return self.responder(messages, model)
+        return self.responder
+
+    def _latency(self) -> float:
+        return self.latency
+
+    def complete(self, messages: List[Dict[str, str]], model: str) -> Completion:
+        content = self._respond(messages, model)
+        prompt_tokens = sum(len(m["content"]) for m in messages) // 4
+        return Completion(content, prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4)
+
+    def stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        content = self._respond(messages, model)
+        for i in range(0, len(content), self.chunk_size):
+            yield content[i:i + self.chunk_size]
+
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+
+class SyntheticTransport(FakeTransport):
+    """A FakeTransport whose latency is drawn from a distribution with the given mean.
+
+    uniform spans [0, 2 * mean], lognormal uses sigma as the spread of the
+    underlying normal. Each call fails with RateLimitedError with probability
+    failure_rate, exercising the scheduler's retry path.
+    """
+
+    def __init__(
+        self,
+        responder: Union[str, Callable[[List[Dict[str, str]], str], str]] = "",
+        latency: float = 0.0,
+        distribution: str = "constant",
+        sigma: float = 0.5,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+        chunk_size: int = 16,
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}'. Expected one of {LATENCY_DISTRIBUTIONS}.")
+        super().__init__(responder, latency=latency, chunk_size=chunk_size)
+        self.distribution = distribution
+        self.sigma = sigma
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+
+    def _latency(self) -> float:
+        with self._lock:
+            if self.failure_rate and self.rng.random() < self.failure_rate:
+                self.failures += 1
+            if self.distribution == "uniform":
+                return self.rng.uniform(0, 2 * self.latency)
+            if self.distribution == "exponential":
+                return self.rng.expovariate(1 / self.latency) if self.latency else 0.0
+            if self.distribution == "lognormal":
+                # Parameterised so that the mean is self.latency.
+                return self.rng.lognormvariate(0, self.sigma) * self.latency * math.exp(-self.sigma ** 2 / 2)
+            return self.latency
+
+
+class RecordingTransport:
+    """Forwards requests to another transport and appends every response to a JSONL file.
+
+    The file can be replayed with ReplayTransport.
+    """
+
+    def __init__(self, transport, path: str):
+        self.transport = transport
+        self.path = path
+        self.pool_size = getattr(transport, "pool_size", 0)
+        if not hasattr(transport, "stream"):
+            # GroqClient then falls back to complete().
+            self.stream = None
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+
+    def _record(self, messages: List[Dict[str, str]], model: str, content: str, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0):
+        record = {
+            "key": ResponseCache.make_key(model, messages),
+            "content": content,
+            "latency": latency,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+        with self._lock:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def complete(self, messages: List[Dict[str, str]], model: str) -> Completion:
+        start_time = time.monotonic()
+        completion = self.transport.complete(messages, model)
+        self._record(messages, model, completion.content, time.monotonic() - start_time, completion.prompt_tokens, completion.completion_tokens)
+        return completion
+
+    def stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        start_time = time.monotonic()
+        parts = []
+        for chunk in self.transport.stream(messages, model):
+            parts.append(chunk)
+            yield chunk
+        # Only complete responses are recorded.
+        self._record(messages, model, "".join(parts), time.monotonic() - start_time)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport:
+    """Answers requests from a RecordingTransport file, without a network.
+
+    Requests are matched by model and messages; repeated requests cycle through
+    the responses recorded for them. With replay_latency, the recorded latency
+    is slept. Unrecorded requests go to fallback, or raise KeyError.
+    """
+
+    def __init__(self, path: str, fallback=None, replay_latency: bool = False, chunk_size: int = 16):
+        self.path = path
+        self.fallback = fallback
+        self.replay_latency = replay_latency
+        self.chunk_size = chunk_size
+        self.misses = 0
+        self._responses: Dict[str, List[Dict]] = defaultdict(list)
+        self._next: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn line from an interrupted recording.
+                    continue
+                self._responses[record["key"]].append(record)
+
+    def _lookup(self, messages: List[Dict[str, str]], model: str) -> Optional[Dict]:
+        key = ResponseCache.make_key(model, messages)
+        with self._lock:
+            records = self._responses.get(key)
+            if not records:
+                self.misses += 1
+                return None
+            record = records[self._next[key] % len(records)]
+            self._next[key] += 1
+        if self.replay_latency and record.get("latency"):
+            time.sleep(record["latency"])
+        return record
+
+    def _miss(self, messages: List[Dict[str, str]]):
+        if self.fallback is None:
+            raise KeyError(f"No recorded response for request: {messages[-1]['content'][:80]!r}")
+        return self.fallback
+
+    def complete(self, messages: List[Dict[str, str]], model: str) -> Completion:
+        record = self._lookup(messages, model)
+        if record is None:
+            return self._miss(messages).complete(messages, model)
+        return Completion(record["content"], record.get("prompt_tokens", 0), record.get("completion_tokens", 0))
+
+    def stream(self, messages: List[Dict[str, str]], model: str) -> Iterator[str]:
+        record = self._lookup(messages, model)
+        if record is None:
+            yield from self._miss(messages).stream(messages, model)
+            return
+        content = record["content"]
+        for i in range(0, len(content), self.chunk_size):
+            yield content[i:i + self.chunk_size]
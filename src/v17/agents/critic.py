@@ -1,17 +1,19 @@
+from typing import Optional
 from src.v17.genome import CriticGenome
-from src.groq_client import GroqClient
+from src.groq_client import GroqClient, get_client
+from src.request_scheduler import PRIORITY_CRITIC
+from src.json_extract import extract_score
+from src.telemetry import get_telemetry
 
 class CriticAgent:
     """Evaluates code based on a CriticGenome."""
 
-    def __init__(self):
-        self.groq_client = GroqClient()
+    def __init__(self, groq_client: Optional[GroqClient] = None):
+        self.groq_client = groq_client or get_client()
 
     def evaluate_code(self, critic: CriticGenome, code: str) -> float:
         """Evaluates code based on a CriticGenome."""
         prompt_text = f"{critic.template}\n\nCode to evaluate:\n```\n{code}```\n\n{critic.scoring_rubric}"
-        response = self.groq_client.generate(prompt_text)
-        try:
-            return float(response)
-        except ValueError:
-            return 0.0
+        with get_telemetry().span("critique", genome_id=critic.id):
+            score = extract_score(self.groq_client.generate(prompt_text, priority=PRIORITY_CRITIC))
+        return score if score is not None else 0.0
@@ -1,35 +1,51 @@
-import time
+import re
+from typing import Optional
 from src.v17.genome import PromptGenome
-from src.groq_client import GroqClient
+from src.groq_client import GroqClient, get_client
+from src.telemetry import get_telemetry
+from src.v17.sandbox import Sandbox
+from src.v17.benchmarks import BenchmarkTask, DEFAULT_TASK, get_task
+
+_CODE_BLOCK = re.compile(r"```(?:python|py)?[ \t]*\n(.*?)```", re.DOTALL)
+
+def extract_code(response: str) -> str:
+    """Returns the first fenced code block of a response, or the response itself."""
+    match = _CODE_BLOCK.search(response)
+    return match.group(1) if match else response
 
 class EngineerAgent:
-    """Generates code from a PromptGenome and runs tests."""
+    """Generates code for a benchmark task from a PromptGenome and runs tests."""
 
-    def __init__(self):
-        self.groq_client = GroqClient()
+    def __init__(self, groq_client: Optional[GroqClient] = None, sandbox: Optional[Sandbox] = None, task: Optional[BenchmarkTask] = None):
+        self.groq_client = groq_client or get_client()
+        self.sandbox = sandbox or Sandbox()
+        self.task = task or get_task(DEFAULT_TASK)
 
     def generate_code(self, prompt: PromptGenome) -> str:
-        """Generates code from a PromptGenome."""
-        prompt_text = f"{prompt.persona_description}\n{prompt.task_framing}\n{prompt.output_format_instruction}\n\n{prompt.template}"
-        return self.groq_client.generate(prompt_text)
+        """Generates code for the task from a PromptGenome."""
+        prompt_text = f"{prompt.persona_description}\n{prompt.task_framing}\n{prompt.output_format_instruction}\n\n{prompt.template}\n\nTask: {self.task.description}"
+        with get_telemetry().span("generate", genome_id=prompt.id):
+            return extract_code(self.groq_client.generate(prompt_text))
 
     def run_tests_and_get_metrics(self, code: str) -> dict:
-        """Runs tests on the generated code and returns a dictionary of metrics."""
-        metrics = {
-            "passed": False,
-            "execution_time": 0.0,
-            "code_complexity": 0
-        }
-
-        start_time = time.time()
-        try:
+        """Runs the generated code against the task benchmark in the sandbox and returns a dictionary of metrics."""
+        with get_telemetry().span("test", task=self.task.name):
+            result = self.sandbox.run(code, self.task.to_spec())
+        benchmark = result.benchmark or {}
+        return {
+            "passed": result.passed,
+            "pass_rate": benchmark.get("pass_rate", 0.0),
+            "median_runtime": benchmark.get("median_runtime"),
+            "p95_runtime": benchmark.get("p95_runtime"),
+            "scaling_exponent": benchmark.get("scaling_exponent"),
+            "reference_median_runtime": benchmark.get("reference_median_runtime"),
+            "reference_scaling_exponent": benchmark.get("reference_scaling_exponent"),
+            "execution_time": result.exec_time,
             # Simple complexity metric: count lines of code
-            metrics["code_complexity"] = len(code.splitlines())
-            exec(code)
-            metrics["passed"] = True
-        except Exception:
-            metrics["passed"] = False
-        finally:
-            metrics["execution_time"] = time.time() - start_time
-        
-        return metrics
+            "code_complexity": len(code.splitlines()),
+            "cpu_time": result.cpu_time,
+            "peak_rss_bytes": result.peak_rss_bytes,
+            "exit_reason": result.exit_reason,
+            "stdout_bytes": result.stdout_bytes,
+            "stderr_bytes": result.stderr_bytes,
+        }
@@ -1,35 +1,55 @@
-import json
-from src.v17.genome import PromptGenome, CriticGenome
+from typing import Optional, Union
+from src.v17.genome import PromptGenome, CriticGenome, genome_from_dict
 from src.v17.memory.cognition_archive import CognitionArchive
-from src.groq_client import GroqClient
+from src.groq_client import GroqClient, get_client
+from src.telemetry import get_telemetry
+
+PROMPT_QUERY = "prompt persona task framing output format constraints python code generation performance"
+CRITIC_QUERY = "critic evaluation criteria scoring rubric code quality correctness performance"
 
 class ResearcherAgent:
-    """Generates new genomes based on the Cognition Archive."""
+    """Generates new genomes based on the Cognition Archive.
+
+    Each request includes only the knowledge_k archive entries most relevant to
+    the genome type, within knowledge_budget tokens. Requests for different ids
+    share their text, so they bypass the response cache to sample new genomes.
+    """
 
-    def __init__(self, cognition_archive: CognitionArchive):
+    def __init__(self, cognition_archive: CognitionArchive, groq_client: Optional[GroqClient] = None, knowledge_k: int = 12, knowledge_budget: int = 1000):
         self.cognition_archive = cognition_archive
-        self.groq_client = GroqClient()
+        self.groq_client = groq_client or get_client()
+        self.knowledge_k = knowledge_k
+        self.knowledge_budget = knowledge_budget
+
+    def _knowledge(self, query: str) -> str:
+        return "\n".join(self.cognition_archive.search(query, k=self.knowledge_k, budget=self.knowledge_budget))
 
     def generate_prompt_genome(self, id: str) -> PromptGenome:
         """Generates a new PromptGenome based on the Cognition Archive."""
-        knowledge = "\n".join(self.cognition_archive.get_knowledge())
+        knowledge = self._knowledge(PROMPT_QUERY)
         prompt_text = f"Based on the following knowledge:\n{knowledge}\n\nGenerate a new PromptGenome in JSON format with the following keys: id, template, persona_description, task_framing, output_format_instruction, constraints."
-        response = self.groq_client.generate(prompt_text)
-        try:
-            data = json.loads(response)
-            data['id'] = id
-            return PromptGenome(**data)
-        except (json.JSONDecodeError, TypeError):
-            return PromptGenome(id=id, template="", persona_description="", task_framing="", output_format_instruction="", constraints=[])
+        with get_telemetry().span("research", genome_id=id):
+            genome = genome_from_dict(PromptGenome, self.groq_client.generate_json(prompt_text, use_cache=False, openers="{"), id)
+        return genome or PromptGenome(id=id, template="", persona_description="", task_framing="", output_format_instruction="", constraints=[])
 
     def generate_critic_genome(self, id: str) -> CriticGenome:
         """Generates a new CriticGenome based on the Cognition Archive."""
-        knowledge = "\n".join(self.cognition_archive.get_knowledge())
+        knowledge = self._knowledge(CRITIC_QUERY)
         prompt_text = f"Based on the following knowledge:\n{knowledge}\n\nGenerate a new CriticGenome in JSON format with the following keys: id, template, evaluation_criteria, scoring_rubric."
-        response = self.groq_client.generate(prompt_text)
-        try:
-            data = json.loads(response)
-            data['id'] = id
-            return CriticGenome(**data)
-        except (json.JSONDecodeError, TypeError):
-            return CriticGenome(id=id, template="", evaluation_criteria=[], scoring_rubric="")
+        with get_telemetry().span("research", genome_id=id):
+            genome = genome_from_dict(CriticGenome, self.groq_client.generate_json(prompt_text, use_cache=False, openers="{"), id)
+        return genome or CriticGenome(id=id, template="", evaluation_criteria=[], scoring_rubric="")
+
+    def record_learning(self, genome: Union[PromptGenome, CriticGenome]):
+        """Writes a winning genome's traits back to the Cognition Archive. Empty genomes are skipped."""
+        if isinstance(genome, PromptGenome):
+            kind = "prompt"
+            traits = {"persona": genome.persona_description, "framing": genome.task_framing, "constraints": "; ".join(genome.constraints)}
+        else:
+            kind = "critic"
+            criteria = "; ".join(f"{c.get('name', '')}: {c.get('description', '')}" for c in genome.evaluation_criteria)
+            traits = {"criteria": criteria, "rubric": genome.scoring_rubric}
+        traits = {name: value for name, value in traits.items() if value.strip()}
+        if traits:
+            details = "; ".join(f"{name}: {value}" for name, value in traits.items())
+            self.cognition_archive.add(f"Effective {kind} (fitness {genome.fitness_score:.2f}): {details}")
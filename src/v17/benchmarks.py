@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+@dataclass
+class BenchmarkTask:
+    """A coding task with reference tests and scaled workloads for timing generated code.
+
+    workload is Python source defining make_input(n), which returns the argument
+    list for a call at size n. reference is a known-good implementation of
+    entry_point, timed on the same workloads so runtimes can be compared across
+    machines.
+    """
+    name: str
+    entry_point: str
+    description: str
+    tests: List[Tuple[List[Any], Any]]
+    workload: str
+    reference: str
+    sizes: List[int] = field(default_factory=lambda: [1000, 4000, 16000])
+    repeats: int = 5
+    max_call_seconds: float = 0.5
+
+    def to_spec(self) -> Dict:
+        """Returns the JSON-serialisable form the sandbox runner consumes."""
+        return {
+            "entry_point": self.entry_point,
+            "tests": self.tests,
+            "workload": self.workload,
+            "reference": self.reference,
+            "sizes": self.sizes,
+            "repeats": self.repeats,
+            "max_call_seconds": self.max_call_seconds,
+        }
+
+TASKS: Dict[str, BenchmarkTask] = {}
+
+def register_task(task: BenchmarkTask):
+    TASKS[task.name] = task
+
+def get_task(name: str) -> BenchmarkTask:
+    return TASKS[name]
+
+register_task(BenchmarkTask(
+    name="sort_numbers",
+    entry_point="sort_numbers",
+    description="Write a Python function `sort_numbers(numbers)` that returns a new list with the integers in `numbers` sorted in ascending order.",
+    tests=[
+        [[[3, 1, 2]], [1, 2, 3]],
+        [[[]], []],
+        [[[5, -1, 5, 0]], [-1, 0, 5, 5]],
+        [[[1]], [1]],
+    ],
+    workload="import random\ndef make_input(n):\n    rng = random.Random(n)\n    return [[rng.randint(-n, n) for _ in range(n)]]\n",
+    reference="def sort_numbers(numbers):\n    return sorted(numbers)\n",
+))
+
+register_task(BenchmarkTask(
+    name="count_words",
+    entry_point="count_words",
+    description="Write a Python function `count_words(text)` that returns a dict mapping each lowercase whitespace-separated word in `text` to the number of times it occurs.",
+    tests=[
+        [["a b a"], {"a": 2, "b": 1}],
+        [[""], {}],
+        [["Hello hello WORLD"], {"hello": 2, "world": 1}],
+    ],
+    workload="import random\ndef make_input(n):\n    rng = random.Random(n)\n    words = ['w%d' % i for i in range(max(1, n // 10))]\n    return [' '.join(rng.choice(words) for _ in range(n))]\n",
+    reference="from collections import Counter\ndef count_words(text):\n    return dict(Counter(text.lower().split()))\n",
+))
+
+register_task(BenchmarkTask(
+    name="unique_elements",
+    entry_point="unique_elements",
+    description="Write a Python function `unique_elements(items)` that returns the distinct elements of the list `items` in order of first occurrence.",
+    tests=[
+        [[[1, 2, 1, 3, 2]], [1, 2, 3]],
+        [[[]], []],
+        [[["b", "a", "b"]], ["b", "a"]],
+    ],
+    workload="import random\ndef make_input(n):\n    rng = random.Random(n)\n    return [[rng.randint(0, n // 2) for _ in range(n)]]\n",
+    reference="def unique_elements(items):\n    return list(dict.fromkeys(items))\n",
+))
+
+DEFAULT_TASK = "sort_numbers"
@@ -0,0 +1,95 @@
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from src.v17.evolution.evaluation_matrix import EvaluationMatrix
+
+PHASES = ("evaluate", "evolve_prompts", "evolve_critics")
+
+@dataclass
+class RunState:
+    """Everything needed to continue an evolution run from where it stopped.
+
+    phase is the step of the current generation still in progress. matrix holds
+    the (possibly partial) evaluation of this generation, selected the parent
+    ids drawn for the current evolve phase and offspring the children bred so
+    far. pending lists the work still outstanding when the state was saved.
+    admitted is set once the offspring have joined the population.
+    """
+    generation: int = 0
+    phase: str = "evaluate"
+    rng_state: Optional[List] = None
+    matrix: Optional[Dict] = None
+    selected: List[str] = field(default_factory=list)
+    offspring: List[Dict] = field(default_factory=list)
+    pending: List = field(default_factory=list)
+    admitted: bool = False
+
+    def set_rng(self, rng: random.Random):
+        version, internal, gauss_next = rng.getstate()
+        self.rng_state = [version, list(internal), gauss_next]
+
+    def restore_rng(self, rng: random.Random):
+        if self.rng_state is not None:
+            version, internal, gauss_next = self.rng_state
+            rng.setstate((version, tuple(internal), gauss_next))
+
+    def get_matrix(self) -> Optional[EvaluationMatrix]:
+        return EvaluationMatrix(**self.matrix) if self.matrix is not None else None
+
+    def set_matrix(self, matrix: EvaluationMatrix):
+        self.matrix = asdict(matrix)
+        self.pending = matrix.pending()
+
+    def next_phase(self):
+        """Moves to the next phase, or to the next generation after the last one."""
+        index = PHASES.index(self.phase) + 1
+        if index == len(PHASES):
+            self.generation += 1
+            self.matrix = None
+            index = 0
+        self.phase = PHASES[index]
+        self.selected = []
+        self.offspring = []
+        self.pending = []
+        self.admitted = False
+
+class Checkpointer:
+    """Atomically persists RunState as JSON.
+
+    save() is throttled to once per min_interval seconds unless forced, so it
+    can be called after every completed LLM call.
+    """
+
+    def __init__(self, path: str, min_interval: float = 5.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._last_save = 0.0
+
+    def due(self) -> bool:
+        """Whether an unforced save() would write now."""
+        return time.monotonic() - self._last_save >= self.min_interval
+
+    def save(self, state: RunState, force: bool = False):
+        if not force and not self.due():
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(state), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def load(self) -> Optional[RunState]:
+        try:
+            with open(self.path, 'r') as f:
+                return RunState(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
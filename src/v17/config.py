@@ -0,0 +1,52 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+MEMORY_DIR = "src/v17/memory"
+
+@dataclass
+class RunConfig:
+    """Settings of one evolution run.
+
+    Run: num_generations generations with at most max_concurrency in-flight LLM
+    calls during evaluation. seed makes parent selection reproducible, and with
+    resume=True an interrupted run continues from its last checkpoint without
+    repeating completed LLM calls or executions.
+
+    Population: each population keeps population_size active genomes under the
+    replacement strategy, with the elitism best always surviving; demoted
+    genomes are moved to an archive. Crossover and mutation ask for batch_size
+    children per LLM call.
+
+    Novelty: offspring at least novelty_threshold cosine-similar to an existing
+    genome are dropped unevaluated, and novelty_weight times each genome's
+    novelty (distance to its nearest neighbours) is added to its fitness.
+
+    Surrogate: once a population's surrogate predicts fitness better than the
+    mean, it pre-screens screen_ratio times the needed offspring so only the
+    most promising are evaluated; 1 disables screening.
+
+    I/O: populations, the fitness memo, the surrogates and the checkpoint live
+    in memory_dir and events are logged to log_path. New genomes are seeded
+    from the Cognition Archive at cognition_path, and the learnings best genomes
+    of each population are written back to it at the end of the run. If given,
+    metrics_path is rewritten after every generation with Prometheus text
+    metrics, and trace_path receives a Chrome trace of the run's spans.
+    """
+    num_generations: int = 5
+    max_concurrency: int = 8
+    seed: Optional[int] = None
+    resume: bool = False
+    population_size: int = 10
+    strategy: str = "steady_state"
+    elitism: int = 2
+    batch_size: int = 4
+    novelty_threshold: float = 0.95
+    novelty_weight: float = 0.1
+    screen_ratio: float = 2.0
+    memory_dir: str = MEMORY_DIR
+    log_path: str = "src/v17/evolution_log.jsonl"
+    cognition_path: str = os.path.join(MEMORY_DIR, "cognition_archive.md")
+    learnings: int = 1
+    metrics_path: Optional[str] = None
+    trace_path: Optional[str] = None
@@ -0,0 +1,134 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from src.v17.genome import PromptGenome, CriticGenome
+from src.v17.agents.engineer import EngineerAgent
+from src.v17.agents.critic import CriticAgent
+from src.v17.evolution.evaluation_matrix import EvaluationMatrix
+from src.v17.memory.fitness_memo import FitnessMemo
+
+def _failed_metrics(exit_reason: str) -> Dict:
+    """Test metrics for a prompt whose code could not be generated or run."""
+    return {"passed": False, "pass_rate": 0.0, "exit_reason": exit_reason}
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+class EvaluationScheduler:
+    """Fans out code generation and critic scoring across a bounded thread pool."""
+
+    def __init__(self, engineer: EngineerAgent, critic_agent: CriticAgent, max_concurrency: int = 8, memo: Optional[FitnessMemo] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.engineer = engineer
+        self.critic_agent = critic_agent
+        self.max_concurrency = max_concurrency
+        self.memo = memo
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """Applies fn to every item concurrently, returning results in input order."""
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(len(items), 1))) as pool:
+            return list(pool.map(fn, items))
+
+    def prompt_key(self, prompt: PromptGenome) -> str:
+        """Memo key for a prompt's code and metrics; results depend on the task too."""
+        return f"{self.engineer.task.name}:{prompt.content_hash()}"
+
+    def evaluate(self, prompts: List[PromptGenome], critics: List[CriticGenome], matrix: Optional[EvaluationMatrix] = None, on_progress: Optional[Callable[[EvaluationMatrix], None]] = None) -> EvaluationMatrix:
+        """Generates code for every prompt once and scores it with every critic once.
+
+        Sandboxed test runs and critic calls for a prompt are submitted as soon
+        as its code arrives, so generation, execution and scoring overlap, and
+        every result is recorded as soon as it completes. With a memo, prompts
+        and (critic, prompt) cells whose content was evaluated before are filled
+        in from it and only new cells cost LLM calls; generated code is memoized
+        on arrival, so an interrupted evaluation never regenerates it. A
+        partially filled matrix, e.g. from a checkpoint, is completed rather than
+        recomputed, and on_progress is called with the matrix after every
+        completed call. The returned matrix feeds both the prompt and the critic
+        fitness passes.
+
+        A call that fails after the scheduler's retries, e.g. because the
+        prompt overflows the model's context, does not abort the evaluation: its
+        cell gets a score of 0.0 or failing metrics and the error is listed in
+        matrix.errors. Failures are not memoized, so a later run tries again.
+        """
+        if matrix is None:
+            matrix = EvaluationMatrix(prompt_ids=[p.id for p in prompts], critic_ids=[c.id for c in critics])
+        progress = on_progress or (lambda m: None)
+        prompt_keys = {p.id: self.prompt_key(p) for p in prompts}
+        critic_hashes = {c.id: c.content_hash() for c in critics}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool, \
+                ThreadPoolExecutor(max_workers=self.engineer.sandbox.max_workers) as tests:
+            # Each outstanding future maps to the callback that records its result.
+            handlers = {}
+
+            def test(p: PromptGenome):
+                handlers[tests.submit(self.engineer.run_tests_and_get_metrics, matrix.codes[p.id])] = lambda future: record_metrics(p, future)
+
+            def score(p: PromptGenome):
+                for c in critics:
+                    if p.id in matrix.scores.get(c.id, {}):
+                        continue
+                    cached = self.memo.get_score(critic_hashes[c.id], prompt_keys[p.id]) if self.memo else None
+                    if cached is not None:
+                        matrix.set_score(c.id, p.id, cached)
+                    else:
+                        handlers[pool.submit(self.critic_agent.evaluate_code, c, matrix.codes[p.id])] = lambda future, c=c: record_score(c, p, future)
+
+            def record_code(p: PromptGenome, future):
+                try:
+                    matrix.codes[p.id] = future.result()
+                except Exception as e:
+                    # Without code there is nothing to test or score.
+                    matrix.errors.append(["generate", p.id, _describe(e)])
+                    matrix.codes[p.id] = ""
+                    matrix.metrics[p.id] = _failed_metrics("generate_error")
+                    for c in critics:
+                        if p.id not in matrix.scores.get(c.id, {}):
+                            matrix.set_score(c.id, p.id, 0.0)
+                    return
+                if self.memo:
+                    self.memo.put_code(prompt_keys[p.id], matrix.codes[p.id])
+                test(p)
+                score(p)
+
+            def record_metrics(p: PromptGenome, future):
+                try:
+                    matrix.metrics[p.id] = future.result()
+                except Exception as e:
+                    matrix.errors.append(["test", p.id, _describe(e)])
+                    matrix.metrics[p.id] = _failed_metrics("test_error")
+                    return
+                if self.memo:
+                    self.memo.put_prompt(prompt_keys[p.id], matrix.codes[p.id], matrix.metrics[p.id])
+
+            def record_score(c: CriticGenome, p: PromptGenome, future):
+                try:
+                    matrix.set_score(c.id, p.id, future.result())
+                except Exception as e:
+                    matrix.errors.append(["score", c.id, p.id, _describe(e)])
+                    matrix.set_score(c.id, p.id, 0.0)
+                    return
+                if self.memo:
+                    self.memo.put_score(critic_hashes[c.id], prompt_keys[p.id], matrix.scores[c.id][p.id])
+
+            for p in prompts:
+                if p.id not in matrix.codes:
+                    cached = self.memo.get_prompt(prompt_keys[p.id]) if self.memo else None
+                    if cached is None:
+                        handlers[pool.submit(self.engineer.generate_code, p)] = lambda future, p=p: record_code(p, future)
+                        continue
+                    matrix.codes[p.id] = cached[0]
+                    if cached[1] is not None:
+                        matrix.metrics[p.id] = cached[1]
+                if p.id not in matrix.metrics:
+                    test(p)
+                score(p)
+            while handlers:
+                done, _ = wait(handlers, return_when=FIRST_COMPLETED)
+                # Record every result that arrived before re-raising a failure.
+                for future in sorted(done, key=lambda future: future.exception() is not None):
+                    handlers.pop(future)(future)
+                    progress(matrix)
+        return matrix
@@ -1,7 +1,8 @@
-import json
-from typing import Tuple
-from src.v17.genome import PromptGenome, CriticGenome
+from typing import List, Tuple
+from src.v17.genome import PromptGenome, CriticGenome, genome_from_dict, parse_children
 from src.groq_client import GroqClient
+from src.request_scheduler import PRIORITY_VARIATION
+from src.telemetry import get_telemetry
 
 def intelligent_crossover(parent1: PromptGenome, parent2: PromptGenome, groq_client: GroqClient) -> PromptGenome:
     """Performs intelligent crossover on two PromptGenomes using an LLM."""
@@ -16,16 +17,15 @@ def intelligent_crossover(parent1: PromptGenome, parent2: PromptGenome, groq_cli
 
     Combine the best attributes of both parents to create a new child prompt. The child should inherit the most effective persona, task framing, and constraints. Output the child prompt as a single JSON object.
     """
-    response = groq_client.generate(prompt)
-    try:
-        child_data = json.loads(response)
-        child_data['id'] = f"{parent1.id}_{parent2.id}_child"
-        return PromptGenome(**child_data)
-    except (json.JSONDecodeError, TypeError):
+    id = f"{parent1.id}_{parent2.id}_child"
+    with get_telemetry().span("crossover", genome_id=id):
+        child = genome_from_dict(PromptGenome, groq_client.generate_json(prompt, use_cache=False, priority=PRIORITY_VARIATION, openers="{"), id)
+    if child is None:
         # Fallback to a simple crossover on failure
         child_data = parent1.__dict__.copy()
-        child_data['id'] = f"{parent1.id}_{parent2.id}_child"
-        return PromptGenome(**child_data)
+        child_data['id'] = id
+        child = PromptGenome(**child_data)
+    return child
 
 def intelligent_crossover_critic(parent1: CriticGenome, parent2: CriticGenome, groq_client: GroqClient) -> CriticGenome:
     """Performs intelligent crossover on two CriticGenomes using an LLM."""
@@ -40,13 +40,66 @@ def intelligent_crossover_critic(parent1: CriticGenome, parent2: CriticGenome, g
 
     Combine the best attributes of both parents to create a new child critic. The child should inherit the most effective evaluation criteria and scoring rubric. Output the child critic as a single JSON object.
     """
-    response = groq_client.generate(prompt)
-    try:
-        child_data = json.loads(response)
-        child_data['id'] = f"{parent1.id}_{parent2.id}_child"
-        return CriticGenome(**child_data)
-    except (json.JSONDecodeError, TypeError):
+    id = f"{parent1.id}_{parent2.id}_child"
+    with get_telemetry().span("crossover", genome_id=id):
+        child = genome_from_dict(CriticGenome, groq_client.generate_json(prompt, use_cache=False, priority=PRIORITY_VARIATION, openers="{"), id)
+    if child is None:
         # Fallback to a simple crossover on failure
         child_data = parent1.__dict__.copy()
-        child_data['id'] = f"{parent1.id}_{parent2.id}_child"
-        return CriticGenome(**child_data)
+        child_data['id'] = id
+        child = CriticGenome(**child_data)
+    return child
+
+def _format_pairs(pairs: List[Tuple]) -> str:
+    return "\n".join(
+        f"""
+    Pair {i + 1}:
+    Parent 1: {parent1.__dict__}
+    Parent 2: {parent2.__dict__}
+    """
+        for i, (parent1, parent2) in enumerate(pairs)
+    )
+
+def _batched_crossover(pairs: List[Tuple], groq_client: GroqClient, genome_cls, batch_size: int, prompt_template: str) -> List:
+    children = []
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        prompt = prompt_template.format(pairs=_format_pairs(batch), count=len(batch))
+        with get_telemetry().span("crossover", genome_ids=[f"{p1.id}_{p2.id}_child" for p1, p2 in batch]):
+            data = groq_client.generate_json(prompt, use_cache=False, priority=PRIORITY_VARIATION, openers="[{")
+        for (parent1, parent2), data in zip(batch, parse_children(data, len(batch))):
+            id = f"{parent1.id}_{parent2.id}_child"
+            child = genome_from_dict(genome_cls, data, id)
+            if child is None:
+                # Fallback to a simple crossover for this element only
+                child_data = parent1.__dict__.copy()
+                child_data['id'] = id
+                child = genome_cls(**child_data)
+            children.append(child)
+    return children
+
+def batched_crossover(pairs: List[Tuple[PromptGenome, PromptGenome]], groq_client: GroqClient, batch_size: int = 4) -> List[PromptGenome]:
+    """Performs intelligent crossover on many pairs of PromptGenomes, batch_size pairs per LLM call.
+
+    Returns one child per pair, in order. Elements of the response that do not
+    fit the PromptGenome schema fall back to a copy of the first parent.
+    """
+    prompt = """
+    You are a prompt engineering expert. Your task is to perform a crossover operation on each of the following pairs of parent prompts to create a superior child prompt per pair.
+    {pairs}
+    For each pair, combine the best attributes of both parents to create a new child prompt. The child should inherit the most effective persona, task framing, and constraints. Output a JSON array of exactly {count} child prompt objects, one per pair and in the same order, with the keys template, persona_description, task_framing, output_format_instruction and constraints.
+    """
+    return _batched_crossover(pairs, groq_client, PromptGenome, batch_size, prompt)
+
+def batched_crossover_critic(pairs: List[Tuple[CriticGenome, CriticGenome]], groq_client: GroqClient, batch_size: int = 4) -> List[CriticGenome]:
+    """Performs intelligent crossover on many pairs of CriticGenomes, batch_size pairs per LLM call.
+
+    Returns one child per pair, in order. Elements of the response that do not
+    fit the CriticGenome schema fall back to a copy of the first parent.
+    """
+    prompt = """
+    You are an expert in AI evaluation. Your task is to perform a crossover operation on each of the following pairs of parent critic prompts to create a superior child critic per pair.
+    {pairs}
+    For each pair, combine the best attributes of both parents to create a new child critic. The child should inherit the most effective evaluation criteria and scoring rubric. Output a JSON array of exactly {count} child critic objects, one per pair and in the same order, with the keys template, evaluation_criteria and scoring_rubric.
+    """
+    return _batched_crossover(pairs, groq_client, CriticGenome, batch_size, prompt)
@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+@dataclass
+class EvaluationMatrix:
+    """Everything computed while evaluating one generation, shared by both fitness passes.
+
+    scores[critic_id][prompt_id] is the score that critic gave to that prompt's code.
+    errors lists the calls that failed, as ["generate", p, message],
+    ["test", p, message] and ["score", c, p, message] items; their cells hold
+    failing metrics or a score of 0.0.
+    """
+    prompt_ids: List[str]
+    critic_ids: List[str]
+    codes: Dict[str, str] = field(default_factory=dict)
+    metrics: Dict[str, Dict] = field(default_factory=dict)
+    scores: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    errors: List[List[str]] = field(default_factory=list)
+
+    def set_score(self, critic_id: str, prompt_id: str, score: float):
+        self.scores.setdefault(critic_id, {})[prompt_id] = score
+
+    def prompt_scores(self, prompt_id: str) -> List[float]:
+        """Scores every critic gave to one prompt, in critic order."""
+        return [self.scores.get(c, {}).get(prompt_id, 0.0) for c in self.critic_ids]
+
+    def critic_scores(self, critic_id: str) -> List[float]:
+        """Scores one critic gave to every prompt, in prompt order."""
+        row = self.scores.get(critic_id, {})
+        return [row.get(p, 0.0) for p in self.prompt_ids]
+
+    def prompt_metrics(self) -> List[Dict]:
+        """Test metrics of every prompt, in prompt order."""
+        return [self.metrics[p] for p in self.prompt_ids]
+
+    def pending(self) -> List[List[str]]:
+        """Work not done yet: ["generate", p], ["test", p] and ["score", c, p] items."""
+        work = []
+        for p in self.prompt_ids:
+            if p not in self.codes:
+                work.append(["generate", p])
+            elif p not in self.metrics:
+                work.append(["test", p])
+        for c in self.critic_ids:
+            row = self.scores.get(c, {})
+            work.extend(["score", c, p] for p in self.prompt_ids if p not in row)
+        return work
@@ -1,8 +1,30 @@
-from typing import List, Dict
 from ..genome import PromptGenome, CriticGenome
+from typing import Dict
+from .evaluation_matrix import EvaluationMatrix
 
-def calculate_prompt_fitness(prompt: PromptGenome, metrics: Dict, critic_scores: List[float]) -> float:
+def calculate_objective_score(metrics: Dict) -> float:
+    """Scores benchmark results in [0, 1]: correctness, then speed and scaling relative to the task's reference."""
+    if not metrics["passed"] or not metrics.get("pass_rate"):
+        return 0.0
+    median, reference = metrics.get("median_runtime"), metrics.get("reference_median_runtime")
+    if median is None and metrics.get("exit_reason") == "slow":
+        # Correct, but too slow to time even the smallest workload within the sandbox limits
+        return 0.0
+    if median is None or not reference:
+        return 0.5 * metrics["pass_rate"]
+
+    # 0.5 when as fast as the reference, approaching 1 when faster and 0 when slower
+    speed_score = reference / (reference + median)
+    # Penalise only growth that is worse than the reference's (e.g. O(n^2) vs O(n log n))
+    excess = max(0.0, metrics["scaling_exponent"] - metrics["reference_scaling_exponent"])
+    scaling_score = 1.0 / (1.0 + excess)
+
+    return metrics["pass_rate"] * (0.5 * speed_score + 0.5 * scaling_score)
+
+def calculate_prompt_fitness(prompt: PromptGenome, matrix: EvaluationMatrix) -> float:
     """Calculates the fitness of a prompt based on objective metrics and critic scores."""
+    metrics = matrix.metrics[prompt.id]
+    critic_scores = matrix.prompt_scores(prompt.id)
     if not metrics["passed"]:
         return 0.1
 
@@ -10,20 +32,22 @@ def calculate_prompt_fitness(prompt: PromptGenome, metrics: Dict, critic_scores:
     w_objective = 0.6
     w_critic = 0.4
 
-    # Objective score (inversely proportional to execution time and complexity)
-    objective_score = 1.0 / (1.0 + metrics["execution_time"] + metrics["code_complexity"])
+    # Objective score from the task benchmark
+    objective_score = calculate_objective_score(metrics)
 
     # Critic score (average of all critic scores)
     critic_score = sum(critic_scores) / len(critic_scores) if critic_scores else 0.0
 
     return (w_objective * objective_score) + (w_critic * critic_score)
 
-def calculate_critic_fitness(critic: CriticGenome, prompt_metrics: List[Dict], critic_scores: List[float]) -> float:
+def calculate_critic_fitness(critic: CriticGenome, matrix: EvaluationMatrix) -> float:
     """Calculates the fitness of a critic based on its ability to correlate with objective metrics."""
+    prompt_metrics = matrix.prompt_metrics()
+    critic_scores = matrix.critic_scores(critic.id)
     # This is a simplified correlation. A more robust implementation would use a statistical correlation.
     total_correlation = 0.0
     for i in range(len(prompt_metrics)):
-        objective_score = 1.0 / (1.0 + prompt_metrics[i]["execution_time"] + prompt_metrics[i]["code_complexity"])
+        objective_score = calculate_objective_score(prompt_metrics[i])
         total_correlation += abs(critic_scores[i] - objective_score)
     
     # Lower correlation difference means higher fitness
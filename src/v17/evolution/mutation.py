@@ -1,6 +1,8 @@
-import json
-from src.v17.genome import PromptGenome, CriticGenome
+from typing import List
+from src.v17.genome import PromptGenome, CriticGenome, genome_from_dict, parse_children
 from src.groq_client import GroqClient
+from src.request_scheduler import PRIORITY_VARIATION
+from src.telemetry import get_telemetry
 
 def intelligent_mutation(genome: PromptGenome, groq_client: GroqClient) -> PromptGenome:
     """Performs intelligent mutation on a PromptGenome using an LLM."""
@@ -12,14 +14,10 @@ def intelligent_mutation(genome: PromptGenome, groq_client: GroqClient) -> Promp
 
     Introduce a single, creative, and potentially beneficial change to one of the prompt's attributes (e.g., persona_description, task_framing, constraints). Do not just add a word; make a meaningful alteration. Output the mutated prompt as a single JSON object.
     """
-    response = groq_client.generate(prompt)
-    try:
-        mutated_data = json.loads(response)
-        mutated_data['id'] = f"{genome.id}_mutated"
-        return PromptGenome(**mutated_data)
-    except (json.JSONDecodeError, TypeError):
-        # Fallback to no mutation on failure
-        return genome
+    with get_telemetry().span("mutation", genome_id=genome.id):
+        mutated = genome_from_dict(PromptGenome, groq_client.generate_json(prompt, use_cache=False, priority=PRIORITY_VARIATION, openers="{"), f"{genome.id}_mutated")
+    # Fallback to no mutation on failure
+    return mutated or genome
 
 def intelligent_mutation_critic(genome: CriticGenome, groq_client: GroqClient) -> CriticGenome:
     """Performs intelligent mutation on a CriticGenome using an LLM."""
@@ -31,11 +29,41 @@ def intelligent_mutation_critic(genome: CriticGenome, groq_client: GroqClient) -
 
     Introduce a single, creative, and potentially beneficial change to one of the critic's attributes (e.g., evaluation_criteria, scoring_rubric). Do not just add a word; make a meaningful alteration. Output the mutated critic as a single JSON object.
     """
-    response = groq_client.generate(prompt)
-    try:
-        mutated_data = json.loads(response)
-        mutated_data['id'] = f"{genome.id}_mutated"
-        return CriticGenome(**mutated_data)
-    except (json.JSONDecodeError, TypeError):
-        # Fallback to no mutation on failure
-        return genome
+    with get_telemetry().span("mutation", genome_id=genome.id):
+        mutated = genome_from_dict(CriticGenome, groq_client.generate_json(prompt, use_cache=False, priority=PRIORITY_VARIATION, openers="{"), f"{genome.id}_mutated")
+    # Fallback to no mutation on failure
+    return mutated or genome
+
+def _batched_mutation(genomes: List, groq_client: GroqClient, genome_cls, batch_size: int, prompt_template: str) -> List:
+    mutated = []
+    for start in range(0, len(genomes), batch_size):
+        batch = genomes[start:start + batch_size]
+        originals = "\n".join(f"    Original {i + 1}: {g.__dict__}" for i, g in enumerate(batch))
+        with get_telemetry().span("mutation", genome_ids=[g.id for g in batch]):
+            data = groq_client.generate_json(prompt_template.format(originals=originals, count=len(batch)), use_cache=False, priority=PRIORITY_VARIATION, openers="[{")
+        for genome, data in zip(batch, parse_children(data, len(batch))):
+            # Fallback to no mutation for elements that do not fit the schema
+            mutated.append(genome_from_dict(genome_cls, data, f"{genome.id}_mutated") or genome)
+    return mutated
+
+def batched_mutation(genomes: List[PromptGenome], groq_client: GroqClient, batch_size: int = 4) -> List[PromptGenome]:
+    """Performs intelligent mutation on many PromptGenomes, batch_size genomes per LLM call."""
+    prompt = """
+    You are a prompt engineering expert. Your task is to perform a creative mutation on each of the following prompts to explore new directions.
+
+{originals}
+
+    For each prompt, introduce a single, creative, and potentially beneficial change to one of its attributes (e.g., persona_description, task_framing, constraints). Do not just add a word; make a meaningful alteration. Output a JSON array of exactly {count} mutated prompt objects, one per original and in the same order, with the keys template, persona_description, task_framing, output_format_instruction and constraints.
+    """
+    return _batched_mutation(genomes, groq_client, PromptGenome, batch_size, prompt)
+
+def batched_mutation_critic(genomes: List[CriticGenome], groq_client: GroqClient, batch_size: int = 4) -> List[CriticGenome]:
+    """Performs intelligent mutation on many CriticGenomes, batch_size genomes per LLM call."""
+    prompt = """
+    You are an expert in AI evaluation. Your task is to perform a creative mutation on each of the following critic prompts to explore new evaluation dimensions.
+
+{originals}
+
+    For each critic, introduce a single, creative, and potentially beneficial change to one of its attributes (e.g., evaluation_criteria, scoring_rubric). Do not just add a word; make a meaningful alteration. Output a JSON array of exactly {count} mutated critic objects, one per original and in the same order, with the keys template, evaluation_criteria and scoring_rubric.
+    """
+    return _batched_mutation(genomes, groq_client, CriticGenome, batch_size, prompt)
@@ -0,0 +1,78 @@
+import math
+import re
+import zlib
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Tuple, Union
+from src.v17.genome import PromptGenome, CriticGenome
+
+Vector = Dict[int, float]
+
+def _strings(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+def genome_text(genome: Union[PromptGenome, CriticGenome]) -> str:
+    """The text of every content field, without field names, id or fitness."""
+    content = {k: v for k, v in asdict(genome).items() if k not in ("id", "fitness_score")}
+    return "\n".join(_strings(content))
+
+def embed(text: str, n: int = 3, dims: int = 1 << 20) -> Vector:
+    """A unit-length sparse vector of hashed character n-gram counts.
+
+    Case and whitespace are normalised, so reformatted copies embed identically.
+    """
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    counts: Vector = {}
+    for i in range(max(1, len(text) - n + 1)):
+        bucket = zlib.crc32(text[i:i + n].encode("utf-8")) % dims
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {bucket: c / norm for bucket, c in counts.items()}
+
+def cosine(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+class NoveltyIndex:
+    """Similarity search over genome text, used to spend evaluations only on new genomes.
+
+    admit() drops candidates whose cosine similarity to an indexed genome (or to
+    an earlier admitted candidate) is at least threshold, and indexes the rest.
+    novelty() is one minus the mean similarity to the k nearest other genomes.
+    """
+
+    def __init__(self, genomes: Iterable[Union[PromptGenome, CriticGenome]] = (), threshold: float = 0.95, k: int = 3):
+        self.threshold = threshold
+        self.k = k
+        self.vectors: List[Tuple[str, Vector]] = []
+        for genome in genomes:
+            self.add(genome)
+
+    def add(self, genome: Union[PromptGenome, CriticGenome]):
+        self.vectors.append((genome.id, embed(genome_text(genome))))
+
+    def _similarities(self, genome: Union[PromptGenome, CriticGenome], vector: Vector) -> List[float]:
+        return [cosine(vector, other) for id, other in self.vectors if id != genome.id]
+
+    def novelty(self, genome: Union[PromptGenome, CriticGenome]) -> float:
+        similarities = sorted(self._similarities(genome, embed(genome_text(genome))), reverse=True)[:self.k]
+        return 1.0 - sum(similarities) / len(similarities) if similarities else 1.0
+
+    def admit(self, candidates: List[Union[PromptGenome, CriticGenome]]) -> List[Union[PromptGenome, CriticGenome]]:
+        """Returns the candidates that are not near-duplicates, indexing them as it goes."""
+        admitted = []
+        for genome in candidates:
+            vector = embed(genome_text(genome))
+            # Unlike novelty(), this also compares genomes sharing an id, e.g. a parent returned unchanged.
+            if any(cosine(vector, other) >= self.threshold for _, other in self.vectors):
+                continue
+            self.vectors.append((genome.id, vector))
+            admitted.append(genome)
+        return admitted
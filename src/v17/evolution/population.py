@@ -0,0 +1,70 @@
+from typing import List, Union
+from ..genome import PromptGenome, CriticGenome
+from ..memory.prompt_db import PromptDB
+from ..memory.critic_db import CriticDB
+
+STRATEGIES = ("generational", "steady_state", "mu_plus_lambda")
+
+class PopulationManager:
+    """Keeps a bounded active population in one DB and moves demoted genomes to an archive DB.
+
+    Archived genomes are never evaluated again. After each evaluation,
+    advance(offspring) ranks the active genomes by fitness and replaces the rest:
+    - generational: only the `elitism` best parents survive and offspring fill the remaining slots.
+    - steady_state: the worst len(offspring) parents are replaced, never the `elitism` best.
+    - mu_plus_lambda: the best `size` of the parents and last generation's (now evaluated)
+      offspring survive and the new offspring join them, so size + offspring_count
+      genomes are evaluated every generation.
+    """
+
+    def __init__(self, db: Union[PromptDB, CriticDB], archive: Union[PromptDB, CriticDB], size: int = 10, strategy: str = "steady_state", elitism: int = 2, offspring_count: int = 5):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replacement strategy '{strategy}'. Expected one of {STRATEGIES}.")
+        if not 0 <= elitism < size:
+            raise ValueError("elitism must be between 0 and size - 1.")
+        self.db = db
+        self.archive = archive
+        self.size = size
+        self.strategy = strategy
+        self.elitism = elitism
+        self.offspring_count = offspring_count
+
+    def active(self) -> List[Union[PromptGenome, CriticGenome]]:
+        return self.db.get_all()
+
+    def offspring_needed(self) -> int:
+        """Number of children to breed for the next advance()."""
+        if self.strategy == "generational":
+            return self.size - self.elitism
+        if self.strategy == "steady_state":
+            return min(self.offspring_count, self.size - self.elitism)
+        return self.offspring_count
+
+    def capacity(self) -> int:
+        """Largest number of genomes that are evaluated in one generation."""
+        return self.size + self.offspring_count if self.strategy == "mu_plus_lambda" else self.size
+
+    def trim(self):
+        """Archives the least fit genomes beyond capacity, e.g. left over from an unbounded run."""
+        self._truncate(self.capacity())
+
+    def advance(self, offspring: List[Union[PromptGenome, CriticGenome]]):
+        """Applies the replacement strategy to the evaluated population and adds offspring."""
+        if self.strategy == "mu_plus_lambda":
+            keep = self.size
+        else:
+            keep = max(self.elitism, self.size - len(offspring))
+        self._truncate(keep)
+        self.db.add_many(offspring)
+
+    def immigrate(self, genomes: List[Union[PromptGenome, CriticGenome]]):
+        """Replaces the least fit active genomes with already evaluated genomes from another population."""
+        self._truncate(max(self.elitism, len(self.active()) - len(genomes)))
+        self.db.add_many(genomes)
+
+    def _truncate(self, keep: int):
+        ranked = sorted(self.active(), key=lambda g: g.fitness_score, reverse=True)
+        demoted = ranked[keep:]
+        if demoted:
+            self.archive.add_many(demoted)
+            self.db.remove_many(g.id for g in demoted)
@@ -1,20 +1,74 @@
+import bisect
 import random
-from typing import List, Union
+from itertools import accumulate
+from typing import List, Optional, Union
 from ..genome import PromptGenome, CriticGenome
 
-def roulette_wheel_selection(population: List[Union[PromptGenome, CriticGenome]], num_selections: int) -> List[Union[PromptGenome, CriticGenome]]:
-    """Selects individuals from a population using fitness-proportionate selection."""
-    total_fitness = sum(individual.fitness_score for individual in population)
-    if total_fitness == 0:
-        return random.choices(population, k=num_selections)
-
-    selections = []
-    for _ in range(num_selections):
-        selection_point = random.uniform(0, total_fitness)
-        current_fitness = 0
-        for individual in population:
-            current_fitness += individual.fitness_score
-            if current_fitness >= selection_point:
-                selections.append(individual)
-                break
+Genome = Union[PromptGenome, CriticGenome]
+
+# Every operator returns exactly num_selections individuals (none from an empty
+# population) and accepts an optional random.Random so runs can be reproduced
+# from a seed.
+
+def _weights(population: List[Genome]) -> List[float]:
+    # Negative fitness would break proportional selection, so it counts as zero.
+    return [max(0.0, individual.fitness_score) for individual in population]
+
+def roulette_wheel_selection(population: List[Genome], num_selections: int, rng: Optional[random.Random] = None) -> List[Genome]:
+    """Selects individuals with probability proportional to fitness.
+
+    Builds the cumulative fitness once and binary-searches it per pick, so a
+    call costs O(n + k log n).
+    """
+    if not population:
+        return []
+    rng = rng or random
+    cumulative = list(accumulate(_weights(population)))
+    total = cumulative[-1] if cumulative else 0.0
+    if total <= 0:
+        return rng.choices(population, k=num_selections)
+    # Clamp to the last index in case round-off puts the point past the final sum.
+    last = len(population) - 1
+    return [population[min(bisect.bisect_right(cumulative, rng.uniform(0, total)), last)] for _ in range(num_selections)]
+
+def stochastic_universal_sampling(population: List[Genome], num_selections: int, rng: Optional[random.Random] = None) -> List[Genome]:
+    """Selects individuals proportionally to fitness using evenly spaced pointers.
+
+    One random offset places all num_selections pointers, which gives the same
+    expected counts as roulette selection with minimal spread. The picks are
+    shuffled so consecutive pairs are not biased towards neighbours.
+    """
+    if not population:
+        return []
+    rng = rng or random
+    cumulative = list(accumulate(_weights(population)))
+    total = cumulative[-1] if cumulative else 0.0
+    if total <= 0 or num_selections <= 0:
+        return rng.choices(population, k=num_selections)
+    step = total / num_selections
+    start = rng.uniform(0, step)
+    last = len(population) - 1
+    selections = [population[min(bisect.bisect_right(cumulative, start + i * step), last)] for i in range(num_selections)]
+    rng.shuffle(selections)
     return selections
+
+def tournament_selection(population: List[Genome], num_selections: int, tournament_size: int = 3, rng: Optional[random.Random] = None) -> List[Genome]:
+    """Selects the fittest of tournament_size randomly drawn individuals, num_selections times."""
+    if not population:
+        return []
+    rng = rng or random
+    size = min(tournament_size, len(population))
+    return [max(rng.sample(population, size), key=lambda g: g.fitness_score) for _ in range(num_selections)]
+
+def rank_selection(population: List[Genome], num_selections: int, rng: Optional[random.Random] = None) -> List[Genome]:
+    """Selects individuals with probability proportional to their fitness rank (worst = 1).
+
+    Unlike roulette selection this is insensitive to the scale of fitness values.
+    """
+    if not population:
+        return []
+    rng = rng or random
+    ranked = sorted(population, key=lambda g: g.fitness_score)
+    cumulative = list(accumulate(range(1, len(ranked) + 1)))
+    total = cumulative[-1]
+    return [ranked[bisect.bisect_left(cumulative, rng.uniform(0, total))] for _ in range(num_selections)]
@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import re
+import zlib
+from dataclasses import asdict
+from typing import Dict, List, Optional, Union
+from src.v17.genome import PromptGenome, CriticGenome
+from src.v17.evolution.novelty import _strings
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def features(genome: Union[PromptGenome, CriticGenome], dims: int = 1 << 14) -> Dict[int, float]:
+    """Hashed word unigrams and bigrams per field, scaled to unit length."""
+    counts: Dict[int, float] = {}
+    for name, value in asdict(genome).items():
+        if name in ("id", "fitness_score"):
+            continue
+        words = _WORD.findall(" ".join(_strings(value)).lower())
+        for gram in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            bucket = zlib.crc32(f"{name}:{gram}".encode("utf-8")) % dims
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {bucket: c / norm for bucket, c in counts.items()}
+
+def _ranks(values: List[float]) -> List[float]:
+    """Ranks starting at 0, with ties sharing their average rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+def spearman(a: List[float], b: List[float]) -> Optional[float]:
+    """Spearman rank correlation, or None if either side is constant or too short."""
+    if len(a) < 2:
+        return None
+    ra, rb = _ranks(a), _ranks(b)
+    mean = (len(a) - 1) / 2
+    cov = sum((x - mean) * (y - mean) for x, y in zip(ra, rb))
+    var_a = sum((x - mean) ** 2 for x in ra)
+    var_b = sum((y - mean) ** 2 for y in rb)
+    return cov / math.sqrt(var_a * var_b) if var_a and var_b else None
+
+class SurrogateModel:
+    """An online linear regression from genome text to fitness, used to pre-screen offspring.
+
+    Weights are trained with AdaGrad, one step per genome the first time its
+    content receives a true fitness. observe() predicts each new genome before
+    learning from it, so its report measures accuracy on genomes the model has
+    not seen. The model is only ready() to screen after min_samples genomes, and
+    only while its recent error is below that of predicting the mean fitness.
+    When a path is given, the model is saved there as JSON and reloaded.
+    """
+
+    def __init__(self, path: Optional[str] = None, dims: int = 1 << 14, learning_rate: float = 0.1, l2: float = 1e-4, min_samples: int = 20):
+        self.path = path
+        self.dims = dims
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.min_samples = min_samples
+        self.weights: Dict[int, float] = {}
+        self.squared_gradients: Dict[int, float] = {}
+        self.bias = 0.0
+        self.samples = 0
+        self.target_sum = 0.0
+        self.absolute_error = 0.0
+        # Exponential moving averages of the model's and the mean baseline's absolute error.
+        self.recent_error = 0.0
+        self.recent_baseline_error = 0.0
+        self.seen: set = set()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        self.weights = {int(k): v for k, v in data["weights"].items()}
+        self.squared_gradients = {int(k): v for k, v in data["squared_gradients"].items()}
+        self.bias = data["bias"]
+        self.samples = data["samples"]
+        self.target_sum = data["target_sum"]
+        self.absolute_error = data["absolute_error"]
+        self.recent_error = data["recent_error"]
+        self.recent_baseline_error = data["recent_baseline_error"]
+        self.seen = set(data["seen"])
+
+    def save(self):
+        if self.path is None:
+            return
+        data = {
+            "weights": self.weights,
+            "squared_gradients": self.squared_gradients,
+            "bias": self.bias,
+            "samples": self.samples,
+            "target_sum": self.target_sum,
+            "absolute_error": self.absolute_error,
+            "recent_error": self.recent_error,
+            "recent_baseline_error": self.recent_baseline_error,
+            "seen": sorted(self.seen),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def ready(self) -> bool:
+        return self.samples >= self.min_samples and self.recent_error < self.recent_baseline_error
+
+    def _predict(self, x: Dict[int, float]) -> float:
+        return self.bias + sum(self.weights.get(bucket, 0.0) * value for bucket, value in x.items())
+
+    def predict(self, genome: Union[PromptGenome, CriticGenome]) -> float:
+        return self._predict(features(genome, self.dims))
+
+    def rank(self, genomes: List[Union[PromptGenome, CriticGenome]], count: int) -> List[Union[PromptGenome, CriticGenome]]:
+        """The count genomes with the highest predicted fitness, in their original order."""
+        keep = set(sorted(range(len(genomes)), key=lambda i: self.predict(genomes[i]), reverse=True)[:count])
+        return [g for i, g in enumerate(genomes) if i in keep]
+
+    def _update(self, x: Dict[int, float], target: float, prediction: float):
+        error = prediction - target
+        # The bias tracks the mean fitness, so the weights only learn deviations from it.
+        self.bias = self.target_sum / self.samples
+        for bucket, value in x.items():
+            weight = self.weights.get(bucket, 0.0)
+            gradient = error * value + self.l2 * weight
+            squared = self.squared_gradients.get(bucket, 0.0) + gradient * gradient
+            self.squared_gradients[bucket] = squared
+            self.weights[bucket] = weight - self.learning_rate * gradient / math.sqrt(squared)
+
+    def observe(self, genomes: List[Union[PromptGenome, CriticGenome]], fitness: List[float]) -> Optional[Dict[str, float]]:
+        """Learns from the true fitness of genomes not seen before, given in the same order.
+
+        Returns their accuracy report (MAE, the MAE of predicting the mean
+        fitness so far, Spearman correlation, and the cumulative MAE), or None
+        if every genome was seen before.
+        """
+        predictions, targets, baseline_errors = [], [], []
+        for genome, target in zip(genomes, fitness):
+            key = genome.content_hash()
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            x = features(genome, self.dims)
+            prediction = self._predict(x)
+            if self.samples:
+                baseline_errors.append(abs(self.target_sum / self.samples - target))
+                self.recent_error = 0.9 * self.recent_error + 0.1 * abs(prediction - target)
+                self.recent_baseline_error = 0.9 * self.recent_baseline_error + 0.1 * baseline_errors[-1]
+            self.samples += 1
+            self.target_sum += target
+            self.absolute_error += abs(prediction - target)
+            self._update(x, target, prediction)
+            predictions.append(prediction)
+            targets.append(target)
+        if not targets:
+            return None
+        return {
+            "samples": len(targets),
+            "mae": sum(abs(p - t) for p, t in zip(predictions, targets)) / len(targets),
+            "baseline_mae": sum(baseline_errors) / len(baseline_errors) if baseline_errors else None,
+            "spearman": spearman(predictions, targets),
+            "cumulative_mae": self.absolute_error / self.samples,
+            "total_samples": self.samples,
+            "ready": self.ready(),
+        }
@@ -1,5 +1,72 @@
-from dataclasses import dataclass, field
-from typing import List, Dict
+import hashlib
+import json
+from dataclasses import MISSING, dataclass, field, fields, asdict
+from typing import Any, List, Dict, get_args, get_origin
+
+def _content_hash(genome) -> str:
+    # Identity and fitness are not content: two genomes with the same fields behave the same.
+    content = {k: v for k, v in asdict(genome).items() if k not in ("id", "fitness_score")}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _coerce(value: Any, annotation) -> Any:
+    """Converts value to the annotated field type where the intent is unambiguous, or raises TypeError."""
+    if get_origin(annotation) is list:
+        item_type = (get_args(annotation) or (Any,))[0]
+        items = value if isinstance(value, list) else [value]
+        if item_type is str:
+            return [item if isinstance(item, str) else json.dumps(item) for item in items]
+        if get_origin(item_type) is dict:
+            return [item for item in items if isinstance(item, dict)]
+        return items
+    if annotation is str:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return "\n".join(value)
+        if isinstance(value, (int, float, dict, list)):
+            return json.dumps(value)
+    raise TypeError(f"Cannot use {type(value).__name__} as {annotation}.")
+
+def genome_from_dict(genome_cls, data: Any, id: str):
+    """Builds a genome of genome_cls from model output, or returns None if data does not fit its schema.
+
+    Unknown keys are ignored, as are id and fitness_score, which are never taken
+    from the model. A dict wrapping the genome under a single key is unwrapped.
+    Values are coerced to the field types where unambiguous, e.g. a lone string
+    becomes a one-element list. Fields with a default may be missing; all others
+    must be present.
+    """
+    names = {f.name for f in fields(genome_cls)}
+    if isinstance(data, dict) and len(data) == 1 and isinstance(next(iter(data.values())), dict) and not names & set(data):
+        data = next(iter(data.values()))
+    if not isinstance(data, dict):
+        return None
+    values = {"id": id}
+    for f in fields(genome_cls):
+        if f.name in ("id", "fitness_score"):
+            continue
+        if data.get(f.name) is None:
+            if f.default is MISSING and f.default_factory is MISSING:
+                return None
+            continue
+        try:
+            values[f.name] = _coerce(data[f.name], f.type)
+        except TypeError:
+            return None
+    return genome_cls(**values)
+
+def parse_children(data: Any, count: int) -> List:
+    """The elements of a model's JSON array of children, padded with None or truncated to count.
+
+    Accepts a wrapper such as {"children": [...]} or a lone child object too.
+    Each element is then passed to genome_from_dict.
+    """
+    if isinstance(data, dict):
+        values = list(data.values())
+        data = values[0] if len(values) == 1 and isinstance(values[0], list) else [data]
+    if not isinstance(data, list):
+        data = []
+    return (data + [None] * count)[:count]
 
 @dataclass
 class PromptGenome:
@@ -12,6 +79,10 @@ class PromptGenome:
     constraints: List[str] = field(default_factory=list)
     fitness_score: float = 0.0
 
+    def content_hash(self) -> str:
+        """A stable hash of every field except id and fitness_score."""
+        return _content_hash(self)
+
 @dataclass
 class CriticGenome:
     """A structured representation of a critic prompt, designed for co-evolution."""
@@ -20,3 +91,7 @@ class CriticGenome:
     evaluation_criteria: List[Dict[str, str]] # e.g., [{"name": "Elegance", "description": "..."}]
     scoring_rubric: str
     fitness_score: float = 0.0
+
+    def content_hash(self) -> str:
+        """A stable hash of every field except id and fitness_score."""
+        return _content_hash(self)
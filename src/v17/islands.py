@@ -0,0 +1,136 @@
+import multiprocessing
+import os
+import queue
+from collections import Counter
+from dataclasses import asdict, replace
+from typing import Dict, List, Optional
+from src.v17.config import RunConfig
+from src.v17.genome import PromptGenome, CriticGenome
+
+TOPOLOGIES = ("ring", "full", "isolated")
+GENOME_TYPES = {"prompts": PromptGenome, "critics": CriticGenome}
+
+def neighbours(index: int, count: int, topology: str) -> List[int]:
+    """Islands that island `index` sends its emigrants to."""
+    if topology == "ring":
+        return [(index + 1) % count] if count > 1 else []
+    if topology == "full":
+        return [i for i in range(count) if i != index]
+    return []
+
+class Migrator:
+    """Exchanges an island's best genomes with its neighbours.
+
+    Every `interval` generations, once fitness is known, the `migrants` fittest
+    prompts and critics are sent to each neighbour's inbox, and whatever has
+    arrived in this island's inbox replaces the island's least fit genomes.
+    Receiving never blocks, so islands run at their own pace.
+    """
+
+    def __init__(self, index: int, inboxes: List, topology: str = "ring", interval: int = 1, migrants: int = 2):
+        self.index = index
+        self.inboxes = inboxes
+        self.targets = neighbours(index, len(inboxes), topology)
+        self.sources = sum(index in neighbours(i, len(inboxes), topology) for i in range(len(inboxes)))
+        self.interval = interval
+        self.migrants = migrants
+        # Migrants sent to an island that already finished are dropped instead of blocking exit.
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+
+    def __call__(self, generation: int, prompt_population, critic_population):
+        if self.interval <= 0 or (generation + 1) % self.interval:
+            return
+        if not self.targets and not self.sources:
+            return
+        populations = {"prompts": prompt_population, "critics": critic_population}
+        for name, population in populations.items():
+            best = sorted(population.active(), key=lambda g: g.fitness_score, reverse=True)[:self.migrants]
+            for target in self.targets:
+                self.inboxes[target].put((self.index, name, [asdict(g) for g in best]))
+
+        arrived: Dict[str, List] = {name: [] for name in populations}
+        while True:
+            try:
+                source, name, records = self.inboxes[self.index].get_nowait()
+            except queue.Empty:
+                break
+            for record in records:
+                # Tag the origin so migrants never collide with local ids.
+                record["id"] = f"{record['id'].split('@')[0]}@{source}"
+                arrived[name].append(GENOME_TYPES[name](**record))
+
+        for name, population in populations.items():
+            self._admit(population, arrived[name])
+
+    def _admit(self, population, genomes: List):
+        present = {g.content_hash() for g in population.active()}
+        immigrants = []
+        for g in sorted(genomes, key=lambda g: g.fitness_score, reverse=True):
+            if g.content_hash() not in present:
+                present.add(g.content_hash())
+                immigrants.append(g)
+        immigrants = immigrants[:min(self.migrants * max(1, self.sources), population.size - population.elitism)]
+        if immigrants:
+            population.immigrate(immigrants)
+
+def _run_island(index: int, api_key: Optional[str], key_share: int, inboxes: List, topology: str, interval: int, migrants: int, config: RunConfig):
+    if api_key:
+        os.environ["GROQ_API_KEY"] = api_key
+    # Islands sharing one key split its rate limit.
+    for name, default in (("GROQ_REQUESTS_PER_MINUTE", 30), ("GROQ_TOKENS_PER_MINUTE", 30000)):
+        os.environ[name] = str(float(os.environ.get(name, default)) / key_share)
+    os.makedirs(config.memory_dir, exist_ok=True)
+    if index:
+        # The Cognition Archive is shared, so only the first island writes learnings back.
+        config = replace(config, learnings=0)
+    for name in ("metrics_path", "trace_path"):
+        if getattr(config, name):
+            base, ext = os.path.splitext(getattr(config, name))
+            config = replace(config, **{name: f"{base}.island_{index}{ext}"})
+    # Imported here because main() imports TOPOLOGIES from this module.
+    from src.v17.main import main
+    main(config, on_evaluated=Migrator(index, inboxes, topology, interval, migrants))
+
+def run_islands(config: RunConfig, num_islands: int = 4, topology: str = "ring", migration_interval: int = 1, migrants: int = 2, root: str = "src/v17/islands", api_keys: Optional[List[str]] = None):
+    """Runs main() with config on num_islands sub-populations, each in its own worker process.
+
+    Island i keeps its populations, memo, checkpoint and log in root/island_i,
+    and is seeded with config.seed + i. API keys are taken from api_keys, else
+    the comma-separated GROQ_API_KEYS, else GROQ_API_KEY, and assigned
+    round-robin; islands sharing a key share its rate limit.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology '{topology}'. Expected one of {TOPOLOGIES}.")
+    if api_keys is None:
+        api_keys = [k.strip() for k in os.environ.get("GROQ_API_KEYS", "").split(",") if k.strip()]
+    if not api_keys:
+        if not os.environ.get("GROQ_API_KEY"):
+            raise ValueError("GROQ_API_KEY or GROQ_API_KEYS environment variable not set.")
+        api_keys = [os.environ["GROQ_API_KEY"]]
+    assigned = [api_keys[i % len(api_keys)] for i in range(num_islands)]
+    shares = Counter(assigned)
+
+    inboxes = [multiprocessing.Queue() for _ in range(num_islands)]
+    workers = []
+    for i in range(num_islands):
+        memory_dir = os.path.join(root, f"island_{i}")
+        island_config = replace(
+            config,
+            seed=None if config.seed is None else config.seed + i,
+            memory_dir=memory_dir,
+            log_path=os.path.join(memory_dir, "evolution_log.jsonl"),
+        )
+        worker = multiprocessing.Process(
+            target=_run_island,
+            args=(i, assigned[i], shares[assigned[i]], inboxes, topology, migration_interval, migrants, island_config),
+            name=f"island_{i}",
+        )
+        worker.start()
+        workers.append(worker)
+
+    for worker in workers:
+        worker.join()
+    failed = [w.name for w in workers if w.exitcode != 0]
+    if failed:
+        raise RuntimeError(f"Islands failed: {', '.join(failed)}")
@@ -1,23 +1,138 @@
+import copy
+import gzip
 import json
-from typing import List
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 from .genome import PromptGenome, CriticGenome
 
+GENOME_TYPES = {"prompts": PromptGenome, "critics": CriticGenome}
+
+def _open(path: str, mode: str, buffer_size: int = -1):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, buffering=buffer_size, encoding="utf-8")
+
 class Logger:
-    """A simple logger to track the state of the populations at each generation."""
+    """A structured event log of an evolution run, written as compact JSONL.
 
-    def __init__(self, log_path: str):
+    Instead of snapshotting every genome each generation, only deltas are
+    recorded: genomes that joined a population or changed, genomes that left
+    it, fitness updates, plus evaluation timings, failed evaluation calls, API
+    call counts, offspring dropped before evaluation, surrogate accuracy and
+    telemetry summaries. Paths ending in .gz are gzip-compressed. Writes are buffered and flushed once
+    per generation. LogReader rebuilds any generation's populations.
+    """
+
+    def __init__(self, log_path: str, buffer_size: int = 64 * 1024):
         self.log_path = log_path
+        self._file = _open(log_path, "a", buffer_size)
+        self._known: Dict[str, Dict[str, Dict]] = {name: {} for name in GENOME_TYPES}
+        self._write({"event": "run", "time": time.time()})
+
+    def _write(self, event: Dict):
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    def _log_population(self, generation: int, name: str, genomes: List):
+        known = self._known[name]
+        current = {g.id: g.__dict__ for g in genomes}
+        removed = [id for id in known if id not in current]
+        if removed:
+            self._write({"event": "removed", "generation": generation, "population": name, "ids": removed})
+        scores = {}
+        for id, record in current.items():
+            previous = known.get(id)
+            if previous is None or {**previous, "fitness_score": record["fitness_score"]} != record:
+                self._write({"event": "genome", "generation": generation, "population": name, "genome": record})
+            elif previous["fitness_score"] != record["fitness_score"]:
+                scores[id] = record["fitness_score"]
+        if scores:
+            self._write({"event": "fitness", "generation": generation, "population": name, "scores": scores})
+        self._known[name] = {id: copy.deepcopy(record) for id, record in current.items()}
 
     def log_generation(self, generation: int, prompts: List[PromptGenome], critics: List[CriticGenome]):
-        """Logs the state of the populations at a given generation."""
-        with open(self.log_path, 'a') as f:
-            f.write(f"--- Generation {generation} ---\n")
-            f.write("Prompts:\n")
-            for p in prompts:
-                f.write(json.dumps(p.__dict__, indent=4))
-                f.write("\n")
-            f.write("Critics:\n")
-            for c in critics:
-                f.write(json.dumps(c.__dict__, indent=4))
-                f.write("\n")
+        """Logs how the populations changed since the previously logged generation."""
+        self._write({"event": "generation", "generation": generation, "time": time.time()})
+        self._log_population(generation, "prompts", prompts)
+        self._log_population(generation, "critics", critics)
+        self._file.flush()
+
+    def log_timing(self, generation: int, timings: Dict[str, float]):
+        """Logs wall-clock seconds spent per phase of a generation."""
+        self._write({"event": "timing", "generation": generation, "seconds": timings})
+
+    def log_errors(self, generation: int, errors: List[List[str]]):
+        """Logs the evaluation calls of a generation that failed, if any."""
+        if errors:
+            self._write({"event": "errors", "generation": generation, "errors": errors})
+
+    def log_api_calls(self, generation: int, stats: Dict[str, float]):
+        """Logs API call counters for a generation."""
+        self._write({"event": "api", "generation": generation, "stats": stats})
+
+    def log_novelty(self, generation: int, population: str, rejected: int, screened_out: int = 0):
+        """Logs how many offspring were dropped as near-duplicates or screened out by the surrogate before evaluation."""
+        self._write({"event": "novelty", "generation": generation, "population": population, "rejected": rejected, "screened_out": screened_out})
+
+    def log_surrogate(self, generation: int, population: str, report: Dict):
+        """Logs the surrogate model's accuracy on newly evaluated genomes."""
+        self._write({"event": "surrogate", "generation": generation, "population": population, "report": report})
+
+    def log_telemetry(self, generation: int, summary: Dict):
+        """Logs a generation's per-phase LLM calls, tokens, latency and throughput."""
+        self._write({"event": "telemetry", "generation": generation, "summary": summary})
+
+    def close(self):
+        self._file.close()
+
+class LogReader:
+    """Streams events from a Logger file and rebuilds populations from them."""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+
+    def events(self) -> Iterator[Dict]:
+        with _open(self.log_path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn line from an interrupted run.
+                    continue
+
+    def population_at(self, generation: int, run: int = -1) -> Tuple[List[PromptGenome], List[CriticGenome]]:
+        """Returns the (prompts, critics) logged at a generation of a run (default: the last run that reached it)."""
+        snapshots = []
+        state: Optional[Dict[str, Dict[str, Dict]]] = None
+        current = None
+
+        def snapshot():
+            if state is not None and current == generation:
+                snapshots.append(copy.deepcopy(state))
+
+        for event in self.events():
+            kind = event["event"]
+            if kind == "run":
+                snapshot()
+                state, current = {name: {} for name in GENOME_TYPES}, None
+            elif kind == "generation":
+                snapshot()
+                current = event["generation"]
+            elif state is None or kind not in ("genome", "removed", "fitness"):
+                continue
+            elif kind == "genome":
+                state[event["population"]][event["genome"]["id"]] = event["genome"]
+            elif kind == "removed":
+                for id in event["ids"]:
+                    state[event["population"]].pop(id, None)
+            else:
+                for id, score in event["scores"].items():
+                    state[event["population"]][id]["fitness_score"] = score
+        snapshot()
 
+        if not snapshots:
+            raise KeyError(f"Generation {generation} not found in {self.log_path}.")
+        chosen = snapshots[run]
+        return (
+            [PromptGenome(**record) for record in chosen["prompts"].values()],
+            [CriticGenome(**record) for record in chosen["critics"].values()],
+        )
@@ -1,92 +1,298 @@
+import argparse
+import math
 import os
+import random
+import time
+import uuid
+from typing import Callable, Optional
+from src.v17.config import RunConfig
 from src.v17.memory.cognition_archive import CognitionArchive
 from src.v17.memory.prompt_db import PromptDB
 from src.v17.memory.critic_db import CriticDB
 from src.v17.agents.researcher import ResearcherAgent
 from src.v17.agents.engineer import EngineerAgent
 from src.v17.agents.critic import CriticAgent
+from src.v17.genome import PromptGenome, CriticGenome
 from src.v17.evolution.selection import roulette_wheel_selection
-from src.v17.evolution.crossover import intelligent_crossover, intelligent_crossover_critic
-from src.v17.evolution.mutation import intelligent_mutation, intelligent_mutation_critic
+from src.v17.evolution.crossover import batched_crossover, batched_crossover_critic
+from src.v17.evolution.mutation import batched_mutation, batched_mutation_critic
 from src.v17.evolution.fitness import calculate_prompt_fitness, calculate_critic_fitness
+from src.v17.evolution.population import PopulationManager, STRATEGIES
+from src.v17.evolution.novelty import NoveltyIndex
+from src.v17.evolution.surrogate import SurrogateModel
+from src.v17.islands import TOPOLOGIES, run_islands
+from src.v17.evaluation import EvaluationScheduler
+from src.v17.memory.fitness_memo import FitnessMemo
+from src.v17.checkpoint import Checkpointer, RunState
 from src.v17.logger import Logger
-from src.groq_client import GroqClient
+from src.groq_client import GroqClient, get_client
+from src.telemetry import get_telemetry
 
-def main():
-    """The main entry point for the V17 system."""
+# Crossover and mutation operators per genome type
+VARIATION = {
+    PromptGenome: (batched_crossover, batched_mutation),
+    CriticGenome: (batched_crossover_critic, batched_mutation_critic),
+}
 
-    if not os.environ.get("GROQ_API_KEY"):
+def _novelty_index(population, threshold, extra=()):
+    """A NoveltyIndex over a population's active and archived genomes."""
+    return NoveltyIndex(population.active() + population.archive.get_all() + list(extra), threshold=threshold)
+
+def _child_id(genome_cls, generation: int) -> str:
+    """A short id that is unique even when the same parents are paired twice."""
+    kind = "prompt" if genome_cls is PromptGenome else "critic"
+    return f"{kind}_g{generation}_{uuid.uuid4().hex[:8]}"
+
+def _breed(population, genome_cls, surrogate, config, state, checkpointer, rng, groq_client):
+    """Breeds and admits one population's offspring, resuming from the checkpointed parents and children.
+
+    Children are bred config.batch_size at a time, with one crossover and one mutation call per batch.
+    Children within config.novelty_threshold cosine similarity of a current, archived or
+    earlier child genome are dropped before they cost an evaluation. While the
+    surrogate is ready(), config.screen_ratio times as many children are bred and only
+    those with the highest predicted fitness are admitted.
+    Returns how many children were dropped as duplicates and how many were screened out.
+    """
+    crossover, mutation = VARIATION[genome_cls]
+    batch_size = config.batch_size
+    parents = {g.id: g for g in population.active()}
+    needed = population.offspring_needed()
+    if not state.selected:
+        num_children = math.ceil(needed * config.screen_ratio) if surrogate.ready() else needed
+        state.selected = [g.id for g in roulette_wheel_selection(list(parents.values()), 2 * num_children, rng=rng)]
+        state.pending = [state.selected[j:j + 2] for j in range(0, len(state.selected), 2)]
+        state.set_rng(rng)
+        checkpointer.save(state, force=True)
+
+    offspring = [genome_cls(**g) for g in state.offspring]
+    index = _novelty_index(population, config.novelty_threshold, offspring)
+    rejected = 0
+    # Dropped children leave no trace in state.offspring, so progress is read from the pending pairs.
+    for i in range(len(state.selected) - 2 * len(state.pending), len(state.selected), 2 * batch_size):
+        ids = state.selected[i:i + 2 * batch_size]
+        pairs = [(parents[ids[j]], parents[ids[j + 1]]) for j in range(0, len(ids), 2)]
+        bred = mutation(crossover(pairs, groq_client, batch_size=batch_size), groq_client, batch_size=batch_size)
+        for child in bred:
+            child.id = _child_id(genome_cls, state.generation)
+        children = index.admit(bred)
+        rejected += len(bred) - len(children)
+        offspring.extend(children)
+        state.offspring.extend(dict(child.__dict__) for child in children)
+        state.pending = [state.selected[j:j + 2] for j in range(i + len(ids), len(state.selected), 2)]
+        checkpointer.save(state)
+
+    screened_out = max(0, len(offspring) - needed)
+    if screened_out:
+        offspring = surrogate.rank(offspring, needed)
+
+    if not state.admitted:
+        population.advance(offspring)
+        state.admitted = True
+        checkpointer.save(state, force=True)
+    return rejected, screened_out
+
+def main(config: Optional[RunConfig] = None, groq_client: Optional[GroqClient] = None, on_evaluated: Optional[Callable] = None):
+    """The main entry point for the V17 system, running one evolution with the given RunConfig.
+
+    Run state is checkpointed as it goes so config.resume can continue it. If
+    given, on_evaluated(generation, prompt_population, critic_population) is
+    called once fitness is known, before breeding; the island model uses it to
+    migrate genomes. groq_client replaces the shared client, e.g. one with an
+    offline transport.
+
+    Every generation's LLM calls, tokens and latency per phase are logged. A
+    surrogate model per population learns to predict fitness (without the
+    novelty bonus) from genome text as true scores arrive, and its accuracy on
+    unseen genomes is logged.
+    """
+    config = config or RunConfig()
+    memory_dir = config.memory_dir
+
+    if groq_client is None and not os.environ.get("GROQ_API_KEY"):
         raise ValueError("GROQ_API_KEY environment variable not set.")
 
-    # Initialize Groq client
-    groq_client = GroqClient()
+    rng = random.Random(config.seed)
+    checkpointer = Checkpointer(os.path.join(memory_dir, "checkpoint.json"))
+    state = checkpointer.load() if config.resume else None
+    if state is None:
+        state = RunState()
+        state.set_rng(rng)
+    else:
+        state.restore_rng(rng)
+
+    # Initialize the shared Groq client, with one pooled connection per concurrent call
+    groq_client = groq_client or get_client(pool_size=config.max_concurrency)
 
     # Initialize databases and archives
-    cognition_archive = CognitionArchive("src/v17/memory/cognition_archive.md")
-    prompt_db = PromptDB("src/v17/memory/prompt_db.json")
-    critic_db = CriticDB("src/v17/memory/critic_db.json")
+    cognition_archive = CognitionArchive(config.cognition_path)
+    prompt_db = PromptDB(os.path.join(memory_dir, "prompt_db.jsonl"))
+    critic_db = CriticDB(os.path.join(memory_dir, "critic_db.jsonl"))
+    prompt_population = PopulationManager(prompt_db, PromptDB(os.path.join(memory_dir, "prompt_archive.jsonl")), size=config.population_size, strategy=config.strategy, elitism=config.elitism)
+    critic_population = PopulationManager(critic_db, CriticDB(os.path.join(memory_dir, "critic_archive.jsonl")), size=config.population_size, strategy=config.strategy, elitism=config.elitism)
 
     # Initialize agents
-    researcher = ResearcherAgent(cognition_archive)
-    engineer = EngineerAgent()
-    critic = CriticAgent()
+    researcher = ResearcherAgent(cognition_archive, groq_client)
+    engineer = EngineerAgent(groq_client)
+    critic = CriticAgent(groq_client)
+    memo = FitnessMemo(os.path.join(memory_dir, "fitness_memo.jsonl"))
+    scheduler = EvaluationScheduler(engineer, critic, max_concurrency=config.max_concurrency, memo=memo)
 
     # Initialize logger
-    logger = Logger("src/v17/evolution_log.txt")
+    logger = Logger(config.log_path)
 
     # Initialize populations if they are empty
     if not prompt_db.get_all():
-        for i in range(10):
-            prompt_db.add(researcher.generate_prompt_genome(f"prompt_{i}"))
-    
+        prompt_db.add_many(scheduler.map(researcher.generate_prompt_genome, [f"prompt_{i}" for i in range(config.population_size)]))
+
     if not critic_db.get_all():
-        for i in range(10):
-            critic_db.add(researcher.generate_critic_genome(f"critic_{i}"))
+        critic_db.add_many(scheduler.map(researcher.generate_critic_genome, [f"critic_{i}" for i in range(config.population_size)]))
+
+    # Archive genomes beyond the active population size, e.g. from earlier unbounded runs
+    prompt_population.trim()
+    critic_population.trim()
+
+    # Surrogates keep learning across runs from their saved state
+    prompt_surrogate = SurrogateModel(os.path.join(memory_dir, "prompt_surrogate.json"))
+    critic_surrogate = SurrogateModel(os.path.join(memory_dir, "critic_surrogate.json"))
+
+    def save_progress(matrix):
+        if checkpointer.due():
+            state.set_matrix(matrix)
+            checkpointer.save(state)
+
+    telemetry = get_telemetry()
+    telemetry.take_summary()
 
     # Run for a specified number of generations
-    num_generations = 5
-    for generation in range(num_generations):
-        prompts = prompt_db.get_all()
-        critics = critic_db.get_all()
-
-        # Log the current generation
-        logger.log_generation(generation, prompts, critics)
-
-        # Evaluate prompts
-        prompt_metrics = []
-        for p in prompts:
-            code = engineer.generate_code(p)
-            metrics = engineer.run_tests_and_get_metrics(code)
-            prompt_metrics.append(metrics)
-            critic_scores = [critic.evaluate_code(c, code) for c in critics]
-            p.fitness_score = calculate_prompt_fitness(p, metrics, critic_scores)
-
-        # Evolve prompts
-        selected_prompts = roulette_wheel_selection(prompts, 10)
-        new_prompts = []
-        for i in range(0, 10, 2):
-            parent1, parent2 = selected_prompts[i], selected_prompts[i+1]
-            child = intelligent_crossover(parent1, parent2, groq_client)
-            new_prompts.append(intelligent_mutation(child, groq_client))
-        
-        for p in new_prompts:
-            prompt_db.add(p)
-
-        # Evaluate critics
-        for c in critics:
-            critic_scores = [critic.evaluate_code(c, engineer.generate_code(p)) for p in prompts]
-            c.fitness_score = calculate_critic_fitness(c, prompt_metrics, critic_scores)
-
-        # Evolve critics
-        selected_critics = roulette_wheel_selection(critics, 10)
-        new_critics = []
-        for i in range(0, 10, 2):
-            parent1, parent2 = selected_critics[i], selected_critics[i+1]
-            child = intelligent_crossover_critic(parent1, parent2, groq_client)
-            new_critics.append(intelligent_mutation_critic(child, groq_client))
-
-        for c in new_critics:
-            critic_db.add(c)
+    while state.generation < config.num_generations:
+        generation = state.generation
+        stats_before = groq_client.stats()
+        timings = {}
+
+        if state.phase == "evaluate":
+            prompts = prompt_population.active()
+            critics = critic_population.active()
+
+            # Log the current generation
+            logger.log_generation(generation, prompts, critics)
+
+            # Evaluate prompts: every prompt's code and every critic score is computed once
+            start_time = time.monotonic()
+            with telemetry.span("evaluate", generation=generation):
+                matrix = scheduler.evaluate(prompts, critics, matrix=state.get_matrix(), on_progress=save_progress)
+            timings["evaluate"] = time.monotonic() - start_time
+            logger.log_errors(generation, matrix.errors)
+            prompt_fitness = [calculate_prompt_fitness(p, matrix) for p in prompts]
+            novelty = _novelty_index(prompt_population, config.novelty_threshold)
+            for p, fitness in zip(prompts, prompt_fitness):
+                p.fitness_score = fitness + config.novelty_weight * novelty.novelty(p)
+            prompt_db.add_many(prompts)
+
+            # Evaluate critics against the same matrix
+            critic_fitness = [calculate_critic_fitness(c, matrix) for c in critics]
+            novelty = _novelty_index(critic_population, config.novelty_threshold)
+            for c, fitness in zip(critics, critic_fitness):
+                c.fitness_score = fitness + config.novelty_weight * novelty.novelty(c)
+            critic_db.add_many(critics)
+
+            # Train the surrogates on the matrix fitness of genomes not seen before;
+            # the novelty bonus depends on the rest of the population, so it is left out
+            for name, surrogate, genomes, fitness in (("prompts", prompt_surrogate, prompts, prompt_fitness), ("critics", critic_surrogate, critics, critic_fitness)):
+                report = surrogate.observe(genomes, fitness)
+                if report is not None:
+                    logger.log_surrogate(generation, name, report)
+                    surrogate.save()
+
+            if on_evaluated is not None:
+                on_evaluated(generation, prompt_population, critic_population)
+
+            state.set_matrix(matrix)
+            state.next_phase()
+            checkpointer.save(state, force=True)
+
+        if state.phase == "evolve_prompts":
+            start_time = time.monotonic()
+            with telemetry.span("evolve_prompts", generation=generation):
+                rejected, screened_out = _breed(prompt_population, PromptGenome, prompt_surrogate, config, state, checkpointer, rng, groq_client)
+            logger.log_novelty(generation, "prompts", rejected, screened_out)
+            timings["evolve_prompts"] = time.monotonic() - start_time
+            state.next_phase()
+            state.set_rng(rng)
+            checkpointer.save(state, force=True)
+
+        if state.phase == "evolve_critics":
+            start_time = time.monotonic()
+            with telemetry.span("evolve_critics", generation=generation):
+                rejected, screened_out = _breed(critic_population, CriticGenome, critic_surrogate, config, state, checkpointer, rng, groq_client)
+            logger.log_novelty(generation, "critics", rejected, screened_out)
+            timings["evolve_critics"] = time.monotonic() - start_time
+
+            stats = groq_client.stats()
+            logger.log_timing(generation, timings)
+            logger.log_api_calls(generation, {k: stats[k] - stats_before.get(k, 0) for k in ("calls", "retries", "early_stops", "cache_hits", "cache_misses") if k in stats})
+            logger.log_telemetry(generation, telemetry.take_summary())
+            if config.metrics_path:
+                telemetry.export_prometheus(config.metrics_path)
+
+            state.next_phase()
+            state.set_rng(rng)
+            checkpointer.save(state, force=True)
+
+    # Log the final populations so the last fitness scores are recorded
+    logger.log_generation(config.num_generations, prompt_population.active(), critic_population.active())
+    for population in (prompt_population, critic_population):
+        for genome in sorted(population.active(), key=lambda g: g.fitness_score, reverse=True)[:config.learnings]:
+            researcher.record_learning(genome)
+    logger.close()
+    memo.close()
+    for db in (prompt_db, critic_db, prompt_population.archive, critic_population.archive):
+        db.close()
+    checkpointer.clear()
+    if config.trace_path:
+        telemetry.export_chrome_trace(config.trace_path)
+
+def cli():
+    """Parses command-line arguments and runs main()."""
+    parser = argparse.ArgumentParser(description="Run the V17 co-evolutionary prompt and critic system.")
+    parser.add_argument("--generations", type=int, default=5, help="Number of generations to run.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of concurrent LLM calls.")
+    parser.add_argument("--population-size", type=int, default=10, help="Active genomes per population.")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="steady_state", help="Replacement strategy.")
+    parser.add_argument("--elitism", type=int, default=2, help="Best genomes that always survive.")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible parent selection.")
+    parser.add_argument("--batch-size", type=int, default=4, help="Children bred per crossover and mutation call.")
+    parser.add_argument("--novelty-threshold", type=float, default=0.95, help="Drop offspring at least this similar to an existing genome.")
+    parser.add_argument("--novelty-weight", type=float, default=0.1, help="Weight of the novelty bonus in fitness.")
+    parser.add_argument("--screen-ratio", type=float, default=2.0, help="Offspring bred per evaluated child once the surrogate is trained (1 disables screening).")
+    parser.add_argument("--learnings", type=int, default=1, help="Best genomes per population written back to the Cognition Archive.")
+    parser.add_argument("--resume", action="store_true", help="Continue the last interrupted run from its checkpoint.")
+    parser.add_argument("--metrics-file", help="Write Prometheus text metrics here after every generation.")
+    parser.add_argument("--trace-file", help="Write a Chrome trace of the run here.")
+    parser.add_argument("--islands", type=int, default=1, help="Number of sub-populations evolved in parallel worker processes.")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="ring", help="Which islands exchange migrants.")
+    parser.add_argument("--migration-interval", type=int, default=1, help="Generations between migrations.")
+    parser.add_argument("--migrants", type=int, default=2, help="Best genomes per population sent to each neighbour.")
+    args = parser.parse_args()
+    config = RunConfig(
+        num_generations=args.generations,
+        max_concurrency=args.concurrency,
+        seed=args.seed,
+        resume=args.resume,
+        population_size=args.population_size,
+        strategy=args.strategy,
+        elitism=args.elitism,
+        batch_size=args.batch_size,
+        novelty_threshold=args.novelty_threshold,
+        novelty_weight=args.novelty_weight,
+        screen_ratio=args.screen_ratio,
+        learnings=args.learnings,
+        metrics_path=args.metrics_file,
+        trace_path=args.trace_file,
+    )
+    if args.islands > 1:
+        run_islands(config, num_islands=args.islands, topology=args.topology, migration_interval=args.migration_interval, migrants=args.migrants)
+    else:
+        main(config)
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -1,18 +1,158 @@
-from typing import List
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from src.context_packer import estimate_tokens
+
+_TERM = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and are as at be by for from in is it of on or that the this to use with".split())
+
+def _terms(text: str) -> List[str]:
+    """Lower-cased words without stopwords, with plural "s" stripped so "critics" matches "critic"."""
+    return [t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith("ss") else t for t in _TERM.findall(text.lower()) if t not in _STOPWORDS]
 
 class CognitionArchive:
-    """A simple text-based knowledge base."""
+    """A markdown knowledge base with an on-disk BM25 index.
 
-    def __init__(self, archive_path: str):
+    Every non-heading line of the markdown file is one entry, filed under the
+    heading above it. The index is a JSONL file next to the archive holding each
+    entry's byte offset, section and term counts, so entry text is only read
+    from the archive for the entries a search returns. It is loaded on first
+    search and rebuilt whenever the archive was edited after it was written;
+    add() appends to both files.
+    """
+
+    def __init__(self, archive_path: str, index_path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
         self.archive_path = archive_path
-        self.knowledge: List[str] = self._load()
+        self.index_path = index_path or os.path.splitext(archive_path)[0] + "_index.jsonl"
+        self.k1 = k1
+        self.b = b
+        self._entries: Optional[List[Dict]] = None
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+        self._lock = threading.RLock()
+
+    def _scan(self) -> List[Dict]:
+        """Parses the archive into entry records."""
+        entries, section, offset = [], "", 0
+        with open(self.archive_path, "rb") as f:
+            for raw in f:
+                line = raw.decode("utf-8", errors="replace").strip()
+                if line.startswith("#"):
+                    section = line.lstrip("#").strip()
+                elif line:
+                    entries.append({"offset": offset, "length": len(raw), "section": section, "terms": Counter(_terms(f"{section} {line}"))})
+                offset += len(raw)
+        return entries
+
+    def _scan_tail(self, offset: int) -> bool:
+        """Whether the archive holds any entry text after offset."""
+        with open(self.archive_path, "rb") as f:
+            f.seek(offset)
+            return any(line.strip() and not line.lstrip().startswith(b"#") for line in f)
+
+    def _index(self, entry: Dict):
+        doc = len(self._entries)
+        self._entries.append(entry)
+        self._lengths.append(sum(entry["terms"].values()))
+        for term, count in entry["terms"].items():
+            self._postings.setdefault(term, []).append((doc, count))
+
+    def _loaded(self) -> List[Dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = []
+        if not os.path.exists(self.archive_path):
+            return self._entries
+        entries = None
+        if os.path.exists(self.index_path) and os.path.getmtime(self.index_path) >= os.path.getmtime(self.archive_path):
+            with open(self.index_path, "r") as f:
+                entries = [json.loads(line) for line in f if line.endswith("\n")]
+            # A torn write leaves the index short of the archive's last entry.
+            end = entries[-1]["offset"] + entries[-1]["length"] if entries else 0
+            if os.path.getsize(self.archive_path) > end and self._scan_tail(end):
+                entries = None
+        if entries is None:
+            entries = self._scan()
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in entries))
+            os.replace(tmp_path, self.index_path)
+        for entry in entries:
+            self._index(entry)
+        return self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._loaded())
 
-    def _load(self) -> List[str]:
+    def _text(self, f, entry: Dict) -> str:
+        f.seek(entry["offset"])
+        line = f.read(entry["length"]).decode("utf-8", errors="replace").strip().lstrip("-*+ ")
+        return f"{entry['section']}: {line}" if entry["section"] else line
+
+    def search(self, query: str, k: int = 8, budget: Optional[int] = None) -> List[str]:
+        """Returns up to k entries ranked by BM25 relevance to query, within budget tokens if given.
+
+        Entries are prefixed with their section. When fewer than k entries
+        match, the rest are filled with the most recently added entries.
+        """
+        with self._lock:
+            entries = self._loaded()
+            if not entries:
+                return []
+            average_length = sum(self._lengths) / len(entries) or 1.0
+            scores: Dict[int, float] = {}
+            for term in set(_terms(query)):
+                postings = self._postings.get(term, [])
+                idf = math.log(1 + (len(entries) - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc, count in postings:
+                    length = self._lengths[doc]
+                    scores[doc] = scores.get(doc, 0.0) + idf * count * (self.k1 + 1) / (count + self.k1 * (1 - self.b + self.b * length / average_length))
+            ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))
+            ranked += [doc for doc in range(len(entries) - 1, -1, -1) if doc not in scores][:max(0, k - len(ranked))]
+
+            results, used = [], 0
+            with open(self.archive_path, "rb") as f:
+                for doc in ranked[:k]:
+                    text = self._text(f, entries[doc])
+                    cost = estimate_tokens(text) + 1
+                    if budget is not None and used + cost > budget:
+                        continue
+                    results.append(text)
+                    used += cost
+            return results
+
+    def add(self, text: str, section: str = "Evolved Learnings"):
+        """Appends one entry under section, starting the section if it is not the archive's last one."""
+        line = " ".join(text.split())
+        if not line:
+            return
+        with self._lock:
+            entries = self._loaded()
+            last_section = entries[-1]["section"] if entries else None
+            with open(self.archive_path, "a+b") as f:
+                offset = f.seek(0, os.SEEK_END)
+                f.seek(max(0, offset - 1))
+                prefix = b"" if offset == 0 or f.read(1) == b"\n" else b"\n"
+                if last_section != section:
+                    prefix += f"\n## {section}\n\n".encode("utf-8")
+                f.write(prefix)
+                offset += len(prefix)
+                raw = f"- {line}\n".encode("utf-8")
+                f.write(raw)
+            entry = {"offset": offset, "length": len(raw), "section": section, "terms": Counter(_terms(f"{section} {line}"))}
+            self._index(entry)
+            with open(self.index_path, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def get_knowledge(self) -> List[str]:
+        """Every line of the archive. Prefer search() for prompts."""
         try:
             with open(self.archive_path, 'r') as f:
                 return f.readlines()
         except FileNotFoundError:
             return []
-
-    def get_knowledge(self) -> List[str]:
-        return self.knowledge
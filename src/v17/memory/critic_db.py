@@ -1,33 +1,33 @@
-import json
-from typing import List, Dict
+from typing import Iterable, List
 from ..genome import CriticGenome
+from .genome_store import GenomeStore
 
 class CriticDB:
-    """A simple JSON-based database for storing and retrieving CriticGenomes."""
+    """A JSONL-backed database for storing and retrieving CriticGenomes.
+
+    If db_path ends in .jsonl and does not exist yet, a legacy JSON database
+    at the same path without the trailing 'l' is imported.
+    """
 
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.critics: Dict[str, CriticGenome] = self._load()
+        legacy_path = db_path[:-1] if db_path.endswith(".jsonl") else None
+        self.store = GenomeStore(db_path, CriticGenome, legacy_path=legacy_path)
 
-    def _load(self) -> Dict[str, CriticGenome]:
-        try:
-            with open(self.db_path, 'r') as f:
-                data = json.load(f)
-                return {id: CriticGenome(**c) for id, c in data.items()}
-        except FileNotFoundError:
-            return {}
+    def add(self, critic: CriticGenome):
+        self.store.put(critic)
 
-    def _save(self):
-        with open(self.db_path, 'w') as f:
-            data = {id: c.__dict__ for id, c in self.critics.items()}
-            json.dump(data, f, indent=4)
+    def add_many(self, critics: Iterable[CriticGenome]):
+        self.store.put_many(critics)
 
-    def add(self, critic: CriticGenome):
-        self.critics[critic.id] = critic
-        self._save()
+    def remove_many(self, critic_ids: Iterable[str]):
+        self.store.remove_many(critic_ids)
 
     def get(self, critic_id: str) -> CriticGenome:
-        return self.critics.get(critic_id)
+        return self.store.get(critic_id)
 
     def get_all(self) -> List[CriticGenome]:
-        return list(self.critics.values())
+        return self.store.values()
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+class FitnessMemo:
+    """Evaluation results keyed by genome content hash.
+
+    Stores the generated code and test metrics per prompt key, and the critic
+    score per (critic hash, prompt key) cell, so unchanged genomes are never
+    re-evaluated. Code is recorded as soon as it is generated, before its
+    metrics are known, so scores are never reused for regenerated code. When a path is given, entries are appended to a JSONL file
+    and reloaded on startup; a torn final line is truncated away.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.prompts: Dict[str, Tuple[str, Dict]] = {}
+        self.scores: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path is not None:
+            self._load()
+            self._file = open(path, 'a')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                if "prompt" in record:
+                    self.prompts[record["prompt"]] = (record["code"], record.get("metrics"))
+                else:
+                    self.scores[tuple(record["cell"])] = record["score"]
+                valid_bytes += len(raw)
+        if valid_bytes != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _append(self, record: Dict):
+        if self._file is not None:
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._file.flush()
+
+    def get_prompt(self, prompt_key: str) -> Optional[Tuple[str, Optional[Dict]]]:
+        """Returns (code, metrics) for a prompt key, or None. metrics is None until the code was tested."""
+        with self._lock:
+            return self.prompts.get(prompt_key)
+
+    def put_code(self, prompt_key: str, code: str):
+        with self._lock:
+            self.prompts[prompt_key] = (code, None)
+            self._append({"prompt": prompt_key, "code": code})
+
+    def put_prompt(self, prompt_key: str, code: str, metrics: Dict):
+        with self._lock:
+            self.prompts[prompt_key] = (code, metrics)
+            self._append({"prompt": prompt_key, "code": code, "metrics": metrics})
+
+    def get_score(self, critic_hash: str, prompt_key: str) -> Optional[float]:
+        with self._lock:
+            return self.scores.get((critic_hash, prompt_key))
+
+    def put_score(self, critic_hash: str, prompt_key: str, score: float):
+        with self._lock:
+            self.scores[(critic_hash, prompt_key)] = score
+            self._append({"cell": [critic_hash, prompt_key], "score": score})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import warnings
+from typing import Dict, Iterable, List, Optional, Type
+
+class GenomeStore:
+    """An append-only JSONL log of genomes with periodic compaction.
+
+    Every write appends one line: {"put": {...genome...}} or {"del": id}, and the
+    last line for an id wins. The log is read lazily on first access, a torn
+    final line left by a crash is discarded, and a corrupt line elsewhere is
+    skipped with a warning. Once the log holds more than compact_ratio lines
+    per live genome it is rewritten to a temporary file and atomically swapped in. A legacy JSON dict file is imported on first use.
+    """
+
+    MIN_COMPACT_LINES = 256
+
+    def __init__(self, path: str, genome_cls: Type, legacy_path: Optional[str] = None, compact_ratio: float = 2.0, fsync: bool = False):
+        self.path = path
+        self.genome_cls = genome_cls
+        self.legacy_path = legacy_path
+        self.compact_ratio = compact_ratio
+        self.fsync = fsync
+        self._genomes: Optional[Dict[str, object]] = None
+        self._lines = 0
+        self._file = None
+        self._lock = threading.RLock()
+
+    def _load(self):
+        genomes = {}
+        if not os.path.exists(self.path):
+            if self.legacy_path and os.path.exists(self.legacy_path):
+                with open(self.legacy_path, 'r') as f:
+                    genomes = {id: self.genome_cls(**g) for id, g in json.load(f).items()}
+            self._genomes = genomes
+            self._rewrite()
+            return
+
+        with open(self.path, 'rb') as f:
+            lines = f.readlines()
+        valid_bytes = 0
+        for number, raw in enumerate(lines, 1):
+            try:
+                record = json.loads(raw) if raw.endswith(b"\n") else None
+            except ValueError:
+                record = None
+            if not (isinstance(record, dict) and ("put" in record or "del" in record)):
+                record = None
+            if record is None and number == len(lines):
+                # A torn final write: drop it so the next append starts on a clean line.
+                with open(self.path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+                break
+            valid_bytes += len(raw)
+            if record is None:
+                warnings.warn(f"Skipping corrupt line {number} of {self.path}.")
+                continue
+            if "put" in record:
+                genomes[record["put"]["id"]] = self.genome_cls(**record["put"])
+            else:
+                genomes.pop(record["del"], None)
+            self._lines += 1
+        self._genomes = genomes
+        self._file = open(self.path, 'a')
+
+    def _loaded(self) -> Dict[str, object]:
+        if self._genomes is None:
+            self._load()
+        return self._genomes
+
+    def _append(self, records: List[Dict]):
+        self._file.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._lines += len(records)
+        if self._lines > max(self.MIN_COMPACT_LINES, self.compact_ratio * len(self._genomes)):
+            self.compact()
+
+    def _rewrite(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for genome in self._genomes.values():
+                f.write(json.dumps({"put": genome.__dict__}, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._genomes)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'a')
+
+    def put(self, genome):
+        self.put_many([genome])
+
+    def put_many(self, genomes: Iterable):
+        """Stores several genomes with a single append."""
+        with self._lock:
+            loaded = self._loaded()
+            records = []
+            for genome in genomes:
+                loaded[genome.id] = genome
+                records.append({"put": genome.__dict__})
+            if records:
+                self._append(records)
+
+    def remove_many(self, genome_ids: Iterable[str]):
+        """Deletes several genomes with a single append."""
+        with self._lock:
+            loaded = self._loaded()
+            records = [{"del": id} for id in genome_ids if loaded.pop(id, None) is not None]
+            if records:
+                self._append(records)
+
+    def get(self, genome_id: str):
+        with self._lock:
+            return self._loaded().get(genome_id)
+
+    def values(self) -> List:
+        with self._lock:
+            return list(self._loaded().values())
+
+    def compact(self):
+        """Rewrites the log to hold exactly one line per live genome."""
+        with self._lock:
+            self._loaded()
+            self._rewrite()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
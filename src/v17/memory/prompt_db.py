@@ -1,33 +1,33 @@
-import json
-from typing import List, Dict
+from typing import Iterable, List
 from ..genome import PromptGenome
+from .genome_store import GenomeStore
 
 class PromptDB:
-    """A simple JSON-based database for storing and retrieving PromptGenomes."""
+    """A JSONL-backed database for storing and retrieving PromptGenomes.
+
+    If db_path ends in .jsonl and does not exist yet, a legacy JSON database
+    at the same path without the trailing 'l' is imported.
+    """
 
     def __init__(self, db_path: str):
         self.db_path = db_path
-        self.prompts: Dict[str, PromptGenome] = self._load()
+        legacy_path = db_path[:-1] if db_path.endswith(".jsonl") else None
+        self.store = GenomeStore(db_path, PromptGenome, legacy_path=legacy_path)
 
-    def _load(self) -> Dict[str, PromptGenome]:
-        try:
-            with open(self.db_path, 'r') as f:
-                data = json.load(f)
-                return {id: PromptGenome(**p) for id, p in data.items()}
-        except FileNotFoundError:
-            return {}
+    def add(self, prompt: PromptGenome):
+        self.store.put(prompt)
 
-    def _save(self):
-        with open(self.db_path, 'w') as f:
-            data = {id: p.__dict__ for id, p in self.prompts.items()}
-            json.dump(data, f, indent=4)
+    def add_many(self, prompts: Iterable[PromptGenome]):
+        self.store.put_many(prompts)
 
-    def add(self, prompt: PromptGenome):
-        self.prompts[prompt.id] = prompt
-        self._save()
+    def remove_many(self, prompt_ids: Iterable[str]):
+        self.store.remove_many(prompt_ids)
 
     def get(self, prompt_id: str) -> PromptGenome:
-        return self.prompts.get(prompt_id)
+        return self.store.get(prompt_id)
 
     def get_all(self) -> List[PromptGenome]:
-        return list(self.prompts.values())
+        return self.store.values()
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,239 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Exit codes the runner uses to report how the candidate ended.
+EXIT_ERROR = 1
+EXIT_MEMORY = 3
+EXIT_SYS_EXIT = 4
+
+# Executed in a fresh interpreter: applies rlimits, runs the candidate and records
+# its own execution time in the result file. When a benchmark spec is given it
+# then runs the reference tests and times the entry point on scaled workloads,
+# alongside the task's reference implementation. The result file is rewritten
+# after every stage, so it survives the candidate hitting a limit while timed.
+_RUNNER = r"""
+import copy, json, math, os, statistics, sys, time, traceback
+limits = json.loads(sys.argv[1])
+try:
+    import resource
+    resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu_seconds"], limits["cpu_seconds"] + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (limits["memory_bytes"], limits["memory_bytes"]))
+except (ImportError, ValueError, OSError):
+    pass
+bench = None
+if len(sys.argv) > 4:
+    with open(sys.argv[4]) as f:
+        bench = json.load(f)
+
+def save():
+    with open(sys.argv[3] + ".tmp", "w") as f:
+        json.dump(result, f)
+    os.replace(sys.argv[3] + ".tmp", sys.argv[3])
+
+def time_calls(fn, args):
+    times = []
+    for _ in range(bench["repeats"]):
+        call_args = copy.deepcopy(args)
+        start = time.perf_counter()
+        fn(*call_args)
+        times.append(time.perf_counter() - start)
+        if sum(times) > bench["max_call_seconds"]:
+            break
+    return sorted(times)
+
+def exponent(medians):
+    points = [(math.log(n), math.log(t)) for n, t in medians.items() if t > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+def predicted(medians, n):
+    # Assumes at least linear growth, since one timed size gives no exponent.
+    last = max(medians)
+    return medians[last] * (n / last) ** max(1.0, exponent(medians))
+
+def benchmark(namespace, metrics):
+    fn = namespace.get(bench["entry_point"])
+    passed = 0
+    if callable(fn):
+        for args, expected in bench["tests"]:
+            try:
+                passed += fn(*copy.deepcopy(args)) == expected
+            except Exception:
+                pass
+    metrics["pass_rate"] = passed / len(bench["tests"]) if bench["tests"] else 0.0
+    save()
+    if not passed:
+        return
+    workload, reference = {}, {}
+    exec(bench["workload"], workload)
+    exec(bench["reference"], reference)
+    medians, ref_medians = {}, {}
+    for n in bench["sizes"]:
+        # Skip sizes the candidate would take too long on instead of running into the CPU limit.
+        if medians and predicted(medians, n) > bench["max_call_seconds"]:
+            break
+        args = workload["make_input"](n)
+        try:
+            times = time_calls(fn, args)
+        except Exception:
+            break
+        medians[n] = statistics.median(times)
+        ref_medians[n] = statistics.median(time_calls(reference[bench["entry_point"]], args))
+        metrics.update({
+            "benchmark_size": n,
+            "median_runtime": medians[n],
+            "p95_runtime": times[min(len(times) - 1, int(0.95 * len(times)))],
+            "scaling_exponent": exponent(medians),
+            "reference_median_runtime": ref_medians[n],
+            "reference_scaling_exponent": exponent(ref_medians),
+        })
+        save()
+
+with open(sys.argv[2]) as f:
+    source = f.read()
+result = {"exec_time": 0.0}
+code = 0
+namespace = {"__name__": "__main__"}
+start = time.perf_counter()
+try:
+    exec(compile(source, "<candidate>", "exec"), namespace)
+    result["exec_time"] = time.perf_counter() - start
+    if bench is not None:
+        result["benchmark"] = {}
+        benchmark(namespace, result["benchmark"])
+except MemoryError:
+    code = %(memory)d
+except SystemExit as e:
+    code = 0 if e.code in (None, 0) else %(sys_exit)d
+except BaseException:
+    traceback.print_exc()
+    code = %(error)d
+if not result["exec_time"]:
+    result["exec_time"] = time.perf_counter() - start
+sys.stdout.flush()
+save()
+sys.exit(code)
+""" % {"memory": EXIT_MEMORY, "sys_exit": EXIT_SYS_EXIT, "error": EXIT_ERROR}
+
+@dataclass
+class ExecutionResult:
+    """Structured outcome of running one candidate in a subprocess.
+
+    exit_reason is "slow" when code that ran and took the tests hit the CPU or
+    wall-clock limit while being timed; benchmark then holds its pass rate and
+    the sizes timed before the limit, and the run still counts as passed.
+    """
+    exit_reason: str  # ok, slow, error, memory, sys_exit, cpu_limit, timeout or killed
+    returncode: int
+    exec_time: float
+    wall_time: float
+    cpu_time: float
+    peak_rss_bytes: int
+    stdout_bytes: int
+    stderr_bytes: int
+    benchmark: Optional[Dict] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.exit_reason in ("ok", "slow")
+
+class Sandbox:
+    """Runs generated code in worker subprocesses with CPU, wall-clock and memory limits.
+
+    run_many executes up to max_workers candidates in parallel, one process each.
+    """
+
+    def __init__(self, cpu_seconds: int = 5, wall_seconds: float = 10.0, memory_mb: int = 512, max_workers: Optional[int] = None):
+        self.cpu_seconds = cpu_seconds
+        self.wall_seconds = wall_seconds
+        self.memory_mb = memory_mb
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, code: str, benchmark: Optional[Dict] = None) -> ExecutionResult:
+        """Runs one candidate; benchmark is a BenchmarkTask spec to measure it against."""
+        limits = json.dumps({"cpu_seconds": self.cpu_seconds, "memory_bytes": self.memory_mb * 1024 * 1024})
+        with tempfile.TemporaryDirectory() as tmp:
+            source_path = os.path.join(tmp, "candidate.py")
+            result_path = os.path.join(tmp, "result.json")
+            stdout_path = os.path.join(tmp, "stdout")
+            stderr_path = os.path.join(tmp, "stderr")
+            with open(source_path, "w") as f:
+                f.write(code)
+            args = [sys.executable, "-I", "-c", _RUNNER, limits, source_path, result_path]
+            if benchmark is not None:
+                args.append(os.path.join(tmp, "benchmark.json"))
+                with open(args[-1], "w") as f:
+                    json.dump(benchmark, f)
+            with open(stdout_path, "wb") as out, open(stderr_path, "wb") as err:
+                start = time.monotonic()
+                proc = subprocess.Popen(
+                    args,
+                    stdin=subprocess.DEVNULL, stdout=out, stderr=err, cwd=tmp, start_new_session=True,
+                )
+                status, rusage, timed_out = self._wait(proc, start + self.wall_seconds)
+                wall_time = time.monotonic() - start
+            returncode = os.waitstatus_to_exitcode(status)
+            proc.returncode = returncode
+            report = {}
+            if os.path.exists(result_path):
+                with open(result_path) as f:
+                    report = json.load(f)
+            exit_reason = self._exit_reason(returncode, timed_out)
+            if exit_reason in ("cpu_limit", "timeout", "killed") and "pass_rate" in report.get("benchmark", {}):
+                exit_reason = "slow"
+            return ExecutionResult(
+                exit_reason=exit_reason,
+                returncode=returncode,
+                exec_time=report.get("exec_time", wall_time),
+                wall_time=wall_time,
+                cpu_time=rusage.ru_utime + rusage.ru_stime,
+                # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+                peak_rss_bytes=rusage.ru_maxrss if sys.platform == "darwin" else rusage.ru_maxrss * 1024,
+                stdout_bytes=os.path.getsize(stdout_path),
+                stderr_bytes=os.path.getsize(stderr_path),
+                benchmark=report.get("benchmark"),
+            )
+
+    def run_many(self, codes: List[str], benchmark: Optional[Dict] = None) -> List[ExecutionResult]:
+        """Runs every candidate in parallel, returning results in input order."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda code: self.run(code, benchmark), codes))
+
+    @staticmethod
+    def _wait(proc: subprocess.Popen, deadline: float):
+        # wait4 reports the child's own resource usage, unlike getrusage(RUSAGE_CHILDREN).
+        delay = 0.001
+        while True:
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                return status, rusage, False
+            if time.monotonic() >= deadline:
+                os.killpg(proc.pid, signal.SIGKILL)
+                _, status, rusage = os.wait4(proc.pid, 0)
+                return status, rusage, True
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    @staticmethod
+    def _exit_reason(returncode: int, timed_out: bool) -> str:
+        if timed_out:
+            return "timeout"
+        if returncode == 0:
+            return "ok"
+        if returncode == -signal.SIGXCPU:
+            return "cpu_limit"
+        if returncode < 0:
+            return "killed"
+        return {EXIT_ERROR: "error", EXIT_MEMORY: "memory", EXIT_SYS_EXIT: "sys_exit"}.get(returncode, "error")
@@ -0,0 +1,98 @@
+import pytest
+
+from src.v17.benchmarks import BenchmarkTask, TASKS, get_task
+from src.v17.evolution.fitness import calculate_objective_score
+from src.v17.sandbox import Sandbox
+
+SORTED = "def sort_numbers(numbers):\n    return sorted(numbers)\n"
+BUBBLE = """
+def sort_numbers(numbers):
+    xs = list(numbers)
+    for i in range(len(xs)):
+        for j in range(len(xs) - 1 - i):
+            if xs[j] > xs[j + 1]:
+                xs[j], xs[j + 1] = xs[j + 1], xs[j]
+    return xs
+"""
+HANGS_ON_WORKLOADS = """
+def sort_numbers(numbers):
+    while len(numbers) > 100:
+        pass
+    return sorted(numbers)
+"""
+
+
+def _metrics(result):
+    benchmark = result.benchmark or {}
+    return dict(benchmark, passed=result.passed, exit_reason=result.exit_reason)
+
+
+@pytest.mark.parametrize("name", sorted(TASKS))
+def test_references_pass_their_own_tests(name):
+    task = get_task(name)
+    result = Sandbox().run(task.reference, task.to_spec())
+    assert result.exit_reason == "ok"
+    assert result.benchmark["pass_rate"] == 1.0
+    assert result.benchmark["benchmark_size"] == task.sizes[-1]
+
+
+def test_partially_correct_code_gets_a_partial_pass_rate():
+    code = "def sort_numbers(numbers):\n    return list(numbers)\n"
+    result = Sandbox().run(code, get_task("sort_numbers").to_spec())
+    assert result.passed
+    assert result.benchmark["pass_rate"] == 0.5
+
+
+def test_code_without_the_entry_point_passes_nothing():
+    result = Sandbox().run("x = 1\n", get_task("sort_numbers").to_spec())
+    assert result.benchmark == {"pass_rate": 0.0}
+    assert calculate_objective_score(_metrics(result)) == 0.0
+
+
+def test_slow_code_stops_before_sizes_it_would_not_finish():
+    task = get_task("sort_numbers")
+    spec = dict(task.to_spec(), sizes=[500, 2000, 32000], max_call_seconds=0.05)
+    result = Sandbox().run(BUBBLE, spec)
+    assert result.exit_reason == "ok"
+    assert result.benchmark["pass_rate"] == 1.0
+    assert result.benchmark["benchmark_size"] < 32000
+    assert result.benchmark["median_runtime"] > result.benchmark["reference_median_runtime"]
+
+
+def test_limit_hit_while_timing_reads_as_slow():
+    result = Sandbox(cpu_seconds=1, wall_seconds=5).run(HANGS_ON_WORKLOADS, get_task("sort_numbers").to_spec())
+    assert result.exit_reason == "slow"
+    assert result.passed
+    assert result.benchmark == {"pass_rate": 1.0}
+
+
+def test_slow_code_scores_below_fast_code():
+    task = get_task("sort_numbers")
+    fast = _metrics(Sandbox().run(SORTED, task.to_spec()))
+    quadratic = _metrics(Sandbox().run(BUBBLE, task.to_spec()))
+    untimed = _metrics(Sandbox(cpu_seconds=1, wall_seconds=5).run(HANGS_ON_WORKLOADS, task.to_spec()))
+    assert quadratic["scaling_exponent"] > quadratic["reference_scaling_exponent"] + 0.5
+    assert calculate_objective_score(fast) > calculate_objective_score(quadratic) > calculate_objective_score(untimed) == 0.0
+
+
+def test_limit_hit_during_the_tests_fails():
+    code = "def sort_numbers(numbers):\n    while True:\n        pass\n"
+    result = Sandbox(cpu_seconds=1, wall_seconds=5).run(code, get_task("sort_numbers").to_spec())
+    assert result.exit_reason == "cpu_limit"
+    assert not result.passed
+
+
+def test_custom_tasks_are_benchmarked():
+    task = BenchmarkTask(
+        name="double",
+        entry_point="double",
+        description="Double a number.",
+        tests=[[[2], 4], [[0], 0]],
+        workload="def make_input(n):\n    return [n]\n",
+        reference="def double(x):\n    return 2 * x\n",
+        sizes=[10, 100],
+        repeats=2,
+    )
+    result = Sandbox().run("def double(x):\n    return x + x\n", task.to_spec())
+    assert result.benchmark["pass_rate"] == 1.0
+    assert result.benchmark["benchmark_size"] == 100
@@ -0,0 +1,40 @@
+import random
+
+from src.v17.checkpoint import Checkpointer, RunState
+from src.v17.evolution.evaluation_matrix import EvaluationMatrix
+
+
+def test_run_state_round_trips(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path / "checkpoint.json"))
+    assert checkpointer.load() is None
+    rng = random.Random(7)
+    state = RunState(generation=2, phase="evolve_prompts", selected=["a", "b"], admitted=True)
+    state.set_rng(rng)
+    state.set_matrix(EvaluationMatrix(["p"], ["c"], codes={"p": "code"}))
+    checkpointer.save(state, force=True)
+
+    loaded = checkpointer.load()
+    assert loaded == state
+    restored = random.Random()
+    loaded.restore_rng(restored)
+    assert restored.random() == rng.random()
+    assert loaded.get_matrix().pending() == [["test", "p"], ["score", "c", "p"]]
+
+    checkpointer.clear()
+    assert checkpointer.load() is None
+
+
+def test_next_phase_resets_phase_progress():
+    state = RunState(phase="evolve_critics", matrix={}, selected=["a"], offspring=[{}], pending=[["a"]], admitted=True)
+    state.next_phase()
+    assert (state.generation, state.phase, state.matrix) == (1, "evaluate", None)
+    assert not state.selected and not state.offspring and not state.pending and not state.admitted
+
+
+def test_unforced_saves_are_throttled(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path / "checkpoint.json"), min_interval=60)
+    checkpointer.save(RunState(generation=1))
+    checkpointer.save(RunState(generation=2))
+    assert checkpointer.load().generation == 1
+    checkpointer.save(RunState(generation=3), force=True)
+    assert checkpointer.load().generation == 3
@@ -0,0 +1,59 @@
+import ast
+
+from src.code_merger import extract_code_blocks, merge_code
+
+BASE = '''import os
+
+
+def load(path):
+    return open(path).read()
+
+
+class Store:
+    def get(self, key):
+        return None
+
+    def put(self, key, value):
+        pass
+
+
+if __name__ == "__main__":
+    print(load("x"))
+'''
+
+
+def test_extract_code_blocks_joins_every_block():
+    response = "First:\n```python\ndef a():\n    pass\n```\nThen:\n```\ndef b():\n    pass\n```\n"
+    assert extract_code_blocks(response) == "def a():\n    pass\n\ndef b():\n    pass"
+    assert extract_code_blocks("\ndef a():\n    pass\n") == "def a():\n    pass"
+
+
+def test_redefinitions_replace_in_place():
+    merged = merge_code(BASE, "def load(path):\n    with open(path) as f:\n        return f.read()\n")
+    assert merged.count("def load") == 1
+    assert "with open(path)" in merged
+    assert merged.index("def load") < merged.index("class Store")
+    ast.parse(merged)
+
+
+def test_classes_merge_member_by_member():
+    merged = merge_code(BASE, "class Store:\n    def get(self, key):\n        return key\n\n    def delete(self, key):\n        pass\n")
+    assert "return key" in merged and "return None" not in merged
+    assert "def put" in merged and "def delete" in merged
+    assert merged.count("class Store") == 1
+
+
+def test_new_code_goes_above_the_main_guard_and_imports_on_top():
+    merged = merge_code(BASE, "import json\n\n\ndef save(path, data):\n    json.dump(data, open(path, 'w'))\n")
+    assert merged.index("import json") < merged.index("def load")
+    assert merged.index("def save") < merged.index('if __name__ == "__main__":')
+    ast.parse(merged)
+
+
+def test_identical_statements_are_not_duplicated():
+    assert merge_code(BASE, "import os\n") == BASE
+
+
+def test_unparsable_code_is_appended_as_text():
+    merged = merge_code(BASE, "def broken(:\n")
+    assert merged.startswith(BASE.rstrip("\n")) and merged.rstrip().endswith("def broken(:")
@@ -0,0 +1,71 @@
+import os
+
+from src.v17.memory.cognition_archive import CognitionArchive
+
+ARCHIVE = """# Cognition Archive
+
+## Sorting
+
+- Merge sort keeps sorting stable for large inputs.
+- Insertion sort wins on tiny lists.
+
+## Critics
+
+- Critics should reward measured speed over claimed speed.
+"""
+
+
+def _archive(tmp_path, text=ARCHIVE):
+    path = tmp_path / "archive.md"
+    path.write_text(text)
+    return CognitionArchive(str(path))
+
+
+def test_search_ranks_by_relevance(tmp_path):
+    archive = _archive(tmp_path)
+    assert len(archive) == 3
+    assert archive.search("critic speed", k=1) == ["Critics: Critics should reward measured speed over claimed speed."]
+    results = archive.search("stable merge sorting", k=3)
+    assert results[0] == "Sorting: Merge sort keeps sorting stable for large inputs."
+    # Only the Sorting entries match; the most recent entry fills the last slot.
+    assert results[2].startswith("Critics:")
+    assert os.path.exists(tmp_path / "archive_index.jsonl")
+
+
+def test_search_respects_the_budget(tmp_path):
+    archive = _archive(tmp_path)
+    assert archive.search("sort", k=3, budget=0) == []
+    assert len(archive.search("sort", k=3, budget=20)) == 1
+
+
+def test_add_appends_a_section_and_updates_the_index(tmp_path):
+    archive = _archive(tmp_path)
+    archive.add("Memoize   repeated evaluations.")
+    archive.add("Cache LLM calls.")
+    assert (tmp_path / "archive.md").read_text().endswith(
+        "claimed speed.\n\n## Evolved Learnings\n\n- Memoize repeated evaluations.\n- Cache LLM calls.\n")
+    assert archive.search("memoize", k=1) == ["Evolved Learnings: Memoize repeated evaluations."]
+    reloaded = CognitionArchive(archive.archive_path)
+    assert len(reloaded) == 5
+    assert reloaded.search("cache calls", k=1) == ["Evolved Learnings: Cache LLM calls."]
+
+
+def test_index_is_rebuilt_after_the_archive_is_edited(tmp_path):
+    archive = _archive(tmp_path)
+    len(archive)
+    path = tmp_path / "archive.md"
+    path.write_text(ARCHIVE.replace("Insertion sort wins on tiny lists.", "Radix sort suits integer keys."))
+    later = os.path.getmtime(archive.index_path) + 10
+    os.utime(path, (later, later))
+    reloaded = CognitionArchive(str(path))
+    assert reloaded.search("radix", k=1) == ["Sorting: Radix sort suits integer keys."]
+
+
+def test_torn_index_is_rebuilt(tmp_path):
+    archive = _archive(tmp_path)
+    archive.add("Memoize repeated evaluations.")
+    with open(archive.index_path, "rb+") as f:
+        f.truncate(os.path.getsize(archive.index_path) - 5)
+    reloaded = CognitionArchive(archive.archive_path)
+    assert len(reloaded) == 4
+    assert reloaded.search("memoize", k=1) == ["Evolved Learnings: Memoize repeated evaluations."]
@@ -0,0 +1,42 @@
+from src.context_packer import ContextPacker, SymbolIndex, estimate_tokens
+
+MODULE = "import math\n\n" + "\n\n".join(
+    f"def helper_{i}(x):\n    \"\"\"Helper number {i}.\"\"\"\n" + "    x = x + 1\n" * 20 + "    return x\n"
+    for i in range(10)
+) + "\n\ndef area_of_circle(r):\n    return math.pi * helper_3(r) ** 2\n"
+
+
+def test_small_modules_are_sent_whole():
+    index = SymbolIndex(MODULE)
+    assert ContextPacker(budget_tokens=10000).pack(index, "anything") == "\n\n".join(["import math"] + [s.source for s in index.symbols.values()])
+
+
+def test_packing_keeps_relevant_code_within_budget():
+    packed = ContextPacker(budget_tokens=200).pack(SymbolIndex(MODULE), "Fix area_of_circle for negative radii")
+    assert estimate_tokens(packed) <= 200
+    assert packed.startswith("import math")
+    assert "return math.pi * helper_3(r) ** 2" in packed
+    # The helper it calls comes in full; unrelated helpers shrink to signatures or are omitted.
+    assert "def helper_3(x):\n    \"\"\"Helper number 3.\"\"\"\n    x = x + 1" in packed
+    assert packed.count("x = x + 1") < 10 * 20
+    assert packed.endswith("other definitions omitted")
+
+
+def test_later_definitions_replace_earlier_ones():
+    index = SymbolIndex("def f():\n    return 1\n")
+    index.add("def f():\n    return 2\n")
+    assert list(index.symbols) == ["f"]
+    assert "return 2" in index.symbols["f"].source
+
+
+def test_unparsable_segments_are_split_at_definitions():
+    index = SymbolIndex("x = 1\n")
+    index.add("def a(:\n    pass\ndef b():\n    pass\n")
+    assert {"x", "a", "b"} <= set(index.symbols)
+
+
+def test_window_centres_on_the_current_line():
+    lines = [f"{i}. step number {i}" for i in range(20)]
+    window = ContextPacker().window(lines, 10, budget_tokens=30)
+    assert "10. step number 10" in window
+    assert "0. step number 0\n" not in window and "19. step" not in window
@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import threading
+
+import pytest
+
+pytest.importorskip("groq")
+
+from src.benchmark_suite import SyntheticResponder
+from src.groq_client import GroqClient
+from src.request_scheduler import RequestScheduler
+from src.transport import FakeTransport
+from src.v17.config import MEMORY_DIR, RunConfig
+from src.v17.evaluation import EvaluationScheduler
+from src.v17.evolution.fitness import calculate_critic_fitness, calculate_prompt_fitness
+from src.v17.genome import CriticGenome, PromptGenome
+from src.v17.main import main
+from src.v17.memory.fitness_memo import FitnessMemo
+
+
+class BadRequest(Exception):
+    """A non-retryable API error, e.g. a prompt that overflows the context window."""
+
+
+class FakeEngineer:
+    def __init__(self, fail=()):
+        self.task = type("Task", (), {"name": "sort_numbers"})()
+        self.sandbox = type("Sandbox", (), {"max_workers": 2})()
+        self.fail = set(fail)
+
+    def generate_code(self, prompt):
+        if prompt.id in self.fail:
+            raise BadRequest("context length exceeded")
+        return f"# code for {prompt.id}"
+
+    def run_tests_and_get_metrics(self, code):
+        return {"passed": True, "pass_rate": 1.0}
+
+
+class FakeCritic:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def evaluate_code(self, critic, code):
+        with self._lock:
+            self.calls.append((critic.id, code))
+        if critic.id in self.fail:
+            raise BadRequest("context length exceeded")
+        return 0.8
+
+
+def _genomes(count):
+    prompts = [PromptGenome(f"p{i}", f"template {i}", "persona", "framing", "format", []) for i in range(count)]
+    critics = [CriticGenome(f"c{i}", f"template {i}", [], "rubric") for i in range(count)]
+    return prompts, critics
+
+
+def test_failed_critic_calls_score_zero_and_are_not_memoized(tmp_path):
+    prompts, critics = _genomes(3)
+    memo = FitnessMemo(str(tmp_path / "memo.jsonl"))
+    matrix = EvaluationScheduler(FakeEngineer(), FakeCritic(fail=["c1"]), memo=memo).evaluate(prompts, critics)
+    assert matrix.pending() == []
+    assert matrix.critic_scores("c1") == [0.0, 0.0, 0.0]
+    assert matrix.critic_scores("c0") == [0.8, 0.8, 0.8]
+    assert sorted(e[:3] for e in matrix.errors) == [["score", "c1", "p0"], ["score", "c1", "p1"], ["score", "c1", "p2"]]
+    assert all("BadRequest" in e[3] for e in matrix.errors)
+    assert len(memo.scores) == 6
+    memo.close()
+
+
+def test_failed_generation_fails_the_prompt_without_scoring_it():
+    prompts, critics = _genomes(3)
+    critic = FakeCritic()
+    matrix = EvaluationScheduler(FakeEngineer(fail=["p2"]), critic).evaluate(prompts, critics)
+    assert matrix.pending() == []
+    assert matrix.metrics["p2"]["passed"] is False
+    assert matrix.prompt_scores("p2") == [0.0, 0.0, 0.0]
+    assert [e[:2] for e in matrix.errors] == [["generate", "p2"]]
+    assert all(code != "" for _, code in critic.calls) and len(critic.calls) == 6
+    assert calculate_prompt_fitness(prompts[2], matrix) == 0.1
+    assert 0.0 < calculate_critic_fitness(critics[0], matrix) <= 1.0
+
+
+def test_bad_requests_do_not_abort_main(tmp_path):
+    responder = SyntheticResponder(seed=0)
+    scored = []
+
+    def respond(messages, model):
+        prompt = messages[-1]["content"]
+        if "Code to evaluate" in prompt:
+            scored.append(prompt)
+            if len(scored) % 5 == 0:
+                raise BadRequest("context length exceeded")
+        return responder(messages, model)
+
+    client = GroqClient(transport=FakeTransport(respond), scheduler=RequestScheduler(requests_per_minute=1e9, tokens_per_minute=1e12))
+    config = RunConfig(
+        num_generations=2, seed=0, population_size=4, memory_dir=str(tmp_path), log_path=str(tmp_path / "log.jsonl"),
+        cognition_path=shutil.copy(os.path.join(MEMORY_DIR, "cognition_archive.md"), tmp_path), learnings=0,
+    )
+    main(config, groq_client=client)
+
+    with open(tmp_path / "log.jsonl") as f:
+        events = [json.loads(line) for line in f]
+    errors = [e for e in events if e["event"] == "errors"]
+    assert errors and all(error[0] == "score" for e in errors for error in e["errors"])
+    assert [e["generation"] for e in events if e["event"] == "generation"] == [0, 1, 2]
+    assert not (tmp_path / "checkpoint.json").exists()
@@ -0,0 +1,51 @@
+from src.v17.memory.fitness_memo import FitnessMemo
+
+
+def test_entries_survive_a_reload(tmp_path):
+    path = str(tmp_path / "memo.jsonl")
+    memo = FitnessMemo(path)
+    memo.put_code("task:a", "code a")
+    memo.put_prompt("task:b", "code b", {"passed": True})
+    memo.put_score("critic", "task:b", 0.7)
+    memo.close()
+
+    memo = FitnessMemo(path)
+    assert memo.get_prompt("task:a") == ("code a", None)
+    assert memo.get_prompt("task:b") == ("code b", {"passed": True})
+    assert memo.get_score("critic", "task:b") == 0.7
+    assert memo.get_prompt("task:c") is None and memo.get_score("critic", "task:a") is None
+    memo.close()
+
+
+def test_metrics_complete_an_earlier_code_record(tmp_path):
+    path = str(tmp_path / "memo.jsonl")
+    memo = FitnessMemo(path)
+    memo.put_code("task:a", "code")
+    memo.put_prompt("task:a", "code", {"passed": False})
+    memo.close()
+    assert FitnessMemo(path).get_prompt("task:a") == ("code", {"passed": False})
+
+
+def test_torn_final_line_is_truncated(tmp_path):
+    path = tmp_path / "memo.jsonl"
+    memo = FitnessMemo(str(path))
+    memo.put_score("critic", "task:a", 0.5)
+    memo.close()
+    intact = path.read_bytes()
+    with open(path, "ab") as f:
+        f.write(b'{"cell": ["critic", "task:b"], "sco')
+
+    memo = FitnessMemo(str(path))
+    assert memo.get_score("critic", "task:a") == 0.5
+    assert memo.get_score("critic", "task:b") is None
+    memo.put_score("critic", "task:c", 0.25)
+    memo.close()
+    assert path.read_bytes().startswith(intact)
+    assert FitnessMemo(str(path)).get_score("critic", "task:c") == 0.25
+
+
+def test_in_memory_memo():
+    memo = FitnessMemo()
+    memo.put_score("critic", "task:a", 1.0)
+    assert memo.get_score("critic", "task:a") == 1.0
+    memo.close()
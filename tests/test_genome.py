@@ -0,0 +1,29 @@
+from src.v17.genome import CriticGenome, PromptGenome, genome_from_dict, parse_children
+
+PROMPT = {"template": "t", "persona_description": "p", "task_framing": "f", "output_format_instruction": "o", "constraints": ["c"]}
+
+
+def test_parse_children_pads_and_truncates():
+    assert parse_children([1, 2], 3) == [1, 2, None]
+    assert parse_children([1, 2, 3], 2) == [1, 2]
+    assert parse_children(None, 2) == [None, None]
+
+
+def test_parse_children_unwraps_objects():
+    assert parse_children({"children": [1, 2]}, 2) == [1, 2]
+    assert parse_children(PROMPT, 2) == [PROMPT, None]
+
+
+def test_genome_from_dict_coerces_and_validates():
+    genome = genome_from_dict(PromptGenome, dict(PROMPT, constraints="one", id="ignored", fitness_score=9), "child")
+    assert (genome.id, genome.constraints, genome.fitness_score) == ("child", ["one"], 0.0)
+    assert genome_from_dict(PromptGenome, {"prompt": PROMPT}, "child").template == "t"
+    assert genome_from_dict(PromptGenome, {"template": "t"}, "child") is None
+    assert genome_from_dict(CriticGenome, "not a genome", "child") is None
+
+
+def test_content_hash_ignores_id_and_fitness():
+    a = genome_from_dict(PromptGenome, PROMPT, "a")
+    b = genome_from_dict(PromptGenome, PROMPT, "b")
+    b.fitness_score = 0.5
+    assert a.content_hash() == b.content_hash()
@@ -0,0 +1,61 @@
+import pytest
+
+from src.v17.genome import PromptGenome
+from src.v17.memory.genome_store import GenomeStore
+
+
+def _genome(id):
+    return PromptGenome(id, "template", "persona", "framing", "format", ["constraint"])
+
+
+def _write_store(path, count):
+    store = GenomeStore(str(path), PromptGenome)
+    for i in range(count):
+        store.put(_genome(str(i)))
+    store.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "db.jsonl"
+    _write_store(path, 3)
+    store = GenomeStore(str(path), PromptGenome)
+    store.remove_many(["1"])
+    store.close()
+    assert sorted(g.id for g in GenomeStore(str(path), PromptGenome).values()) == ["0", "2"]
+
+
+def test_torn_final_line_is_truncated(tmp_path):
+    path = tmp_path / "db.jsonl"
+    _write_store(path, 3)
+    intact = path.read_bytes()
+    with open(path, "ab") as f:
+        f.write(b'{"put": {"id": "3", "templ')
+    store = GenomeStore(str(path), PromptGenome)
+    assert sorted(g.id for g in store.values()) == ["0", "1", "2"]
+    store.close()
+    assert path.read_bytes() == intact
+
+
+def test_corrupt_middle_line_is_skipped_not_truncated(tmp_path):
+    path = tmp_path / "db.jsonl"
+    _write_store(path, 4)
+    lines = path.read_text().splitlines(keepends=True)
+    lines.insert(1, "{corrupt\n")
+    path.write_text("".join(lines))
+    with pytest.warns(UserWarning, match="line 2"):
+        store = GenomeStore(str(path), PromptGenome)
+        values = store.values()
+    store.close()
+    assert sorted(g.id for g in values) == ["0", "1", "2", "3"]
+    assert path.read_text().count("\n") == 5
+
+
+def test_appends_after_recovery_start_on_a_clean_line(tmp_path):
+    path = tmp_path / "db.jsonl"
+    _write_store(path, 1)
+    with open(path, "ab") as f:
+        f.write(b'{"put"')
+    store = GenomeStore(str(path), PromptGenome)
+    store.put(_genome("new"))
+    store.close()
+    assert sorted(g.id for g in GenomeStore(str(path), PromptGenome).values()) == ["0", "new"]
@@ -0,0 +1,30 @@
+import pytest
+
+from src.json_extract import extract_json, extract_score
+
+
+@pytest.mark.parametrize("text, score", [
+    ("0.8", 0.8),
+    ("  7 ", 7.0),
+    ("Score: 0.65", 0.65),
+    ("The rating - 4 out of 5", 0.8),
+    ("7 out of 10", 0.7),
+    ("I give it 7/10.", 0.7),
+    ("Score: 8/10", 0.8),
+    ("Score: 0.6. It passes 3/4 tests.", 0.6),
+    ("3 / 4", 0.75),
+    ("After 3 checks I settle on 0.6", 3.0),
+])
+def test_extract_score(text, score):
+    assert extract_score(text) == score
+
+
+@pytest.mark.parametrize("text", ["nan", "inf", "-inf", "no verdict", "", "5/0", "Score: 1e400/10"])
+def test_extract_score_rejects_missing_and_non_finite(text):
+    assert extract_score(text) is None
+
+
+def test_extract_json_from_prose_and_fences():
+    assert extract_json('Sure!\n```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+    assert extract_json("Here: [1, 2] and more", "[") == [1, 2]
+    assert extract_json("no json here") is None
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from src.v17.genome import CriticGenome, PromptGenome
+from src.v17.logger import LogReader, Logger
+
+
+def _prompt(id, persona="persona", fitness=0.0):
+    return PromptGenome(id, "template", persona, "framing", "format", [], fitness_score=fitness)
+
+
+def _critic(id):
+    return CriticGenome(id, "template", [], "rubric")
+
+
+def _ids(genomes):
+    return sorted(g.id for g in genomes)
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "log.jsonl.gz"])
+def test_population_at_rebuilds_every_generation(tmp_path, name):
+    path = str(tmp_path / name)
+    logger = Logger(path)
+    logger.log_generation(0, [_prompt("a"), _prompt("b")], [_critic("c")])
+    logger.log_generation(1, [_prompt("a", fitness=0.5), _prompt("d")], [_critic("c")])
+    logger.log_generation(2, [_prompt("a", persona="changed", fitness=0.5), _prompt("d")], [])
+    logger.close()
+
+    reader = LogReader(path)
+    prompts, critics = reader.population_at(0)
+    assert _ids(prompts) == ["a", "b"] and _ids(critics) == ["c"]
+    prompts, _ = reader.population_at(1)
+    assert _ids(prompts) == ["a", "d"]
+    assert {g.id: g.fitness_score for g in prompts}["a"] == 0.5
+    prompts, critics = reader.population_at(2)
+    assert {g.id: g.persona_description for g in prompts}["a"] == "changed"
+    assert critics == []
+    with pytest.raises(KeyError):
+        reader.population_at(3)
+
+
+def test_only_changes_are_written(tmp_path):
+    path = tmp_path / "log.jsonl"
+    logger = Logger(str(path))
+    logger.log_generation(0, [_prompt("a")], [])
+    logger.log_generation(1, [_prompt("a", fitness=0.5)], [])
+    logger.log_generation(2, [_prompt("a", fitness=0.5)], [])
+    logger.close()
+    events = [json.loads(line)["event"] for line in path.read_text().splitlines()]
+    assert events == ["run", "generation", "genome", "generation", "fitness", "generation"]
+
+
+def test_runs_are_kept_apart_and_torn_lines_skipped(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    for ids in (["a"], ["b", "c"]):
+        logger = Logger(path)
+        logger.log_generation(0, [_prompt(id) for id in ids], [])
+        logger.close()
+    with open(path, "a") as f:
+        f.write('{"event": "genome", "gen')
+
+    reader = LogReader(path)
+    assert _ids(reader.population_at(0)[0]) == ["b", "c"]
+    assert _ids(reader.population_at(0, run=0)[0]) == ["a"]
+
+
+def test_other_events_are_logged(tmp_path):
+    path = tmp_path / "log.jsonl"
+    logger = Logger(str(path))
+    logger.log_errors(0, [])
+    logger.log_errors(0, [["score", "c", "p", "BadRequest: too long"]])
+    logger.log_novelty(0, "prompts", 2, 1)
+    logger.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["event"] for e in events] == ["run", "errors", "novelty"]
+    assert events[2] == {"event": "novelty", "generation": 0, "population": "prompts", "rejected": 2, "screened_out": 1}
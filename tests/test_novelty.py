@@ -0,0 +1,39 @@
+import math
+
+from src.v17.evolution.novelty import NoveltyIndex, cosine, embed, genome_text
+from src.v17.genome import PromptGenome
+
+
+def _prompt(id, persona, fitness=0.0):
+    return PromptGenome(id, "Write {task}.", persona, "framing", "format", [], fitness_score=fitness)
+
+
+def test_embedding_ignores_case_and_whitespace():
+    a = embed("Write a  FAST\nsort")
+    assert math.isclose(math.sqrt(sum(w * w for w in a.values())), 1.0)
+    assert math.isclose(cosine(a, embed("write a fast sort")), 1.0)
+    assert cosine(a, embed("an unrelated critic rubric")) < 0.5
+
+
+def test_genome_text_skips_id_and_fitness():
+    assert genome_text(_prompt("a", "expert", 0.9)) == genome_text(_prompt("b", "expert", 0.1))
+
+
+def test_admit_drops_near_duplicates():
+    index = NoveltyIndex([_prompt("a", "a careful senior engineer")], threshold=0.95)
+    candidates = [
+        _prompt("b", "A careful  senior engineer"),
+        _prompt("c", "a playful poet who loves recursion"),
+        _prompt("d", "a playful poet who loves recursion"),
+        _prompt("a", "a careful senior engineer"),
+    ]
+    assert [g.id for g in index.admit(candidates)] == ["c"]
+    assert [id for id, _ in index.vectors] == ["a", "c"]
+
+
+def test_novelty():
+    lone = _prompt("a", "a careful senior engineer")
+    assert NoveltyIndex([lone]).novelty(lone) == 1.0
+    index = NoveltyIndex([lone, _prompt("b", "a careful senior engineer"), _prompt("c", "a playful poet")], k=1)
+    assert math.isclose(index.novelty(lone), 0.0, abs_tol=1e-9)
+    assert index.novelty(_prompt("c", "a playful poet")) > 0.0
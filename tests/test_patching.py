@@ -0,0 +1,36 @@
+import pytest
+
+from src.patching import PatchError, apply_patch, compile_error, parse_unified_diff
+
+CODE = "def add(a, b):\n    return a + b\n\n\ndef sub(a, b):\n    return a - b\n"
+
+
+def test_applies_a_hunk_by_its_context():
+    diff = "--- a/x.py\n+++ b/x.py\n@@ -5,2 +5,2 @@\n def sub(a, b):\n-    return a - b\n+    return a - b  # difference\n"
+    assert apply_patch(CODE, parse_unified_diff(diff)) == CODE.replace("a - b\n", "a - b  # difference\n")
+
+
+def test_wrong_line_numbers_and_whitespace_are_tolerated():
+    diff = "```diff\n@@ -40,2 +40,2 @@\n def add(a, b):\n-    return a + b   \n+    return b + a\n```\nThis swaps the operands."
+    assert apply_patch(CODE, parse_unified_diff(diff)).startswith("def add(a, b):\n    return b + a\n")
+
+
+def test_hunk_without_header_and_pure_insertion():
+    diff = "@@ -2,0 +3,1 @@\n+    # adds\n"
+    patched = apply_patch(CODE, parse_unified_diff(diff))
+    assert patched.splitlines()[2] == "    # adds"
+
+
+def test_missing_context_raises():
+    diff = "@@ -1,1 +1,1 @@\n-def mul(a, b):\n+def times(a, b):\n"
+    with pytest.raises(PatchError):
+        apply_patch(CODE, parse_unified_diff(diff))
+
+
+def test_no_changes_parses_to_no_hunks():
+    assert parse_unified_diff("NO CHANGES") == []
+
+
+def test_compile_error():
+    assert compile_error(CODE) is None
+    assert compile_error("def broken(:\n") is not None
@@ -0,0 +1,37 @@
+from src.planning import execution_waves, parse_plan, PlanStep
+
+
+def _wave_ids(steps):
+    return [[s.id for s in wave] for wave in execution_waves(steps)]
+
+
+def test_independent_steps_share_a_wave():
+    steps = [PlanStep("1", "a"), PlanStep("2", "b"), PlanStep("3", "c", ["1", "2"]), PlanStep("4", "d", ["1"])]
+    assert _wave_ids(steps) == [["1", "2"], ["3", "4"]]
+
+
+def test_unknown_and_self_dependencies_are_ignored():
+    steps = [PlanStep("1", "a", ["9", "1"]), PlanStep("2", "b", ["1"])]
+    assert _wave_ids(steps) == [["1"], ["2"]]
+
+
+def test_cycles_run_one_step_per_wave_in_plan_order():
+    steps = [PlanStep("1", "a", ["2"]), PlanStep("2", "b", ["1"]), PlanStep("3", "c")]
+    assert _wave_ids(steps) == [["3"], ["1"], ["2"]]
+
+
+def test_parse_plan_reads_json_dependencies():
+    steps = parse_plan('Plan:\n```json\n[{"id": 1, "description": "a"}, {"id": 2, "description": "b", "depends_on": 1}]\n```')
+    assert [(s.id, s.description, s.depends_on) for s in steps] == [("1", "a", []), ("2", "b", ["1"])]
+
+
+def test_parse_plan_falls_back_to_sequential_lines():
+    steps = parse_plan("## Plan\n1. Write the parser\n2. Write the CLI\n")
+    assert _wave_ids(steps) == [["1"], ["2"]]
+
+
+def test_parse_plan_renumbers_repeated_ids():
+    steps = parse_plan('[{"id": 1, "description": "a"}, {"id": 1, "description": "b"}, {"id": 2, "description": "c", "depends_on": [1]}]')
+    assert len({s.id for s in steps}) == 3
+    assert steps[2].id == "2" and steps[2].depends_on == ["1"]
+    assert _wave_ids(steps) == [["1", steps[1].id], ["2"]]
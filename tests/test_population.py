@@ -0,0 +1,64 @@
+import pytest
+
+from src.v17.evolution.population import PopulationManager
+from src.v17.genome import PromptGenome
+from src.v17.memory.prompt_db import PromptDB
+
+
+def _genome(id, fitness=0.0):
+    return PromptGenome(id, "template", f"persona {id}", "framing", "format", [], fitness_score=fitness)
+
+
+def _population(tmp_path, strategy, parents, **kwargs):
+    db = PromptDB(str(tmp_path / "db.jsonl"))
+    archive = PromptDB(str(tmp_path / "archive.jsonl"))
+    db.add_many(_genome(f"p{i}", fitness) for i, fitness in enumerate(parents))
+    return PopulationManager(db, archive, strategy=strategy, **kwargs)
+
+
+def _ids(genomes):
+    return sorted(g.id for g in genomes)
+
+
+def test_generational_keeps_only_the_elite(tmp_path):
+    population = _population(tmp_path, "generational", [0.1, 0.4, 0.3, 0.2], size=4, elitism=1)
+    assert population.offspring_needed() == 3
+    population.advance([_genome(f"c{i}") for i in range(3)])
+    assert _ids(population.active()) == ["c0", "c1", "c2", "p1"]
+    assert _ids(population.archive.get_all()) == ["p0", "p2", "p3"]
+
+
+def test_steady_state_replaces_the_worst(tmp_path):
+    population = _population(tmp_path, "steady_state", [0.1, 0.4, 0.3, 0.2], size=4, elitism=2, offspring_count=2)
+    assert population.offspring_needed() == 2
+    population.advance([_genome("c0"), _genome("c1")])
+    assert _ids(population.active()) == ["c0", "c1", "p1", "p2"]
+    assert _ids(population.archive.get_all()) == ["p0", "p3"]
+
+
+def test_mu_plus_lambda_keeps_the_best_of_parents_and_offspring(tmp_path):
+    # Four parents plus last generation's two offspring, all evaluated.
+    population = _population(tmp_path, "mu_plus_lambda", [0.1, 0.4, 0.3, 0.2, 0.9, 0.05], size=4, elitism=1, offspring_count=2)
+    assert population.capacity() == 6
+    population.advance([_genome("c0"), _genome("c1")])
+    assert _ids(population.active()) == ["c0", "c1", "p1", "p2", "p3", "p4"]
+    assert _ids(population.archive.get_all()) == ["p0", "p5"]
+
+
+def test_fewer_offspring_keep_more_parents(tmp_path):
+    population = _population(tmp_path, "steady_state", [0.1, 0.4, 0.3, 0.2], size=4, elitism=1, offspring_count=3)
+    population.advance([_genome("c0")])
+    assert len(population.active()) == 4
+
+
+def test_trim_archives_beyond_capacity(tmp_path):
+    population = _population(tmp_path, "steady_state", [0.1, 0.4, 0.3, 0.2, 0.5, 0.6], size=4, elitism=1)
+    population.trim()
+    assert _ids(population.active()) == ["p1", "p2", "p4", "p5"]
+
+
+def test_rejects_unknown_strategy_and_bad_elitism(tmp_path):
+    with pytest.raises(ValueError):
+        _population(tmp_path, "tournament", [])
+    with pytest.raises(ValueError):
+        _population(tmp_path, "steady_state", [], size=2, elitism=2)
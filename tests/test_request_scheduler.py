@@ -0,0 +1,77 @@
+import random
+import time
+
+import pytest
+
+from src.request_scheduler import RequestScheduler
+from src.transport import FakeTransport, RateLimitedError, RetryableError, SyntheticTransport
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def _scheduler(**kwargs):
+    options = dict(requests_per_minute=1e9, tokens_per_minute=1e12, base_delay=0.001, max_delay=0.01, rng=random.Random(0))
+    options.update(kwargs)
+    return RequestScheduler(**options)
+
+
+def test_retries_rate_limits_until_success():
+    transport = FakeTransport("ok", failures=2, retry_after=0.01)
+    scheduler = _scheduler()
+    completion = scheduler.call(lambda: transport.complete(MESSAGES, "model"))
+    assert completion.content == "ok"
+    assert len(transport.calls) == 3
+    assert scheduler.retries == 2
+    assert scheduler.last_call_retries() == 2
+
+
+def test_rate_limit_pauses_for_retry_after():
+    transport = FakeTransport("ok", failures=1, retry_after=0.2)
+    scheduler = _scheduler()
+    start = time.monotonic()
+    scheduler.call(lambda: transport.complete(MESSAGES, "model"))
+    assert time.monotonic() - start >= 0.2
+
+
+def test_gives_up_after_max_retries():
+    transport = FakeTransport("ok", failures=10, retry_after=0.0)
+    scheduler = _scheduler(max_retries=3)
+    with pytest.raises(RateLimitedError):
+        scheduler.call(lambda: transport.complete(MESSAGES, "model"))
+    assert len(transport.calls) == 4
+
+
+def test_backoff_is_jittered_and_capped():
+    scheduler = _scheduler(base_delay=1.0, max_delay=5.0)
+    delays = [scheduler._backoff(attempt) for attempt in range(1, 10) for _ in range(20)]
+    assert all(0 <= d <= 5.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retries_generic_retryable_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RetryableError("connection reset")
+        return "done"
+
+    scheduler = _scheduler()
+    assert scheduler.call(flaky) == "done"
+    assert scheduler.last_call_retries() == 2
+
+
+def test_non_retryable_errors_propagate_immediately():
+    scheduler = _scheduler()
+    with pytest.raises(ValueError):
+        scheduler.call(lambda: (_ for _ in ()).throw(ValueError("bad request")))
+    assert scheduler.retries == 0
+
+
+def test_synthetic_failures_are_retried():
+    transport = SyntheticTransport("ok", failure_rate=0.5, seed=1)
+    scheduler = _scheduler(max_retries=30)
+    results = [scheduler.call(lambda: transport.complete(MESSAGES, "model")).content for _ in range(20)]
+    assert results == ["ok"] * 20
+    assert scheduler.retries > 0
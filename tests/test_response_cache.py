@@ -0,0 +1,89 @@
+import itertools
+import json
+
+import pytest
+
+from src.response_cache import ResponseCache
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def test_keys_depend_on_model_and_messages():
+    key = ResponseCache.make_key("model", MESSAGES)
+    assert key == ResponseCache.make_key("model", [dict(MESSAGES[0])])
+    assert key != ResponseCache.make_key("other", MESSAGES)
+    assert key != ResponseCache.make_key("model", [{"role": "user", "content": "hello!"}])
+
+
+def test_hits_misses_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ResponseCache(path)
+    key = ResponseCache.make_key("model", MESSAGES)
+    assert cache.get(key) is None
+    cache.put(key, "response")
+    assert cache.get(key) == "response"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+    cache.close()
+    assert ResponseCache(path).get(key) == "response"
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_age=-1)
+    cache.put("key", "response")
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    cache.get("a")
+    cache.evict()
+    assert cache.stats()["entries"] == 2
+    assert cache.get("a") == "a" and cache.get("b") is None
+
+
+def _client(tmp_path, responder):
+    pytest.importorskip("groq")
+    from src.groq_client import GroqClient
+    from src.request_scheduler import RequestScheduler
+    from src.transport import FakeTransport
+
+    transport = FakeTransport(responder)
+    client = GroqClient(cache=ResponseCache(str(tmp_path / "cache.db")), transport=transport, scheduler=RequestScheduler(requests_per_minute=1e9, tokens_per_minute=1e12))
+    return client, transport
+
+
+def test_client_answers_repeats_from_the_cache(tmp_path):
+    client, transport = _client(tmp_path, "answer")
+    assert client.generate("question") == client.generate("question") == "answer"
+    assert len(transport.calls) == 1
+    client.generate("question", use_cache=False)
+    assert len(transport.calls) == 2
+
+
+def test_seeded_and_bred_genomes_bypass_the_cache(tmp_path):
+    counter = itertools.count()
+
+    def responder(messages, model):
+        n = next(counter)
+        genome = {"template": f"t{n}", "persona_description": f"p{n}", "task_framing": "f", "output_format_instruction": "o", "constraints": []}
+        return json.dumps([genome] if "JSON array" in messages[-1]["content"] else genome)
+
+    client, transport = _client(tmp_path, responder)
+    from src.v17.agents.researcher import ResearcherAgent
+    from src.v17.evolution.crossover import batched_crossover
+    from src.v17.evolution.mutation import batched_mutation
+    from src.v17.memory.cognition_archive import CognitionArchive
+
+    researcher = ResearcherAgent(CognitionArchive(str(tmp_path / "archive.md")), client)
+    genomes = [researcher.generate_prompt_genome(f"prompt_{i}") for i in range(4)]
+    assert len({g.content_hash() for g in genomes}) == 4
+
+    pair = [(genomes[0], genomes[1])]
+    children = batched_crossover(pair, client) + batched_crossover(pair, client)
+    mutants = batched_mutation([genomes[0]], client) + batched_mutation([genomes[0]], client)
+    assert children[0].content_hash() != children[1].content_hash()
+    assert mutants[0].content_hash() != mutants[1].content_hash()
+    assert len(transport.calls) == 8
+    assert client.stats()["cache_hits"] == 0
@@ -0,0 +1,120 @@
+import itertools
+import os
+import shutil
+import threading
+
+import pytest
+
+pytest.importorskip("groq")
+
+from src.benchmark_suite import SyntheticResponder
+from src.groq_client import GroqClient
+from src.request_scheduler import RequestScheduler
+from src.transport import FakeTransport
+from src.v17.config import MEMORY_DIR, RunConfig
+from src.v17.evaluation import EvaluationScheduler
+from src.v17.genome import CriticGenome, PromptGenome
+from src.v17.main import main
+from src.v17.memory.fitness_memo import FitnessMemo
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run."""
+
+
+class FakeEngineer:
+    def __init__(self):
+        self.task = type("Task", (), {"name": "sort_numbers"})()
+        self.sandbox = type("Sandbox", (), {"max_workers": 2})()
+        self.generated = []
+        self.counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def generate_code(self, prompt):
+        with self._lock:
+            self.generated.append(prompt.id)
+            # Every call returns different code, as sampling would.
+            return f"# {prompt.id} version {next(self.counter)}"
+
+    def run_tests_and_get_metrics(self, code):
+        return {"passed": True, "code": code}
+
+
+class FakeCritic:
+    def __init__(self, crash_after=None):
+        self.scored = []
+        self.crash_after = crash_after
+        self._lock = threading.Lock()
+
+    def evaluate_code(self, critic, code):
+        with self._lock:
+            if self.crash_after is not None and len(self.scored) >= self.crash_after:
+                raise Crash()
+            self.scored.append((critic.id, code))
+        return 0.5
+
+
+def _genomes(count):
+    prompts = [PromptGenome(f"p{i}", f"template {i}", "persona", "framing", "format", []) for i in range(count)]
+    critics = [CriticGenome(f"c{i}", f"template {i}", [], "rubric") for i in range(count)]
+    return prompts, critics
+
+
+def test_interrupted_evaluation_never_regenerates_code(tmp_path):
+    prompts, critics = _genomes(4)
+    memo_path = str(tmp_path / "memo.jsonl")
+    engineer = FakeEngineer()
+    memo = FitnessMemo(memo_path)
+    with pytest.raises(Crash):
+        EvaluationScheduler(engineer, FakeCritic(crash_after=6), max_concurrency=1, memo=memo).evaluate(prompts, critics)
+    memo.close()
+    assert len(engineer.generated) == 4
+
+    # The checkpoint throttle may have saved none of the codes; the memo has them all.
+    memo = FitnessMemo(memo_path)
+    scored_before = len(memo.scores)
+    assert len(memo.prompts) == 4 and scored_before == 6
+    critic = FakeCritic()
+    matrix = EvaluationScheduler(engineer, critic, max_concurrency=4, memo=memo).evaluate(prompts, critics)
+    memo.close()
+    assert len(engineer.generated) == 4
+    assert len(critic.scored) == 16 - scored_before
+    for p in prompts:
+        assert matrix.codes[p.id].startswith(f"# {p.id} ")
+        assert matrix.metrics[p.id]["code"] == matrix.codes[p.id]
+    assert matrix.pending() == []
+
+
+def test_main_resumes_an_interrupted_run(tmp_path):
+    responder = SyntheticResponder(seed=0)
+    calls = []
+
+    def crash_after(limit):
+        def respond(messages, model):
+            if limit is not None and len(calls) >= limit:
+                raise Crash()
+            calls.append(messages[-1]["content"])
+            return responder(messages, model)
+        return respond
+
+    def client(limit=None):
+        scheduler = RequestScheduler(requests_per_minute=1e9, tokens_per_minute=1e12)
+        return GroqClient(transport=FakeTransport(crash_after(limit)), scheduler=scheduler)
+
+    config = RunConfig(
+        num_generations=2, max_concurrency=1, seed=0, population_size=4, memory_dir=str(tmp_path),
+        log_path=str(tmp_path / "log.jsonl"), cognition_path=shutil.copy(os.path.join(MEMORY_DIR, "cognition_archive.md"), tmp_path), learnings=0,
+    )
+    # Seeding takes 8 calls, so this crashes midway through evaluating generation 0.
+    with pytest.raises(Crash):
+        main(config, groq_client=client(limit=20))
+    assert os.path.exists(tmp_path / "checkpoint.json")
+    generated = [c for c in calls if "Task:" in c]
+
+    config.resume = True
+    main(config, groq_client=client())
+    assert not os.path.exists(tmp_path / "checkpoint.json")
+    regenerated = [c for c in calls[20:] if "Task:" in c]
+    # Code generated before the crash is memoized, so no prompt asks for it again.
+    assert generated and regenerated
+    assert not set(generated) & set(regenerated)
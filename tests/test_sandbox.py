@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+from src.v17.sandbox import Sandbox
+
+
+@pytest.mark.parametrize("code, reason", [
+    ("x = 1\n", "ok"),
+    ("raise ValueError('boom')\n", "error"),
+    ("import sys\nsys.exit(3)\n", "sys_exit"),
+    ("import sys\nsys.exit(0)\n", "ok"),
+    ("def broken(:\n", "error"),
+])
+def test_exit_reasons(code, reason):
+    result = Sandbox().run(code)
+    assert result.exit_reason == reason
+    assert result.passed == (reason == "ok")
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="RLIMIT_AS is only enforced on Linux")
+def test_memory_limit():
+    result = Sandbox(memory_mb=256).run("data = bytearray(1024 ** 3)\n")
+    assert result.exit_reason == "memory"
+
+
+def test_cpu_limit():
+    result = Sandbox(cpu_seconds=1, wall_seconds=10).run("while True:\n    pass\n")
+    assert result.exit_reason == "cpu_limit"
+    assert result.cpu_time >= 0.9
+
+
+def test_wall_clock_limit():
+    result = Sandbox(wall_seconds=0.5).run("import time\ntime.sleep(30)\n")
+    assert result.exit_reason == "timeout"
+    assert result.wall_time < 5
+
+
+def test_resource_usage_is_reported():
+    result = Sandbox().run("print('x' * 99)\nimport sys\nsys.stderr.write('err')\n")
+    assert result.stdout_bytes == 100
+    assert result.stderr_bytes == 3
+    assert result.peak_rss_bytes > 0
+    assert 0 < result.exec_time <= result.wall_time
+
+
+def test_candidates_run_in_a_scratch_directory():
+    code = "import os\nassert os.path.exists('candidate.py') and not os.path.exists('src')\n"
+    assert Sandbox().run(code).exit_reason == "ok"
+
+
+def test_run_many_keeps_input_order():
+    results = Sandbox(max_workers=3).run_many(["x = 1\n", "raise SystemExit(2)\n", "raise KeyError\n"])
+    assert [r.exit_reason for r in results] == ["ok", "sys_exit", "error"]
@@ -0,0 +1,74 @@
+import random
+
+from src.v17.evolution.surrogate import SurrogateModel, features, spearman
+from src.v17.genome import PromptGenome
+
+GOOD = ["vectorised", "cached", "fast", "streaming"]
+BAD = ["naive", "quadratic", "slow", "nested"]
+
+
+def _genome(id, words):
+    return PromptGenome(id, "template", " ".join(words), "framing", "format", [])
+
+
+def _sample(rng, i):
+    good = rng.randint(0, 4)
+    words = rng.sample(GOOD, good) + rng.sample(BAD, 4 - good)
+    rng.shuffle(words)
+    return _genome(str(i), words), good / 4
+
+
+def test_features_ignore_id_and_fitness():
+    a = _genome("a", ["fast"])
+    b = _genome("b", ["fast"])
+    b.fitness_score = 0.9
+    assert features(a) == features(b)
+
+
+def test_spearman():
+    assert spearman([1, 2, 3], [10, 20, 30]) == 1.0
+    assert spearman([1, 2, 3], [3, 2, 1]) == -1.0
+    assert spearman([1, 1, 1], [1, 2, 3]) is None
+    assert spearman([1], [1]) is None
+
+
+def test_learns_to_rank_unseen_genomes():
+    rng = random.Random(0)
+    model = SurrogateModel(min_samples=20)
+    for start in range(0, 200, 10):
+        batch = [_sample(rng, i) for i in range(start, start + 10)]
+        model.observe([g for g, _ in batch], [f for _, f in batch])
+    assert model.ready()
+
+    test = [_sample(rng, i) for i in range(1000, 1040)]
+    predictions = [model.predict(g) for g, _ in test]
+    assert spearman(predictions, [f for _, f in test]) > 0.8
+    best = model.rank([g for g, _ in test], 10)
+    assert sum(f for g, f in test if g in best) / 10 > sum(f for _, f in test) / 40
+
+
+def test_seen_genomes_are_not_relearned():
+    model = SurrogateModel()
+    genome = _genome("a", ["fast"])
+    assert model.observe([genome], [0.5])["samples"] == 1
+    assert model.observe([_genome("b", ["fast"])], [0.9]) is None
+    assert model.samples == 1
+
+
+def test_not_ready_before_min_samples():
+    model = SurrogateModel(min_samples=5)
+    model.observe([_genome(str(i), [str(i)]) for i in range(4)], [0.1, 0.2, 0.3, 0.4])
+    assert not model.ready()
+
+
+def test_state_survives_a_reload(tmp_path):
+    path = str(tmp_path / "surrogate.json")
+    rng = random.Random(1)
+    model = SurrogateModel(path)
+    batch = [_sample(rng, i) for i in range(30)]
+    model.observe([g for g, _ in batch], [f for _, f in batch])
+    model.save()
+    reloaded = SurrogateModel(path)
+    genome = _sample(rng, 99)[0]
+    assert reloaded.predict(genome) == model.predict(genome)
+    assert reloaded.samples == model.samples and reloaded.seen == model.seen
@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("groq")
+
+from src.benchmark_suite import SyntheticResponder
+from src.groq_client import GroqClient
+from src.request_scheduler import RequestScheduler
+from src.transport import SyntheticTransport
+from src.v17.config import MEMORY_DIR, RunConfig
+from src.v17.main import main
+from src.v17.memory.critic_db import CriticDB
+from src.v17.memory.prompt_db import PromptDB
+
+
+def _run(tmp_path, **kwargs):
+    cognition_path = shutil.copy(os.path.join(MEMORY_DIR, "cognition_archive.md"), tmp_path)
+    transport = SyntheticTransport(SyntheticResponder(seed=0), failure_rate=0.1, seed=0)
+    scheduler = RequestScheduler(requests_per_minute=1e9, tokens_per_minute=1e12, base_delay=0.001, max_delay=0.01)
+    client = GroqClient(transport=transport, scheduler=scheduler)
+    options = dict(
+        population_size=4, num_generations=1, seed=0, memory_dir=str(tmp_path), log_path=str(tmp_path / "log.jsonl"),
+        cognition_path=cognition_path, learnings=0,
+    )
+    options.update(kwargs)
+    main(RunConfig(**options), groq_client=client)
+    return client
+
+
+def test_one_generation_end_to_end(tmp_path):
+    client = _run(tmp_path)
+    assert client.stats()["calls"] > 0
+
+    with open(tmp_path / "log.jsonl") as f:
+        events = [json.loads(line) for line in f]
+    assert [e["generation"] for e in events if e["event"] == "generation"] == [0, 1]
+    fitness = [e for e in events if e["event"] == "fitness"]
+    assert fitness and all(0.0 <= s <= 1.5 for e in fitness for s in e["scores"].values())
+
+    for db in (PromptDB(str(tmp_path / "prompt_db.jsonl")), CriticDB(str(tmp_path / "critic_db.jsonl"))):
+        genomes = db.get_all()
+        assert len(genomes) == 4
+        assert len({g.id for g in genomes}) == 4
+        db.close()
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_population_size_holds_across_generations(tmp_path):
+    _run(tmp_path, num_generations=3, strategy="generational", elitism=1)
+    db = PromptDB(str(tmp_path / "prompt_db.jsonl"))
+    assert len(db.get_all()) == 4
+    db.close()